@@ -3,12 +3,15 @@
 # Agent 1: Career Guidance Agent
 from __future__ import annotations
 
-from typing import Any, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Optional
 
 from crewai import Agent
 
 from config.settings import build_crewai_llm
 
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    import httpx
+
 SYSTEM_PROMPT = (
     """You are an expert Career Guidance Counselor with extensive experience in career development, 
     job market trends, and professional growth strategies. You provide personalized career advice 
@@ -20,6 +23,8 @@ SYSTEM_PROMPT = (
 def create_career_guidance_agent(
     tools: Optional[Iterable[object]] = None,
     llm_overrides: dict[str, Any] | None = None,
+    http_client: "httpx.Client | None" = None,
+    llm: Any = None,
 ) -> Agent:
     """Create the career guidance agent for personalized career counseling."""
     return Agent(
@@ -33,7 +38,7 @@ def create_career_guidance_agent(
             "achieve their career goals. You excel at understanding people's unique situations and providing "
             "actionable, personalized advice."
         ),
-        llm=build_crewai_llm(**(llm_overrides or {})),
+        llm=llm or build_crewai_llm(http_client=http_client, **(llm_overrides or {})),
         allow_delegation=False,
         verbose=True,
         system_prompt=SYSTEM_PROMPT,
@@ -3,12 +3,15 @@
 # Agent 2: Skills Assessment Agent
 from __future__ import annotations
 
-from typing import Any, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Optional
 
 from crewai import Agent
 
 from config.settings import build_crewai_llm
 
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    import httpx
+
 SYSTEM_PROMPT = (
     """You are an expert Skills Assessment Specialist with deep knowledge of professional competencies 
     across various industries. You evaluate technical skills, soft skills, and identify skill gaps. 
@@ -21,6 +24,8 @@ SYSTEM_PROMPT = (
 def create_skills_assessment_agent(
     tools: Optional[Iterable[object]] = None,
     llm_overrides: dict[str, Any] | None = None,
+    http_client: "httpx.Client | None" = None,
+    llm: Any = None,
 ) -> Agent:
     """Create the skills assessment agent for evaluating professional competencies."""
     return Agent(
@@ -34,7 +39,7 @@ def create_skills_assessment_agent(
             "Your assessments are known for being thorough, objective, and incredibly useful for career planning. "
             "You understand both current market demands and future skill trends."
         ),
-        llm=build_crewai_llm(**(llm_overrides or {})),
+        llm=llm or build_crewai_llm(http_client=http_client, **(llm_overrides or {})),
         allow_delegation=False,
         verbose=True,
         system_prompt=SYSTEM_PROMPT,
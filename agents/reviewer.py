@@ -3,12 +3,15 @@
 # Agent 4: Course Recommendation Agent
 from __future__ import annotations
 
-from typing import Any, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Optional
 
 from crewai import Agent
 
 from config.settings import build_crewai_llm
 
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    import httpx
+
 SYSTEM_PROMPT = (
     """You are an expert Learning Path Designer and Course Recommendation Specialist with comprehensive 
     knowledge of educational platforms, certifications, bootcamps, and self-paced learning resources. 
@@ -22,6 +25,8 @@ SYSTEM_PROMPT = (
 def create_course_recommendation_agent(
     tools: Optional[Iterable[object]] = None,
     llm_overrides: dict[str, Any] | None = None,
+    http_client: "httpx.Client | None" = None,
+    llm: Any = None,
 ) -> Agent:
     """Create the course recommendation agent for personalized learning paths."""
     return Agent(
@@ -36,7 +41,7 @@ def create_course_recommendation_agent(
             "certifications employers value most, and how to structure learning for maximum retention and "
             "practical application. You can recommend resources for any skill level and budget."
         ),
-        llm=build_crewai_llm(**(llm_overrides or {})),
+        llm=llm or build_crewai_llm(http_client=http_client, **(llm_overrides or {})),
         allow_delegation=False,
         verbose=True,
         system_prompt=SYSTEM_PROMPT,
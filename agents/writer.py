@@ -3,12 +3,15 @@
 # Agent 3: Resume Builder Agent
 from __future__ import annotations
 
-from typing import Any, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Optional
 
 from crewai import Agent
 
 from config.settings import build_crewai_llm
 
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    import httpx
+
 SYSTEM_PROMPT = (
     """You are an expert Resume Writing Specialist and Career Document Designer with extensive 
     knowledge of ATS (Applicant Tracking Systems), hiring manager preferences, and industry-specific 
@@ -21,6 +24,8 @@ SYSTEM_PROMPT = (
 def create_resume_builder_agent(
     tools: Optional[Iterable[object]] = None,
     llm_overrides: dict[str, Any] | None = None,
+    http_client: "httpx.Client | None" = None,
+    llm: Any = None,
 ) -> Agent:
     """Create the resume builder agent for crafting professional resumes."""
     return Agent(
@@ -35,7 +40,7 @@ def create_resume_builder_agent(
             "a compelling career story. Your resumes have helped clients secure positions at Fortune 500 "
             "companies, startups, and everything in between."
         ),
-        llm=build_crewai_llm(**(llm_overrides or {})),
+        llm=llm or build_crewai_llm(http_client=http_client, **(llm_overrides or {})),
         allow_delegation=False,
         verbose=True,
         system_prompt=SYSTEM_PROMPT,
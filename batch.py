@@ -0,0 +1,193 @@
+"""Batch runner that streams career profiles from JSONL through the advisor pipeline."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from crew import PipelineCheckpoint, run_career_advisor_pipeline
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FIELDS = ("profile", "user_profile")
+
+
+@dataclass
+class BatchSummary:
+    """Counters reported at the end of a batch run."""
+
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    invalid: int = 0
+
+
+def _record_id(record: Dict[str, Any], profile: str) -> str:
+    """Use the record's ``id`` or, failing that, a stable hash of the profile text."""
+    if record.get("id") is not None:
+        return str(record["id"])
+    return hashlib.sha1(profile.encode("utf-8")).hexdigest()[:16]
+
+
+def iter_profiles(input_path: Path) -> Iterator[Tuple[str, str]]:
+    """Yield ``(id, profile)`` pairs from a JSONL file without loading it into memory.
+
+    Each line must be a JSON object with a ``profile`` (or ``user_profile``) string and an
+    optional ``id``. Malformed lines are logged and skipped.
+    """
+    with Path(input_path).open(encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                logger.warning("Skipping malformed JSON on line %d of %s: %s", line_number, input_path, exc)
+                continue
+            profile = next(
+                (record[key] for key in PROFILE_FIELDS if isinstance(record, dict) and record.get(key)),
+                None,
+            )
+            if not isinstance(profile, str):
+                logger.warning("Skipping line %d of %s: no profile text", line_number, input_path)
+                continue
+            yield _record_id(record, profile), profile
+
+
+def load_completed_ids(output_path: Path) -> Set[str]:
+    """Return the IDs already recorded as successful in an existing output file."""
+    completed: Set[str] = set()
+    if not Path(output_path).exists():
+        return completed
+    with Path(output_path).open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # tolerate a torn final line from an interrupted run
+            if isinstance(record, dict) and record.get("status") == "ok":
+                completed.add(str(record.get("id")))
+    return completed
+
+
+class _ResultWriter:
+    """Append results to a JSONL file, one flushed line per finished profile."""
+
+    def __init__(self, output_path: Path) -> None:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        self._handle = Path(output_path).open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._handle.write(line + "\n")
+            self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def _run_one(profile_id: str, profile: str, execution_mode: Optional[str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    checkpoint = PipelineCheckpoint()
+    try:
+        output = run_career_advisor_pipeline(profile, checkpoint, execution_mode=execution_mode)
+    except Exception as exc:  # pragma: no cover - runtime resilience path
+        logger.exception("Batch profile %s failed", profile_id)
+        return {
+            "id": profile_id,
+            "status": "error",
+            "error": f"{type(exc).__name__}: {exc}",
+            "duration_seconds": round(time.perf_counter() - started, 3),
+        }
+    return {
+        "id": profile_id,
+        "status": "ok",
+        "output": output,
+        "structured": {
+            name: model.model_dump(exclude_none=True) for name, model in checkpoint.structured().items()
+        },
+        "invalid_outputs": checkpoint.invalid_outputs(),
+        "duration_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def run_batch(
+    input_path: Path,
+    output_path: Path,
+    *,
+    concurrency: int = 4,
+    execution_mode: Optional[str] = None,
+) -> BatchSummary:
+    """Run the pipeline over every profile in ``input_path`` with bounded concurrency.
+
+    Results are appended to ``output_path`` as each profile finishes. Profiles whose ID is
+    already recorded there with ``status == "ok"`` are skipped, so an interrupted batch can
+    be resumed by running the same command again; failed profiles are retried.
+    """
+    completed = load_completed_ids(output_path)
+    if completed:
+        logger.info("Resuming batch: %d profile(s) already completed in %s", len(completed), output_path)
+
+    summary = BatchSummary()
+    writer = _ResultWriter(output_path)
+    in_flight: Dict[Future, str] = {}
+    started = time.perf_counter()
+
+    def _drain(block_until: int) -> None:
+        while len(in_flight) > block_until:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                in_flight.pop(future)
+                record = future.result()
+                writer.write(record)
+                if record["status"] == "ok":
+                    summary.succeeded += 1
+                else:
+                    summary.failed += 1
+                logger.info(
+                    "Batch progress: %d ok, %d failed, %d running",
+                    summary.succeeded,
+                    summary.failed,
+                    len(in_flight),
+                )
+
+    limit = max(1, concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="batch") as pool:
+            seen: Set[str] = set()
+            for profile_id, profile in iter_profiles(input_path):
+                if profile_id in completed:
+                    summary.skipped += 1
+                    continue
+                if profile_id in seen:
+                    logger.warning("Duplicate profile id %s in %s; skipping", profile_id, input_path)
+                    summary.invalid += 1
+                    continue
+                seen.add(profile_id)
+                # Keep at most ``limit`` profiles in flight so the input is streamed, not buffered.
+                _drain(limit - 1)
+                in_flight[pool.submit(_run_one, profile_id, profile, execution_mode)] = profile_id
+                summary.submitted += 1
+            _drain(0)
+    finally:
+        writer.close()
+
+    logger.info(
+        "Batch finished in %.1fs: %d submitted, %d ok, %d failed, %d skipped",
+        time.perf_counter() - started,
+        summary.submitted,
+        summary.succeeded,
+        summary.failed,
+        summary.skipped,
+    )
+    return summary
@@ -0,0 +1,222 @@
+"""CrewAI LLM subclass adding call-level extensions used by the workshop agents."""
+from __future__ import annotations
+
+import copy
+import logging
+import time
+from typing import Any, Optional
+
+from crewai.llm import LLM
+
+from .http_clients import AbortableHTTPClient, is_litellm_http_handler, litellm_http_handler
+from .llm_cache import LLMResponseCache, make_cache_key
+from .llm_streaming import emit_llm_chunks
+from .provider_router import CancelToken, EndpointKey, HedgeCancelled, get_provider_router
+from .rate_limit import RateLimiter, get_provider_rate_limiter
+from .tracing import annotate, span, tracing_enabled
+
+logger = logging.getLogger(__name__)
+
+
+class OpenRouterLLM(LLM):
+    """CrewAI ``LLM`` that can serve repeated completions from an :class:`LLMResponseCache`.
+
+    The cache key covers the provider-qualified model, messages, temperature, max tokens,
+    tool schemas and stop sequences, so fallback overrides never share entries with the
+    primary model. A cache hit on a streaming LLM is replayed as stream chunk events, so
+    token listeners see it like a live answer. Requests that do reach the network first
+    wait on the provider's shared rate limiter, when one is configured.
+
+    Provider calls report their latency and outcome to the provider router under
+    ``endpoint``. When hedging is enabled, a non-streaming call that is still running after
+    the hedge delay is sent again on a dedicated connection and the first response wins;
+    the loser is cancelled and not counted towards endpoint health.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        response_cache: Optional[LLMResponseCache] = None,
+        endpoint: Optional[EndpointKey] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.response_cache = response_cache
+        self.endpoint = endpoint
+
+    def call(
+        self,
+        messages: Any,
+        tools: Optional[list[dict]] = None,
+        callbacks: Optional[list[Any]] = None,
+        available_functions: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        with span("llm", self.model, cache_hit=False):
+            response = self._cached_call(messages, tools, callbacks, available_functions, **kwargs)
+            if tracing_enabled():
+                annotate(**self._token_usage(messages, response))
+            return response
+
+    def _token_usage(self, messages: Any, response: Any) -> dict[str, int]:
+        """Count prompt and completion tokens with the model's own tokenizer via litellm."""
+        from litellm import token_counter
+
+        usage: dict[str, int] = {}
+        try:
+            if isinstance(messages, str):
+                messages = [{"role": "user", "content": messages}]
+            usage["prompt_tokens"] = token_counter(model=self.model, messages=messages)
+            if isinstance(response, str):
+                usage["completion_tokens"] = token_counter(model=self.model, text=response)
+        except Exception:  # pragma: no cover - unknown models or message shapes
+            logger.debug("Token counting failed for model %s", self.model, exc_info=True)
+        return usage
+
+    def _cached_call(
+        self,
+        messages: Any,
+        tools: Optional[list[dict]],
+        callbacks: Optional[list[Any]],
+        available_functions: Optional[dict[str, Any]],
+        **kwargs: Any,
+    ) -> Any:
+        cache = self.response_cache
+        if cache is None:
+            return self._call_provider(messages, tools, callbacks, available_functions, **kwargs)
+
+        key = make_cache_key(
+            model=self.model,
+            messages=messages,
+            temperature=getattr(self, "temperature", None),
+            max_tokens=getattr(self, "max_tokens", None),
+            tools=tools,
+            stop=getattr(self, "stop", None),
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug("LLM cache hit for model %s (key=%s)", self.model, key[:12])
+            annotate(cache_hit=True)
+            if getattr(self, "stream", False):
+                emit_llm_chunks(self, cached)
+            return cached
+
+        response = self._call_provider(messages, tools, callbacks, available_functions, **kwargs)
+        # Only plain-text completions are cacheable; tool-call results depend on side effects.
+        if isinstance(response, str) and response:
+            cache.set(key, response)
+        return response
+
+    def _call_provider(
+        self,
+        messages: Any,
+        tools: Optional[list[dict]],
+        callbacks: Optional[list[Any]],
+        available_functions: Optional[dict[str, Any]],
+        **kwargs: Any,
+    ) -> Any:
+        router = get_provider_router()
+        # Streamed tokens are forwarded as they arrive, so a duplicate would emit them twice.
+        hedge_after = None
+        if self.endpoint is not None and not getattr(self, "stream", False):
+            hedge_after = router.hedge_delay(self.endpoint)
+        if hedge_after is None:
+            return self._timed_provider_call(messages, tools, callbacks, available_functions, **kwargs)
+        limiter = self._rate_limiter()
+        timeout = router.hedge_timeout(hedge_after)
+
+        def hedge(cancel: CancelToken) -> Any:
+            duplicate, connection = self._hedge_copy(timeout)
+            if connection is not None:
+                cancel.on_cancel(connection.abort)
+            try:
+                return duplicate._timed_provider_call(
+                    messages,
+                    tools,
+                    callbacks,
+                    available_functions,
+                    cancel=cancel,
+                    acquire_rate_limit=False,
+                    **kwargs,
+                )
+            finally:
+                if connection is not None:
+                    connection.close()
+
+        return router.run_hedged(
+            lambda cancel: self._timed_provider_call(
+                messages, tools, callbacks, available_functions, cancel=cancel, **kwargs
+            ),
+            hedge_after,
+            hedge_call=hedge,
+            # The duplicate's rate-limit token is taken here, so it is only sent when one is free.
+            admit_hedge=limiter.try_acquire if limiter is not None else None,
+            on_hedge=lambda: annotate(hedged=True, hedge_after_s=round(hedge_after, 3)),
+        )
+
+    def _rate_limiter(self) -> Optional[RateLimiter]:
+        base_url = getattr(self, "base_url", None) or getattr(self, "api_base", None)
+        return get_provider_rate_limiter(base_url) if base_url else None
+
+    def _hedge_copy(self, timeout: float) -> tuple[OpenRouterLLM, Optional[AbortableHTTPClient]]:
+        """Copy of this LLM for a hedged duplicate, on its own connection and with ``timeout``.
+
+        The duplicate's LiteLLM client is rebuilt over the returned connection, so aborting
+        it stops the duplicate without disturbing the shared pool. Without a preconfigured
+        client only the timeout applies.
+        """
+        duplicate = copy.copy(self)
+        duplicate.timeout = timeout
+        params = dict(getattr(self, "additional_params", None) or {})
+        client = params.get("client")
+        if client is None:
+            return duplicate, None
+        connection = AbortableHTTPClient(timeout=timeout)
+        if is_litellm_http_handler(client):
+            params["client"] = litellm_http_handler(connection.client)
+        elif hasattr(client, "with_options"):
+            params["client"] = client.with_options(http_client=connection.client, timeout=timeout)
+        else:
+            connection.close()
+            return duplicate, None
+        duplicate.additional_params = params
+        return duplicate, connection
+
+    def _timed_provider_call(
+        self,
+        messages: Any,
+        tools: Optional[list[dict]],
+        callbacks: Optional[list[Any]],
+        available_functions: Optional[dict[str, Any]],
+        cancel: Optional[CancelToken] = None,
+        acquire_rate_limit: bool = True,
+        **kwargs: Any,
+    ) -> Any:
+        limiter = self._rate_limiter() if acquire_rate_limit else None
+        if cancel is not None and cancel.cancelled:
+            raise HedgeCancelled(f"{self.model} request lost the hedge race before it was sent")
+        if limiter is not None:
+            waited = limiter.acquire()
+            annotate(rate_limit_wait_s=round(waited, 3))
+            if waited:
+                logger.debug("Rate limiter delayed %s call by %.2fs", self.model, waited)
+        started = time.perf_counter()
+        try:
+            response = super().call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                **kwargs,
+            )
+        except Exception:
+            self._record_outcome(started, ok=False, cancel=cancel)
+            raise
+        self._record_outcome(started, ok=True, cancel=cancel)
+        return response
+
+    def _record_outcome(self, started: float, *, ok: bool, cancel: Optional[CancelToken]) -> None:
+        # A cancelled hedge loser says nothing about the endpoint, and its failure is usually ours.
+        if self.endpoint is None or (cancel is not None and cancel.cancelled):
+            return
+        get_provider_router().record(self.endpoint, time.perf_counter() - started, ok=ok)
@@ -0,0 +1,243 @@
+"""Shared, connection-pooled HTTP clients for LLM provider calls.
+
+Agents, crews and fallback attempts used to build their own OpenAI client, so every
+call paid for a fresh TCP and TLS handshake. Clients here are created once per
+``(base_url, headers)`` pair and reused by every caller, including LiteLLM through
+:func:`litellm_http_handler`. They keep connections alive,
+speak HTTP/2 when the optional ``h2`` package is installed, and apply the pool limits
+and timeouts from ``LLM_HTTP_*`` environment variables.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import importlib.util
+import logging
+import os
+import socket
+import threading
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+ClientKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+@dataclass
+class HTTPClientConfig:
+    """Pool limits and timeouts, read from ``LLM_HTTP_*`` environment variables by default."""
+
+    max_connections: int = field(default_factory=lambda: int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")))
+    max_keepalive_connections: int = field(
+        default_factory=lambda: int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+    )
+    keepalive_expiry_seconds: float = field(
+        default_factory=lambda: float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
+    )
+    connect_timeout_seconds: float = field(
+        default_factory=lambda: float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT_SECONDS", "10"))
+    )
+    read_timeout_seconds: float = field(
+        default_factory=lambda: float(os.getenv("LLM_HTTP_READ_TIMEOUT_SECONDS", "120"))
+    )
+    http2: bool = field(default_factory=lambda: os.getenv("LLM_HTTP2", "true").lower() != "false")
+
+    def limits(self) -> httpx.Limits:
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_seconds,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        import httpx
+
+        return httpx.Timeout(self.read_timeout_seconds, connect=self.connect_timeout_seconds)
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _client_key(base_url: str, headers: Optional[Mapping[str, str]]) -> ClientKey:
+    return base_url.rstrip("/"), tuple(sorted((headers or {}).items()))
+
+
+_CLIENTS: Dict[ClientKey, httpx.Client] = {}
+_ASYNC_CLIENTS: Dict[ClientKey, httpx.AsyncClient] = {}
+_LOCK = threading.Lock()
+
+
+def get_http_client(
+    base_url: str, headers: Optional[Mapping[str, str]] = None, config: HTTPClientConfig | None = None
+) -> httpx.Client:
+    """Return the shared pooled client for ``base_url`` and ``headers``, creating it once.
+
+    ``config`` only takes effect when the client is first created.
+    """
+    import httpx
+
+    key = _client_key(base_url, headers)
+    with _LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            config = config or HTTPClientConfig()
+            http2 = config.http2 and http2_available()
+            client = httpx.Client(
+                headers=dict(headers or {}),
+                limits=config.limits(),
+                timeout=config.timeout(),
+                http2=http2,
+            )
+            _CLIENTS[key] = client
+            logger.debug("Created pooled HTTP client for %s (http2=%s)", key[0], http2)
+        return client
+
+
+def get_async_http_client(
+    base_url: str, headers: Optional[Mapping[str, str]] = None, config: HTTPClientConfig | None = None
+) -> httpx.AsyncClient:
+    """Async counterpart of :func:`get_http_client` for LangChain's async paths."""
+    import httpx
+
+    key = _client_key(base_url, headers)
+    with _LOCK:
+        client = _ASYNC_CLIENTS.get(key)
+        if client is None:
+            config = config or HTTPClientConfig()
+            client = httpx.AsyncClient(
+                headers=dict(headers or {}),
+                limits=config.limits(),
+                timeout=config.timeout(),
+                http2=config.http2 and http2_available(),
+            )
+            _ASYNC_CLIENTS[key] = client
+        return client
+
+
+@lru_cache(maxsize=None)
+def _shared_handler_class() -> type:
+    from litellm.llms.custom_httpx.http_handler import HTTPHandler
+
+    class SharedHTTPHandler(HTTPHandler):
+        """LiteLLM handler over a client it does not own, so it never closes it."""
+
+        def close(self) -> None:
+            pass
+
+        def __del__(self) -> None:
+            pass
+
+    return SharedHTTPHandler
+
+
+def litellm_http_handler(http_client: httpx.Client) -> Any:
+    """Wrap ``http_client`` for LiteLLM routes that send requests through their own handler.
+
+    LiteLLM's ``openrouter/`` route only uses a ``client`` that is an ``HTTPHandler``; it
+    ignores an OpenAI client and opens its own connections instead. The wrapper sends every
+    request over ``http_client`` and leaves closing it to this module.
+    """
+    return _shared_handler_class()(client=http_client)
+
+
+def is_litellm_http_handler(client: Any) -> bool:
+    return isinstance(client, _shared_handler_class())
+
+
+class AbortableHTTPClient:
+    """Unshared client for a single request that another thread can abort mid-flight.
+
+    Closing an httpx client does not wake a thread blocked reading a response. This one
+    records the socket of every connection it opens, through httpcore's ``trace``
+    extension, and :meth:`abort` shuts them down so the request fails at once. Used for
+    hedged duplicates, which are cancelled when the original request answers first.
+    """
+
+    def __init__(self, config: HTTPClientConfig | None = None, *, timeout: float | None = None) -> None:
+        import httpx
+
+        config = config or HTTPClientConfig()
+        if timeout is not None:
+            config = replace(config, read_timeout_seconds=timeout)
+        self._lock = threading.Lock()
+        self._sockets: list[socket.socket] = []
+        self._aborted = False
+        self.client = httpx.Client(
+            limits=httpx.Limits(max_connections=1, max_keepalive_connections=0),
+            timeout=config.timeout(),
+            event_hooks={"request": [self._install_trace]},
+        )
+
+    def _install_trace(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = self._trace
+
+    def _trace(self, event_name: str, info: Mapping[str, Any]) -> None:
+        if event_name != "connection.connect_tcp.complete":
+            return
+        sock = info["return_value"].get_extra_info("socket")
+        if sock is None:
+            return
+        with self._lock:
+            aborted = self._aborted
+            if not aborted:
+                self._sockets.append(sock)
+        if aborted:
+            _shutdown_socket(sock)
+
+    def abort(self) -> None:
+        """Fail the request in flight, if any, and close the client."""
+        with self._lock:
+            self._aborted = True
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            _shutdown_socket(sock)
+        self.close()
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def _shutdown_socket(sock: socket.socket) -> None:
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:  # already closed by the other side
+        pass
+
+
+def _close_async_client(client: httpx.AsyncClient) -> None:
+    if client.is_closed:
+        return
+    try:
+        asyncio.run(client.aclose())
+    except Exception:  # pragma: no cover - best effort at shutdown
+        # Connections still bound to another (possibly closed) event loop cannot be shut
+        # down cleanly from here; the process is exiting, so they are dropped.
+        logger.debug("Could not close async HTTP client", exc_info=True)
+
+
+def close_http_clients() -> None:
+    """Close every shared client; async clients are closed on a short-lived event loop.
+
+    Call this from a thread without a running event loop, as ``atexit`` does.
+    """
+    with _LOCK:
+        clients = list(_CLIENTS.values())
+        async_clients = list(_ASYNC_CLIENTS.values())
+        _CLIENTS.clear()
+        _ASYNC_CLIENTS.clear()
+    for client in clients:
+        client.close()
+    for async_client in async_clients:
+        _close_async_client(async_client)
+
+
+atexit.register(close_http_clients)
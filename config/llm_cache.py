@@ -0,0 +1,258 @@
+"""Content-addressed cache for LLM responses with an in-memory LRU and a SQLite tier."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Expired and over-budget rows are purged every N writes rather than on each one.
+_EVICTION_INTERVAL = 32
+
+
+def make_cache_key(
+    *,
+    model: str,
+    messages: Any,
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+    tools: Any = None,
+    stop: Any = None,
+) -> str:
+    """Hash everything that determines a completion into a stable cache key."""
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "tools": tools,
+        "stop": stop,
+    }
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for an :class:`LLMResponseCache`."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        data: Dict[str, float] = dict(asdict(self))
+        data["hit_rate"] = round(self.hit_rate, 4)
+        return data
+
+
+class LLMResponseCache:
+    """Two-tier response cache: a bounded in-memory LRU in front of a SQLite table.
+
+    Entries expire after ``ttl_seconds``. The SQLite tier is additionally capped by entry
+    count and total payload size, evicting least-recently-used rows first. The database
+    runs in WAL mode so several worker processes can share one cache file.
+
+    Each thread talks to SQLite through its own connection, so concurrent lookups do not
+    queue behind one another. The instance lock only covers the in-memory tier and the
+    counters; schema creation and disk eviction each run under their own lock.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        *,
+        ttl_seconds: float = 7 * 24 * 3600,
+        memory_max_entries: int = 256,
+        disk_max_entries: int = 10_000,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.ttl_seconds = ttl_seconds
+        self.memory_max_entries = memory_max_entries
+        self.disk_max_entries = disk_max_entries
+        self.disk_max_bytes = disk_max_bytes
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        self._schema_lock = threading.Lock()
+        self._eviction_lock = threading.Lock()
+        self._local = threading.local()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._writes_since_eviction = 0
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._schema_lock:
+                conn = self._connection()
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, "
+                    "accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+                )
+                conn.commit()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """This thread's connection to the SQLite tier, opened on first use."""
+        if self.path is None:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Writers from other threads or processes hold the lock briefly; wait rather than fail.
+            conn = sqlite3.connect(str(self.path), timeout=30.0)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` or ``None`` on a miss or expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+        conn = self._connection()
+        if conn is not None:
+            row = conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value, created_at = row
+                if now - created_at <= self.ttl_seconds:
+                    conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                    with self._lock:
+                        self._remember(key, value, created_at)
+                        self.stats.disk_hits += 1
+                    return value
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store ``value`` under ``key`` in both tiers."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self.stats.stores += 1
+        conn = self._connection()
+        if conn is None:
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at, size) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, value, now, now, len(value.encode("utf-8"))),
+        )
+        conn.commit()
+        with self._lock:
+            self._writes_since_eviction += 1
+            due = self._writes_since_eviction >= _EVICTION_INTERVAL
+            if due:
+                self._writes_since_eviction = 0
+        # One thread evicts at a time; a write arriving meanwhile leaves it to that thread.
+        if due and self._eviction_lock.acquire(blocking=False):
+            try:
+                self._evict_disk(conn, now)
+            finally:
+                self._eviction_lock.release()
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _evict_disk(self, conn: sqlite3.Connection, now: float) -> None:
+        removed = conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+
+        count, total_size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        while count > self.disk_max_entries or total_size > self.disk_max_bytes:
+            batch = max(count - self.disk_max_entries, 1)
+            victims = conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT ?", (batch,)
+            ).fetchall()
+            if not victims:
+                break
+            conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key, _ in victims])
+            count -= len(victims)
+            total_size -= sum(size for _, size in victims)
+            removed += len(victims)
+
+        conn.commit()
+        if removed:
+            with self._lock:
+                self.stats.evictions += removed
+            logger.debug("LLM cache evicted %d disk entries", removed)
+
+    def clear(self) -> None:
+        """Remove every cached response from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        conn = self._connection()
+        if conn is not None:
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+
+_CACHES: Dict[Optional[str], LLMResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_llm_response_cache(
+    path: Optional[Path],
+    *,
+    ttl_seconds: float,
+    memory_max_entries: int,
+    disk_max_entries: int,
+    disk_max_bytes: int,
+) -> LLMResponseCache:
+    """Return the process-wide cache for ``path``, creating it on first use."""
+    key = str(Path(path).resolve()) if path else None
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = LLMResponseCache(
+                path,
+                ttl_seconds=ttl_seconds,
+                memory_max_entries=memory_max_entries,
+                disk_max_entries=disk_max_entries,
+                disk_max_bytes=disk_max_bytes,
+            )
+            _CACHES[key] = cache
+            logger.info("LLM response cache enabled (path=%s)", path or "memory-only")
+        return cache
+
+
+def iter_llm_response_caches() -> list[LLMResponseCache]:
+    """Return every cache created in this process (used for stats reporting)."""
+    with _CACHES_LOCK:
+        return list(_CACHES.values())
@@ -0,0 +1,80 @@
+"""Route streamed LLM tokens from CrewAI's event bus to per-thread callbacks."""
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+TokenCallback = Callable[[str], None]
+
+_local = threading.local()
+_listener_lock = threading.Lock()
+_listener_state: Optional[bool] = None  # None = not attempted, False = unavailable
+
+
+def _stream_event_api() -> tuple[type, object] | None:
+    try:
+        from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+    except ImportError:
+        try:
+            from crewai.utilities.events import LLMStreamChunkEvent, crewai_event_bus
+        except ImportError:
+            return None
+    return LLMStreamChunkEvent, crewai_event_bus
+
+
+def _ensure_listener() -> bool:
+    """Subscribe once to CrewAI's stream-chunk events; return whether streaming is available."""
+    global _listener_state
+    with _listener_lock:
+        if _listener_state is not None:
+            return _listener_state
+        api = _stream_event_api()
+        if api is None:
+            logger.warning("Installed CrewAI does not emit stream chunk events; token streaming disabled")
+            _listener_state = False
+            return False
+        LLMStreamChunkEvent, crewai_event_bus = api
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def _forward_chunk(source, event) -> None:  # pragma: no cover - invoked by CrewAI
+            callback = getattr(_local, "callback", None)
+            if callback is not None and event.chunk:
+                callback(event.chunk)
+
+        _listener_state = True
+        return True
+
+
+@contextmanager
+def route_llm_tokens(callback: TokenCallback) -> Iterator[bool]:
+    """Send tokens streamed by LLM calls made on this thread to ``callback``.
+
+    CrewAI publishes chunks on a process-wide event bus; routing by thread keeps the tokens
+    of concurrently running tasks and pipelines apart. Yields ``False`` when the installed
+    CrewAI cannot stream, in which case only the final task outputs are available.
+    """
+    available = _ensure_listener()
+    previous = getattr(_local, "callback", None)
+    _local.callback = callback
+    try:
+        yield available
+    finally:
+        _local.callback = previous
+
+
+def emit_llm_chunks(source: object, text: str, chunk_chars: int = 200) -> None:
+    """Publish ``text`` as stream chunk events, as if ``source`` had just streamed it.
+
+    Used for responses served without a provider call, such as cache hits, so listeners
+    see the same token events either way.
+    """
+    api = _stream_event_api()
+    if api is None or not text:
+        return
+    LLMStreamChunkEvent, crewai_event_bus = api
+    for start in range(0, len(text), chunk_chars):
+        crewai_event_bus.emit(source, event=LLMStreamChunkEvent(chunk=text[start : start + chunk_chars]))
@@ -1,17 +1,170 @@
-"""Central logging configuration for the Agentic AI Workshop pipeline."""
+"""Central logging configuration for the Agentic AI Workshop pipeline.
+
+By default records are handed to a bounded in-memory queue and written by a background
+listener thread, so console and file I/O never run on the request path. When the queue
+is full, records are dropped according to the configured policy and a summary of the
+drops is logged once space frees up. The log file rotates by size (or on a time schedule)
+with a fixed number of backups, and oversized messages such as full task outputs are
+truncated before they are queued.
+"""
 from __future__ import annotations
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
 from logging import Logger
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, List, Optional
 
 LOGS_DIR = Path(__file__).resolve().parents[1] / "logs"
 DEFAULT_LOG_FILE = LOGS_DIR / "workshop.log"
+DROP_POLICIES = ("drop_newest", "drop_oldest")
+
+_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+
+@dataclass
+class LoggingConfig:
+    """Logging pipeline settings, read from ``LOG_*`` environment variables by default."""
+
+    queued: bool = field(default_factory=lambda: os.getenv("LOG_QUEUE_ENABLED", "true").lower() != "false")
+    queue_size: int = field(default_factory=lambda: int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    drop_policy: str = field(default_factory=lambda: os.getenv("LOG_DROP_POLICY", "drop_oldest"))
+    max_bytes: int = field(default_factory=lambda: int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))))
+    backup_count: int = field(default_factory=lambda: int(os.getenv("LOG_BACKUP_COUNT", "5")))
+    # A TimedRotatingFileHandler ``when`` value (e.g. "midnight"); overrides size rotation.
+    rotate_when: Optional[str] = field(default_factory=lambda: os.getenv("LOG_ROTATE_WHEN") or None)
+    max_message_chars: int = field(default_factory=lambda: int(os.getenv("LOG_MAX_MESSAGE_CHARS", "4000")))
+
+    def __post_init__(self) -> None:
+        if self.drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop_policy '{self.drop_policy}'. Expected one of {DROP_POLICIES}.")
+
+
+def truncate_message(text: str, max_chars: int) -> str:
+    """Keep the head and tail of ``text`` (tracebacks end with the useful part)."""
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    marker = f"\n... [{len(text) - max_chars} characters truncated] ...\n"
+    head = max_chars * 2 // 3
+    return text[:head] + marker + text[-(max_chars - head):]
+
+
+class TruncatingFormatter(logging.Formatter):
+    """Formatter that caps the rendered message, including any traceback."""
+
+    def __init__(self, *args, max_message_chars: int = 4000, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_message_chars = max_message_chars
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        record.message = truncate_message(record.message, self.max_message_chars)
+        return super().formatMessage(record)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks the caller for long, dropping records when full.
 
+    ``drop_newest`` discards the incoming record and ``drop_oldest`` evicts the oldest
+    queued one to make room. Records at ERROR and above wait up to a second for space
+    before being dropped; that wait only blocks the logging thread, since records are
+    enqueued without the handler lock. Drops are counted and reported in a single WARNING
+    record.
+    """
 
-def configure_logging(*, level: int = logging.INFO, extra_handlers: Iterable[logging.Handler] | None = None) -> Logger:
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]", *, drop_policy: str, max_message_chars: int) -> None:
+        super().__init__(log_queue)
+        self.drop_policy = drop_policy
+        self.max_message_chars = max_message_chars
+        self.dropped = 0
+        self._unreported = 0
+        self._drop_lock = threading.Lock()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Handler.handle holds the handler lock around emit(). The queue is thread-safe on
+        # its own, so skip the lock; otherwise every logging thread would queue up behind
+        # an ERROR record waiting for space.
+        result = self.filter(record)
+        if isinstance(result, logging.LogRecord):  # filters may return a replacement record
+            record = result
+        if result:
+            self.emit(record)
+        return bool(result)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merges args and traceback into the message, so truncating here also bounds the
+        # memory each queued record holds.
+        record = super().prepare(record)
+        record.msg = record.message = truncate_message(record.getMessage(), self.max_message_chars)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._offer(record):
+            self._report_drops()
+            return
+        with self._drop_lock:
+            self.dropped += 1
+            self._unreported += 1
+
+    def _offer(self, record: logging.LogRecord) -> bool:
+        try:
+            if record.levelno >= logging.ERROR:
+                self.queue.put(record, timeout=1.0)
+            else:
+                self.queue.put_nowait(record)
+            return True
+        except queue.Full:
+            pass
+        if self.drop_policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                with self._drop_lock:
+                    self.dropped += 1
+                    self._unreported += 1
+                self.queue.put_nowait(record)
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+        return False
+
+    def _report_drops(self) -> None:
+        with self._drop_lock:
+            count, self._unreported = self._unreported, 0
+        if not count:
+            return
+        notice = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0, "Log queue full; dropped %d record(s)", (count,), None
+        )
+        try:
+            self.queue.put_nowait(self.prepare(notice))
+        except queue.Full:
+            with self._drop_lock:
+                self._unreported += count
+
+
+def _file_handler(config: LoggingConfig) -> logging.Handler:
+    if config.rotate_when:
+        return logging.handlers.TimedRotatingFileHandler(
+            DEFAULT_LOG_FILE, when=config.rotate_when, backupCount=config.backup_count, encoding="utf-8"
+        )
+    return logging.handlers.RotatingFileHandler(
+        DEFAULT_LOG_FILE, maxBytes=config.max_bytes, backupCount=config.backup_count, encoding="utf-8"
+    )
+
+
+def configure_logging(
+    *,
+    level: int = logging.INFO,
+    extra_handlers: Iterable[logging.Handler] | None = None,
+    config: LoggingConfig | None = None,
+) -> Logger:
     """Configure application-wide logging with both console and file handlers."""
+    global _LISTENER
+    config = config or LoggingConfig()
     LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
     logger = logging.getLogger()
@@ -21,24 +174,46 @@ def configure_logging(*, level: int = logging.INFO, extra_handlers: Iterable[log
     if logger.handlers:
         return logger
 
-    formatter = logging.Formatter(
+    formatter = TruncatingFormatter(
         "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
+        # Queued records are already truncated by BoundedQueueHandler.
+        max_message_chars=0 if config.queued else config.max_message_chars,
     )
 
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
 
-    file_handler = logging.FileHandler(DEFAULT_LOG_FILE, encoding="utf-8")
+    file_handler = _file_handler(config)
     file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-
-    for handler in extra_handlers or []:
-        logger.addHandler(handler)
+    handlers: List[logging.Handler] = [console_handler, file_handler, *(extra_handlers or [])]
+    if config.queued:
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=config.queue_size)
+        _LISTENER = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _LISTENER.start()
+        atexit.register(shutdown_logging)
+        logger.addHandler(
+            BoundedQueueHandler(
+                log_queue, drop_policy=config.drop_policy, max_message_chars=config.max_message_chars
+            )
+        )
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
     logger.debug("Logging configured. Writing to %s", DEFAULT_LOG_FILE)
     return logger
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer (registered with ``atexit``)."""
+    global _LISTENER
+    listener, _LISTENER = _LISTENER, None
+    if listener is not None:
+        try:
+            listener.stop()
+        except queue.Full:  # pragma: no cover - exit while saturated; the writer is a daemon
+            pass
@@ -0,0 +1,175 @@
+"""Local OpenAI-compatible chat completions server for exercising fallbacks and hedging.
+
+The server answers ``POST /v1/chat/completions`` (plain and ``stream=true``) after a
+configurable delay and fails a configurable fraction of requests with HTTP 500, so
+the provider router's health tracking and hedged requests can be observed without a
+real provider::
+
+    python -m config.mock_openai_server --port 8099 --latency 3 --error-rate 0.3
+
+Point a fallback at it with ``OPENROUTER_FALLBACK_BASE_URLS=http://127.0.0.1:8099/v1``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Sequence
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients abort requests on purpose (hedged duplicates); don't print their tracebacks.
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class MockOpenAIServer:
+    """Threaded mock server; usable as a context manager that serves in the background."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency_s: float = 0.0,
+        jitter_s: float = 0.0,
+        error_rate: float = 0.0,
+        reply: str = "Mock completion.",
+        latencies: Sequence[float] = (),
+    ) -> None:
+        self.latency_s = latency_s
+        # Fixed delays for the first requests, in arrival order; later ones use latency_s.
+        self.latencies = list(latencies)
+        self.jitter_s = jitter_s
+        self.error_rate = error_rate
+        self.reply = reply
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    index = server.requests
+                    server.requests += 1
+                time.sleep(server._delay(index))
+                if random.random() < server.error_rate:
+                    self._send_json(500, {"error": {"message": "mock failure", "type": "server_error"}})
+                    return
+                if payload.get("stream"):
+                    self._send_stream(payload)
+                else:
+                    self._send_json(200, server._completion(payload))
+
+            def _send_json(self, status: int, body: dict[str, Any]) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, payload: dict[str, Any]) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+                for word in server.reply.split(" "):
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": payload.get("model", "mock"),
+                        "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.write(b"data: [DONE]\n\n")
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+        return _Handler
+
+    def _delay(self, index: int) -> float:
+        if index < len(self.latencies):
+            return self.latencies[index]
+        return max(0.0, self.latency_s + random.uniform(0.0, self.jitter_s))
+
+    def _completion(self, payload: dict[str, Any]) -> dict[str, Any]:
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in payload.get("messages", []))
+        completion_tokens = len(self.reply.split())
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": self.reply}, "finish_reason": "stop"}
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def start(self) -> "MockOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to this many seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500.")
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(
+        args.host, args.port, latency_s=args.latency, jitter_s=args.jitter, error_rate=args.error_rate
+    )
+    print(f"Mock OpenAI-compatible server listening on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Configuration checks for ``main.py --check`` and an import-time report by module.
+
+The checks only read environment variables, files and package metadata. They never
+import CrewAI, LangChain, FAISS or sentence-transformers, so a scheduler can validate a
+deployment in a fraction of a second before it starts real work.
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# Written by rag/build_vector_db.py; see tools/vector_index.py.
+VECTORSTORE_PARAMS_FILE = "index_params.json"
+# Packages the full pipeline needs, checked by spec lookup rather than import.
+REQUIRED_PACKAGES = (
+    "crewai",
+    "litellm",
+    "openai",
+    "httpx",
+    "langchain_openai",
+    "langchain_community",
+    "numpy",
+    "faiss",
+    "sentence_transformers",
+    "tiktoken",
+    "duckduckgo_search",
+)
+
+
+@dataclass
+class CheckResult:
+    name: str
+    status: str  # "ok", "warning" or "error"
+    detail: str = ""
+
+
+def _check(name: str, probe: Callable[[], Optional[str]], results: List[CheckResult]) -> None:
+    """Run ``probe``; a returned string is a warning, an exception is an error."""
+    try:
+        warning = probe()
+    except Exception as exc:  # noqa: BLE001 - every failure becomes a report line
+        results.append(CheckResult(name, "error", f"{type(exc).__name__}: {exc}"))
+        return
+    results.append(CheckResult(name, "warning" if warning else "ok", warning or ""))
+
+
+def _check_llm() -> Optional[str]:
+    from .settings import OpenRouterLLMConfig
+
+    config = OpenRouterLLMConfig()
+    if not config.api_key:
+        raise ValueError("OPENROUTER_API_KEY is missing. Set it in your environment or .env file.")
+    for url in [config.base_url, *config.fallback_base_urls]:
+        parsed = urlparse(url)
+        if parsed.scheme not in {"http", "https"} or not parsed.netloc:
+            raise ValueError(f"'{url}' is not an http(s) URL")
+    return None
+
+
+def _check_pipeline() -> Optional[str]:
+    from .settings import EXECUTION_MODES, PipelineConfig
+
+    config = PipelineConfig()
+    if config.execution_mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{config.execution_mode}'. Expected one of {EXECUTION_MODES}.")
+    if config.max_parallel_tasks < 1:
+        raise ValueError("CAREER_ADVISOR_MAX_PARALLEL_TASKS must be at least 1")
+    if config.summarize_context and config.summary_max_tokens < 1:
+        raise ValueError("CAREER_ADVISOR_SUMMARY_MAX_TOKENS must be positive")
+    return None
+
+
+def _check_llm_cache() -> Optional[str]:
+    from .settings import LLMCacheConfig
+
+    config = LLMCacheConfig()
+    if not config.enabled or not config.path:
+        return None
+    directory = Path(config.path).parent
+    if directory.exists() and not os.access(directory, os.W_OK):
+        raise PermissionError(f"{directory} is not writable")
+    return None
+
+
+def _check_runtime_settings() -> Optional[str]:
+    from .http_clients import HTTPClientConfig
+    from .logging_config import LoggingConfig
+    from .provider_router import ProviderRouterConfig
+    from .tracing import TracingConfig
+
+    router = ProviderRouterConfig()
+    if not 0 < router.error_rate_threshold <= 1:
+        raise ValueError("LLM_ROUTER_ERROR_RATE_THRESHOLD must be in (0, 1]")
+    HTTPClientConfig()
+    LoggingConfig()
+    TracingConfig()
+    return None
+
+
+def _check_vectorstore() -> Optional[str]:
+    store = PROJECT_ROOT / "rag" / "vectorstore"
+    if not (store / VECTORSTORE_PARAMS_FILE).exists():
+        return f"no vector store at {store}; run 'python rag/build_vector_db.py' before using the RAG tool"
+    return None
+
+
+def _check_web_search() -> Optional[str]:
+    static_index = os.getenv("WEB_SEARCH_STATIC_INDEX")
+    if static_index and not Path(static_index).exists():
+        raise FileNotFoundError(f"WEB_SEARCH_STATIC_INDEX points to missing file {static_index}")
+    return None
+
+
+def _check_packages() -> Optional[str]:
+    missing = [name for name in REQUIRED_PACKAGES if importlib.util.find_spec(name) is None]
+    if missing:
+        raise ModuleNotFoundError(f"not installed: {', '.join(missing)}")
+    return None
+
+
+def run_preflight_checks(*, batch_input: Optional[Path] = None) -> List[CheckResult]:
+    """Validate configuration, data files and installed packages without loading the ML stack."""
+    results: List[CheckResult] = []
+    _check("llm", _check_llm, results)
+    _check("pipeline", _check_pipeline, results)
+    _check("llm_cache", _check_llm_cache, results)
+    _check("runtime_settings", _check_runtime_settings, results)
+    _check("vectorstore", _check_vectorstore, results)
+    _check("web_search", _check_web_search, results)
+    _check("packages", _check_packages, results)
+    if batch_input is not None:
+
+        def _check_batch() -> Optional[str]:
+            if not batch_input.is_file():
+                raise FileNotFoundError(f"batch input {batch_input} does not exist")
+            return None
+
+        _check("batch_input", _check_batch, results)
+    return results
+
+
+def format_check_report(results: List[CheckResult]) -> str:
+    width = max(len(result.name) for result in results)
+    lines = [
+        f"{result.status.upper():<7} {result.name:<{width}}  {result.detail}".rstrip() for result in results
+    ]
+    errors = sum(result.status == "error" for result in results)
+    warnings = sum(result.status == "warning" for result in results)
+    lines.append(f"{len(results)} checks: {errors} error(s), {warnings} warning(s)")
+    return "\n".join(lines)
+
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportReport:
+    """Import cost of one module and its dependencies, from ``python -X importtime``."""
+
+    target: str
+    total_s: float
+    by_package: Dict[str, float] = field(default_factory=dict)
+    slowest_modules: List[tuple[str, float]] = field(default_factory=list)
+    error: str = ""
+
+    def format(self, top: int = 15) -> str:
+        lines = [f"Importing '{self.target}' took {self.total_s:.2f}s"]
+        if self.error:
+            lines.append(f"(import failed: {self.error})")
+        lines.append("\nBy top-level package (self time):")
+        for package, seconds in sorted(self.by_package.items(), key=lambda item: -item[1])[:top]:
+            share = seconds / self.total_s * 100 if self.total_s else 0.0
+            lines.append(f"  {package:<32} {seconds * 1000:9.1f} ms  {share:5.1f}%")
+        lines.append("\nSlowest modules (including their imports):")
+        for module, seconds in self.slowest_modules[:top]:
+            lines.append(f"  {module:<48} {seconds * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+
+def profile_imports(target: str = "crew") -> ImportReport:
+    """Import ``target`` in a fresh interpreter with ``-X importtime`` and aggregate the result."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    by_package: Dict[str, float] = defaultdict(float)
+    cumulative: Dict[str, float] = {}
+    total_us = 0
+    other_lines = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            if not line.startswith("import time:"):
+                other_lines.append(line)
+            continue
+        self_us, cumulative_us, _, module = match.groups()
+        total_us += int(self_us)
+        by_package[module.split(".", 1)[0]] += int(self_us) / 1e6
+        cumulative[module] = int(cumulative_us) / 1e6
+    error = other_lines[-1].strip() if completed.returncode != 0 and other_lines else ""
+    return ImportReport(
+        target=target,
+        total_s=total_us / 1e6,
+        by_package=dict(by_package),
+        slowest_modules=sorted(cumulative.items(), key=lambda item: -item[1]),
+        error=error,
+    )
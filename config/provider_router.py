@@ -0,0 +1,342 @@
+"""Health-aware ordering of LLM endpoints and hedged provider requests.
+
+Every provider call made through :class:`~config.crewai_llm.OpenRouterLLM` reports its
+latency and outcome for its ``(provider, model, base_url)`` endpoint. The router keeps a
+rolling window per endpoint and marks it unhealthy when its recent error rate or run of
+consecutive failures crosses a threshold. An unhealthy endpoint is skipped by the fallback
+loop in ``crew.py`` until a cooldown passes; then a single probe is let through, claimed
+by the attempt that actually sends it.
+
+With hedging enabled, a call that has not answered within the hedge delay is sent again,
+and whichever response arrives first is used. The delay is either fixed, or ``auto``: the
+endpoint's recent p95 latency. At most ``LLM_HEDGE_MAX_IN_FLIGHT`` hedged pairs run at
+once, and the losing request of each pair is told to stop through a :class:`CancelToken`.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+EndpointKey = Tuple[str, str, str]
+T = TypeVar("T")
+
+
+def endpoint_key(provider: Optional[str], model: str, base_url: str) -> EndpointKey:
+    """Identify an endpoint; ``provider`` defaults to OpenRouter like ``build_crewai_llm``."""
+    return (provider or "openrouter", str(model).removeprefix("openrouter/"), base_url.rstrip("/"))
+
+
+def _hedge_after_from_env() -> Optional[float]:
+    raw = os.getenv("LLM_HEDGE_AFTER_SECONDS", "").strip().lower()
+    if not raw:
+        return None
+    return -1.0 if raw == "auto" else float(raw)
+
+
+@dataclass
+class ProviderRouterConfig:
+    """Health and hedging thresholds, read from ``LLM_ROUTER_*``/``LLM_HEDGE_*`` variables."""
+
+    window_size: int = field(default_factory=lambda: int(os.getenv("LLM_ROUTER_WINDOW", "50")))
+    window_seconds: float = field(default_factory=lambda: float(os.getenv("LLM_ROUTER_WINDOW_SECONDS", "600")))
+    min_samples: int = field(default_factory=lambda: int(os.getenv("LLM_ROUTER_MIN_SAMPLES", "5")))
+    error_rate_threshold: float = field(
+        default_factory=lambda: float(os.getenv("LLM_ROUTER_ERROR_RATE_THRESHOLD", "0.5"))
+    )
+    max_consecutive_failures: int = field(
+        default_factory=lambda: int(os.getenv("LLM_ROUTER_MAX_CONSECUTIVE_FAILURES", "3"))
+    )
+    cooldown_seconds: float = field(default_factory=lambda: float(os.getenv("LLM_ROUTER_COOLDOWN_SECONDS", "60")))
+    # Seconds before a duplicate request is sent; -1 means "auto" (recent p95), None disables.
+    hedge_after_seconds: Optional[float] = field(default_factory=_hedge_after_from_env)
+    min_hedge_after_seconds: float = field(
+        default_factory=lambda: float(os.getenv("LLM_HEDGE_MIN_SECONDS", "2.0"))
+    )
+    # Hedged pairs allowed at once; a pair holds its slot until both requests have ended.
+    max_hedges_in_flight: int = field(default_factory=lambda: int(os.getenv("LLM_HEDGE_MAX_IN_FLIGHT", "4")))
+    # The duplicate request times out after this multiple of the hedge delay.
+    hedge_timeout_factor: float = field(
+        default_factory=lambda: float(os.getenv("LLM_HEDGE_TIMEOUT_FACTOR", "3"))
+    )
+
+
+@dataclass
+class EndpointHealth:
+    """Rolling latency and outcome samples for one endpoint."""
+
+    samples: Deque[Tuple[float, float, bool]] = field(default_factory=deque)
+    consecutive_failures: int = 0
+    unhealthy_until: float = 0.0
+    probe_deadline: float = 0.0
+
+    def recent(self, now: float, window_seconds: float) -> List[Tuple[float, float, bool]]:
+        return [sample for sample in self.samples if now - sample[0] <= window_seconds]
+
+    def error_rate(self, now: float, window_seconds: float) -> float:
+        recent = self.recent(now, window_seconds)
+        return sum(1 for *_, ok in recent if not ok) / len(recent) if recent else 0.0
+
+    def latency_quantile(self, quantile: float, now: float, window_seconds: float) -> Optional[float]:
+        latencies = sorted(latency for _, latency, ok in self.recent(now, window_seconds) if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+
+
+class HedgeCancelled(Exception):
+    """Raised by a hedged request that lost the race before it was sent."""
+
+
+class CancelToken:
+    """Cancellation signal handed to each request of a hedged pair.
+
+    Requests check :attr:`cancelled` and register callbacks (for example closing a
+    dedicated HTTP client) that run once the other request has won.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:  # pragma: no cover - cancellation is best effort
+                logger.debug("Hedge cancel callback failed", exc_info=True)
+
+
+class ProviderRouter:
+    """Track endpoint health, order fallback attempts and run hedged calls."""
+
+    def __init__(self, config: ProviderRouterConfig | None = None) -> None:
+        self.config = config or ProviderRouterConfig()
+        self._lock = threading.Lock()
+        self._health: Dict[EndpointKey, EndpointHealth] = {}
+        self._hedge_slots = threading.BoundedSemaphore(max(1, self.config.max_hedges_in_flight))
+        self._hedge_pool = ThreadPoolExecutor(
+            max_workers=32 + 2 * self.config.max_hedges_in_flight, thread_name_prefix="llm-hedge"
+        )
+
+    def _entry(self, key: EndpointKey) -> EndpointHealth:
+        return self._health.setdefault(key, EndpointHealth(samples=deque(maxlen=self.config.window_size)))
+
+    def record(self, key: EndpointKey, latency_s: float, ok: bool) -> None:
+        """Report one provider call; may open or close the endpoint's circuit."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry(key)
+            entry.samples.append((now, latency_s, ok))
+            entry.probe_deadline = 0.0
+            if ok:
+                entry.consecutive_failures = 0
+                entry.unhealthy_until = 0.0
+                return
+            entry.consecutive_failures += 1
+            recent = entry.recent(now, self.config.window_seconds)
+            tripped = entry.consecutive_failures >= self.config.max_consecutive_failures or (
+                len(recent) >= self.config.min_samples
+                and entry.error_rate(now, self.config.window_seconds) >= self.config.error_rate_threshold
+            )
+            if tripped:
+                entry.unhealthy_until = now + self.config.cooldown_seconds
+        if tripped:
+            logger.warning(
+                "Marking LLM endpoint %s unhealthy for %.1fs (%d consecutive failures)",
+                key,
+                self.config.cooldown_seconds,
+                entry.consecutive_failures,
+            )
+
+    def _available(self, entry: Optional[EndpointHealth], now: float) -> bool:
+        if entry is None or not entry.unhealthy_until:
+            return True
+        return now >= entry.unhealthy_until and now >= entry.probe_deadline
+
+    def is_available(self, key: EndpointKey) -> bool:
+        """Whether ``key`` is healthy or ready for a probe; never claims the probe itself."""
+        with self._lock:
+            return self._available(self._health.get(key), time.monotonic())
+
+    def try_claim(self, key: EndpointKey) -> bool:
+        """Claim ``key`` for a request that is about to be sent.
+
+        A healthy endpoint is always granted. Once an unhealthy endpoint's cooldown has
+        passed, a single caller gets the probe; others are refused until that probe
+        reports back or another cooldown elapses.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._health.get(key)
+            if not self._available(entry, now):
+                return False
+            if entry is not None and entry.unhealthy_until:
+                entry.probe_deadline = now + self.config.cooldown_seconds
+            return True
+
+    def order(self, candidates: Iterable[T], key: Callable[[T], EndpointKey]) -> List[T]:
+        """Drop candidates whose endpoint is unavailable, keeping the configured order.
+
+        This only reads health state: call :meth:`try_claim` right before a candidate
+        is actually tried. If every endpoint is unavailable, all candidates are returned
+        so the run still tries something rather than failing without a request.
+        """
+        candidates = list(candidates)
+        healthy = [candidate for candidate in candidates if self.is_available(key(candidate))]
+        skipped = len(candidates) - len(healthy)
+        if skipped:
+            logger.info("Skipping %d unhealthy LLM endpoint(s)", skipped)
+        return healthy or candidates
+
+    def hedge_delay(self, key: EndpointKey) -> Optional[float]:
+        """Seconds to wait before hedging a call to ``key``, or ``None`` if hedging is off."""
+        configured = self.config.hedge_after_seconds
+        if configured is None:
+            return None
+        if configured >= 0:
+            return configured
+        with self._lock:
+            entry = self._health.get(key)
+            if entry is None or len(entry.samples) < self.config.min_samples:
+                return None
+            p95 = entry.latency_quantile(0.95, time.monotonic(), self.config.window_seconds)
+        return max(self.config.min_hedge_after_seconds, p95) if p95 is not None else None
+
+    def hedge_timeout(self, hedge_after: float) -> float:
+        """Timeout for the duplicate request of a call hedged after ``hedge_after`` seconds."""
+        return max(hedge_after, self.config.hedge_timeout_factor * hedge_after)
+
+    def run_hedged(
+        self,
+        call: Callable[[CancelToken], T],
+        hedge_after: float,
+        *,
+        hedge_call: Callable[[CancelToken], T] | None = None,
+        admit_hedge: Callable[[], bool] | None = None,
+        on_hedge: Callable[[], None] | None = None,
+    ) -> T:
+        """Run ``call``; if it has not finished after ``hedge_after`` seconds, send a duplicate.
+
+        The duplicate is ``hedge_call`` (``call`` by default). Both receive a
+        :class:`CancelToken`. The first successful result wins and the other request's
+        token is cancelled: a duplicate that has not been sent yet is dropped, and one
+        already in flight is expected to abort through its token callbacks or its own
+        timeout. A cancelled request must not report health samples.
+
+        No duplicate is sent, and the call just waits for the first request, when
+        ``max_hedges_in_flight`` pairs are already running or ``admit_hedge`` (for example
+        a non-blocking rate-limit check) returns False. An error is raised only if both
+        requests fail.
+        """
+        primary_token = CancelToken()
+        primary = self._hedge_pool.submit(contextvars.copy_context().run, call, primary_token)
+        try:
+            return primary.result(timeout=hedge_after)
+        except FuturesTimeout:
+            pass
+        if not self._hedge_slots.acquire(blocking=False):
+            logger.debug("Not hedging: %d hedged calls already in flight", self.config.max_hedges_in_flight)
+            return primary.result()
+        if admit_hedge is not None and not admit_hedge():
+            self._hedge_slots.release()
+            logger.debug("Not hedging: provider rate limit has no spare capacity")
+            return primary.result()
+        if on_hedge is not None:
+            on_hedge()
+        backup_token = CancelToken()
+        backup = self._hedge_pool.submit(contextvars.copy_context().run, hedge_call or call, backup_token)
+        # The slot stays taken until the loser has ended too, which bounds abandoned requests.
+        self._release_slot_when_done(primary, backup)
+        tokens = {primary: primary_token, backup: backup_token}
+
+        pending = {primary, backup}
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    for loser in pending:
+                        loser.cancel()
+                        tokens[loser].cancel()
+                    return future.result()
+                first_error = first_error or error
+        assert first_error is not None
+        raise first_error
+
+    def _release_slot_when_done(self, *futures: Future) -> None:
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def _done(_: Future) -> None:
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                self._hedge_slots.release()
+
+        for future in futures:
+            future.add_done_callback(_done)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint health summary for logs and diagnostics."""
+        now = time.monotonic()
+        window = self.config.window_seconds
+        def _rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 3) if value is not None else None
+
+        with self._lock:
+            return {
+                " | ".join(key): {
+                    "samples": len(entry.recent(now, window)),
+                    "error_rate": round(entry.error_rate(now, window), 3),
+                    "p50_s": _rounded(entry.latency_quantile(0.5, now, window)),
+                    "p95_s": _rounded(entry.latency_quantile(0.95, now, window)),
+                    "healthy": not entry.unhealthy_until or now >= entry.unhealthy_until,
+                }
+                for key, entry in self._health.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._health.clear()
+
+
+_ROUTER: Optional[ProviderRouter] = None
+_ROUTER_LOCK = threading.Lock()
+
+
+def get_provider_router() -> ProviderRouter:
+    """Return the process-wide provider router."""
+    global _ROUTER
+    with _ROUTER_LOCK:
+        if _ROUTER is None:
+            _ROUTER = ProviderRouter()
+        return _ROUTER
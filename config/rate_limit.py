@@ -0,0 +1,106 @@
+"""Thread-safe token-bucket rate limiting shared across concurrent pipeline runs."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate_per_minute`` acquisitions with bursts up to ``burst``."""
+
+    def __init__(self, rate_per_minute: float, *, burst: Optional[int] = None) -> None:
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_minute // 60)))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """Block until a token is available; return the number of seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                delay = (1.0 - self._tokens) / self.rate_per_second
+            time.sleep(delay)
+            waited += delay
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available, without taking one."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (1.0 - self._tokens) / self.rate_per_second)
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now; never waits."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+def provider_key(base_url: str) -> str:
+    """Identify a provider by the host of its API base URL."""
+    return urlparse(base_url).netloc or base_url
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITS: Dict[str, float] = {}
+_DEFAULT_LIMIT: Optional[float] = None
+_LOCK = threading.Lock()
+
+
+def configure_provider_rate_limit(rate_per_minute: Optional[float], *, base_url: Optional[str] = None) -> None:
+    """Set the per-provider request limit, either for one base URL or as the default for all.
+
+    ``None`` removes the limit. Already-built LLMs pick up the change on their next call.
+    """
+    global _DEFAULT_LIMIT
+    with _LOCK:
+        if base_url is None:
+            _DEFAULT_LIMIT = rate_per_minute
+            _LIMITERS.clear()
+        else:
+            key = provider_key(base_url)
+            if rate_per_minute is None:
+                _LIMITS.pop(key, None)
+            else:
+                _LIMITS[key] = rate_per_minute
+            _LIMITERS.pop(key, None)
+    logger.info(
+        "Provider rate limit set to %s requests/minute for %s",
+        rate_per_minute if rate_per_minute is not None else "unlimited",
+        base_url or "all providers",
+    )
+
+
+def get_provider_rate_limiter(base_url: str) -> Optional[RateLimiter]:
+    """Return the shared limiter for the provider behind ``base_url``, if one is configured."""
+    key = provider_key(base_url)
+    with _LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is not None:
+            return limiter
+        rate = _LIMITS.get(key, _DEFAULT_LIMIT)
+        if rate is None:
+            return None
+        limiter = RateLimiter(rate)
+        _LIMITERS[key] = limiter
+        return limiter
@@ -1,17 +1,30 @@
-"""Global configuration for the Agentic AI workshop project."""
+"""Global configuration for the Agentic AI workshop project.
+
+Importing this module is cheap: CrewAI, LangChain, OpenAI and httpx are imported by the
+builder functions that need them, so config can be read and validated (``main.py
+--check``) without loading the LLM stack.
+"""
 from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Dict, Any, TYPE_CHECKING
 
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from crewai.llm import LLM
+
+from .llm_cache import LLMResponseCache, get_llm_response_cache
+from .provider_router import endpoint_key
+from .rate_limit import configure_provider_rate_limit
 
 if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    import httpx
+    from langchain_openai import ChatOpenAI
     from openai import OpenAI
 
+    from .crewai_llm import OpenRouterLLM
+    from .http_clients import get_http_client, litellm_http_handler
+
 # Ensure environment variables from a local .env file are available during development.
 load_dotenv()
 
@@ -22,6 +35,9 @@ OPENROUTER_DEFAULT_HEADERS = {
     "X-Title": "Agentic AI Workshop",
 }
 
+if os.getenv("LLM_RATE_LIMIT_RPM"):
+    configure_provider_rate_limit(float(os.environ["LLM_RATE_LIMIT_RPM"]))
+
 LLM_CONFIG: Dict[str, object] = {
     "model": MODEL_NAME,
     "openrouter_api_key": os.getenv("OPENROUTER_API_KEY", ""),
@@ -30,6 +46,21 @@ LLM_CONFIG: Dict[str, object] = {
 }
 
 
+EXECUTION_MODES = ("sequential", "dag")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_LLM_CACHE_PATH = PROJECT_ROOT / ".cache" / "llm_responses.sqlite3"
+
+
+def _env_flag(env_var: str, default: bool = False) -> bool:
+    """Interpret common truthy spellings of an environment variable."""
+
+    raw_value = os.getenv(env_var)
+    if raw_value is None:
+        return default
+    return raw_value.strip().lower() in {"1", "true", "yes", "on"}
+
+
 def _split_env_list(env_var: str) -> list[str]:
     """Return a sanitized list from a comma-separated environment variable."""
 
@@ -57,24 +88,97 @@ class OpenRouterLLMConfig:
     )
 
 
-def get_openrouter_client() -> "OpenAI":
-    """Instantiate an OpenAI-compatible client configured for OpenRouter."""
+@dataclass
+class PipelineConfig:
+    """Execution settings for the career advisor task pipeline."""
+
+    execution_mode: str = field(
+        default_factory=lambda: os.getenv("CAREER_ADVISOR_EXECUTION_MODE", "sequential")
+    )
+    max_parallel_tasks: int = field(
+        default_factory=lambda: int(os.getenv("CAREER_ADVISOR_MAX_PARALLEL_TASKS", "4"))
+    )
+    summarize_context: bool = field(
+        default_factory=lambda: _env_flag("CAREER_ADVISOR_SUMMARIZE_CONTEXT")
+    )
+    summary_max_tokens: int = field(
+        default_factory=lambda: int(os.getenv("CAREER_ADVISOR_SUMMARY_MAX_TOKENS", "350"))
+    )
+
+
+@dataclass
+class LLMCacheConfig:
+    """Settings for the optional content-addressed LLM response cache."""
+
+    enabled: bool = field(default_factory=lambda: _env_flag("LLM_CACHE_ENABLED"))
+    path: str = field(default_factory=lambda: os.getenv("LLM_CACHE_PATH", str(DEFAULT_LLM_CACHE_PATH)))
+    ttl_seconds: float = field(
+        default_factory=lambda: float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    )
+    memory_max_entries: int = field(
+        default_factory=lambda: int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+    )
+    disk_max_entries: int = field(
+        default_factory=lambda: int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "10000"))
+    )
+    disk_max_mb: float = field(
+        default_factory=lambda: float(os.getenv("LLM_CACHE_DISK_MAX_MB", "256"))
+    )
+
+
+def get_response_cache(config: LLMCacheConfig | None = None) -> LLMResponseCache | None:
+    """Return the shared LLM response cache, or ``None`` when caching is disabled.
+
+    An empty ``LLM_CACHE_PATH`` keeps the cache in memory only.
+    """
+
+    config = config or LLMCacheConfig()
+    if not config.enabled:
+        return None
+    return get_llm_response_cache(
+        Path(config.path) if config.path else None,
+        ttl_seconds=config.ttl_seconds,
+        memory_max_entries=config.memory_max_entries,
+        disk_max_entries=config.disk_max_entries,
+        disk_max_bytes=int(config.disk_max_mb * 1024 * 1024),
+    )
+
+
+def get_openrouter_client(
+    base_url: str | None = None,
+    headers: Dict[str, str] | None = None,
+    *,
+    http_client: "httpx.Client | None" = None,
+) -> "OpenAI":
+    """Instantiate an OpenAI-compatible client configured for OpenRouter.
+
+    Requests go through the shared connection pool for ``base_url`` and ``headers``
+    unless an explicit ``http_client`` is given.
+    """
     from openai import OpenAI
 
+    from .http_clients import get_http_client
+
     config = OpenRouterLLMConfig()
     if not config.api_key:
         raise ValueError(
             "OPENROUTER_API_KEY is missing. Set it in your environment or .env file."
         )
+    base_url = base_url or config.base_url
+    headers = config.headers if headers is None else headers
     return OpenAI(
-        base_url=config.base_url,
+        base_url=base_url,
         api_key=config.api_key,
-        default_headers=config.headers,
+        default_headers=headers,
+        http_client=http_client or get_http_client(base_url, headers),
     )
 
 
-def build_openrouter_chat_llm(**overrides: Any) -> ChatOpenAI:
+def build_openrouter_chat_llm(**overrides: Any) -> "ChatOpenAI":
     """Return a LangChain ChatOpenAI client configured for OpenRouter usage."""
+    from langchain_openai import ChatOpenAI
+
+    from .http_clients import get_async_http_client, get_http_client
 
     config = OpenRouterLLMConfig()
     if not config.api_key:
@@ -82,18 +186,30 @@ def build_openrouter_chat_llm(**overrides: Any) -> ChatOpenAI:
             "OPENROUTER_API_KEY is missing. Set it in your environment or .env file."
         )
 
+    base_url = overrides.get("base_url", config.base_url)
     return ChatOpenAI(
         model=overrides.get("model", config.model),
         api_key=config.api_key,
-        base_url=config.base_url,
+        base_url=base_url,
         temperature=overrides.get("temperature", config.temperature),
         max_tokens=overrides.get("max_tokens", config.max_tokens),
         default_headers=config.headers,
+        http_client=overrides.get("http_client") or get_http_client(base_url, config.headers),
+        http_async_client=get_async_http_client(base_url, config.headers),
     )
 
 
-def build_crewai_llm(**overrides: Any) -> LLM:
-    """Return a CrewAI LLM instance configured for OpenRouter via LiteLLM."""
+def build_crewai_llm(**overrides: Any) -> "OpenRouterLLM":
+    """Return a CrewAI LLM instance configured for OpenRouter via LiteLLM.
+
+    When ``LLM_CACHE_ENABLED`` is set the LLM serves repeated completions from the shared
+    response cache; pass ``cache=False`` to opt a single LLM out. LiteLLM sends requests
+    over the shared connection pool for the base URL, or over ``http_client`` when one is
+    passed: through its own HTTP handler on the OpenRouter route, and through an OpenAI
+    client when ``provider="openai"``.
+    """
+    from .crewai_llm import OpenRouterLLM
+    from .http_clients import get_http_client, litellm_http_handler
 
     config = OpenRouterLLMConfig()
     if not config.api_key:
@@ -128,6 +244,9 @@ def build_crewai_llm(**overrides: Any) -> LLM:
         "extra_headers": extra_headers,
     }
 
+    if overrides.get("stream"):
+        llm_kwargs["stream"] = True
+
     if provider_override:
         llm_kwargs["provider"] = provider_override
         if provider_override == "openai":
@@ -136,7 +255,22 @@ def build_crewai_llm(**overrides: Any) -> LLM:
             )
             llm_kwargs.pop("custom_llm_provider", None)
 
+    if provider_override == "openai":
+        llm_kwargs["client"] = get_openrouter_client(
+            base_url, extra_headers, http_client=overrides.get("http_client")
+        )
+    else:
+        # The openrouter/ route ignores OpenAI clients; it needs LiteLLM's own handler.
+        llm_kwargs["client"] = litellm_http_handler(
+            overrides.get("http_client") or get_http_client(base_url, extra_headers)
+        )
+
     # Allow callers to extend with LiteLLM-specific parameters.
     llm_kwargs.update(overrides.get("litellm_params", {}))
 
-    return LLM(**llm_kwargs)
+    response_cache = get_response_cache() if overrides.get("cache", True) else None
+    return OpenRouterLLM(
+        response_cache=response_cache,
+        endpoint=endpoint_key(provider_override, raw_model, base_url),
+        **llm_kwargs,
+    )
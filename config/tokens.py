@@ -0,0 +1,79 @@
+"""Token counting and trimming with a real tokenizer (tiktoken).
+
+When tiktoken or its encoding files cannot be loaded (it downloads them on first use),
+counts fall back to an approximation of four characters per token.
+"""
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+APPROX_CHARS_PER_TOKEN = 4
+
+
+class ApproximateEncoding:
+    """Stand-in for a tiktoken encoding that treats every four characters as one token."""
+
+    name = "approximate"
+
+    def encode(self, text: str, disallowed_special: Any = ()) -> List[str]:
+        return [text[i : i + APPROX_CHARS_PER_TOKEN] for i in range(0, len(text), APPROX_CHARS_PER_TOKEN)]
+
+    def decode(self, tokens: List[str]) -> str:
+        return "".join(tokens)
+
+
+@lru_cache(maxsize=1)
+def _default_encoding() -> Any:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as exc:  # missing package, or no network to fetch the encoding
+        logger.warning(
+            "Could not load the %s tokenizer (%s); approximating %d characters per token",
+            DEFAULT_ENCODING,
+            exc,
+            APPROX_CHARS_PER_TOKEN,
+        )
+        return ApproximateEncoding()
+
+
+@lru_cache(maxsize=16)
+def get_encoding(model: Optional[str] = None) -> Any:
+    """Return the tiktoken encoding for ``model``, falling back to ``cl100k_base``.
+
+    Provider prefixes such as ``openai/`` or ``openrouter/`` are ignored; models tiktoken
+    does not know (most non-OpenAI models) use the default encoding as an approximation.
+    If that cannot be loaded either, an :class:`ApproximateEncoding` is returned.
+    """
+    if model:
+        try:
+            import tiktoken
+
+            return tiktoken.encoding_for_model(model.rsplit("/", 1)[-1])
+        except Exception:  # unknown model, or tiktoken unavailable
+            pass
+    return _default_encoding()
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Number of tokens ``text`` encodes to for ``model``."""
+    return len(get_encoding(model).encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens, preferring to end on a whitespace boundary."""
+    encoding = get_encoding(model)
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    truncated = encoding.decode(tokens[: max(0, max_tokens)])
+    boundary = truncated.rfind(" ")
+    if boundary > len(truncated) // 2:
+        truncated = truncated[:boundary]
+    return truncated.rstrip()
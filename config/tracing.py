@@ -0,0 +1,344 @@
+"""Lightweight tracing for pipeline runs, tasks, LLM calls and tool calls.
+
+Spans nest through a ``contextvars`` variable, so a tool call made while a task is
+running is recorded as that task's child, including across the DAG scheduler's worker
+threads. Finished spans are folded into in-process Prometheus metrics (latency
+histograms plus token, cache-hit, retry and error counters) and, when a path is
+configured, written to a size-rotated JSONL file. The metrics can be scraped from a
+small ``http.server`` endpoint.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from .logging_config import BoundedQueueHandler
+
+logger = logging.getLogger(__name__)
+
+SPAN_KINDS = ("pipeline", "task", "llm", "tool")
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class TracingConfig:
+    """Tracing settings, read from ``TRACE_*``/``METRICS_*`` environment variables by default.
+
+    Spans only feed the in-process metrics unless ``jsonl_path`` is set.
+    """
+
+    enabled: bool = field(default_factory=lambda: os.getenv("TRACE_ENABLED", "true").lower() != "false")
+    jsonl_path: Optional[Path] = field(
+        default_factory=lambda: Path(os.getenv("TRACE_JSONL_PATH")) if os.getenv("TRACE_JSONL_PATH") else None
+    )
+    jsonl_max_bytes: int = field(
+        default_factory=lambda: int(os.getenv("TRACE_JSONL_MAX_BYTES", str(10 * 1024 * 1024)))
+    )
+    jsonl_backup_count: int = field(default_factory=lambda: int(os.getenv("TRACE_JSONL_BACKUP_COUNT", "5")))
+    metrics_port: Optional[int] = field(
+        default_factory=lambda: int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+    )
+    metrics_host: str = field(default_factory=lambda: os.getenv("METRICS_HOST", "127.0.0.1"))
+
+
+@dataclass
+class Span:
+    """One timed operation; ``attributes`` carry tokens, cache hits, retries and similar."""
+
+    kind: str
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    start_time: float = field(default_factory=time.time)
+    duration_s: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def increment(self, attribute: str, amount: int = 1) -> None:
+        self.attributes[attribute] = self.attributes.get(attribute, 0) + amount
+
+
+_CURRENT_SPAN: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class _SpanQueueHandler(BoundedQueueHandler):
+    """Queue handler for span lines; drop notices go to the log, not into the JSONL file."""
+
+    def _report_drops(self) -> None:
+        with self._drop_lock:
+            count, self._unreported = self._unreported, 0
+        if count:
+            logger.warning("Trace queue full; dropped %d span(s)", count)
+
+
+class JsonlSpanExporter:
+    """Write each finished span as one JSON line to a size-rotated file.
+
+    Lines go through the same bounded queue and background writer as application logs,
+    so exporting never does file I/O on the traced thread; when the writer falls behind,
+    the oldest queued spans are dropped.
+    """
+
+    def __init__(self, path: Path, *, max_bytes: int, backup_count: int, queue_size: int = 10000) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            self.path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        span_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        self._listener: Optional[logging.handlers.QueueListener] = logging.handlers.QueueListener(
+            span_queue, file_handler
+        )
+        self._listener.start()
+        self._file_handler = file_handler
+        self._handler = _SpanQueueHandler(span_queue, drop_policy="drop_oldest", max_message_chars=0)
+        atexit.register(self.close)
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(asdict(span), default=str, separators=(",", ":"))
+        record = logging.makeLogRecord({"name": __name__, "levelno": logging.INFO, "levelname": "INFO", "msg": line})
+        self._handler.handle(record)
+
+    def close(self) -> None:
+        """Write the queued spans and close the file (idempotent)."""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            self._file_handler.close()
+
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Counters and latency histograms rendered in the Prometheus text exposition format."""
+
+    def __init__(self, prefix: str = "career_advisor") -> None:
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[Labels, List[float]] = {}
+        self._histogram_sums: Dict[Labels, float] = {}
+
+    def inc(self, metric: str, amount: float = 1.0, /, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(metric, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe_span(self, span: Span) -> None:
+        labels: Labels = (("kind", span.kind), ("name", span.name))
+        with self._lock:
+            buckets = self._histograms.setdefault(labels, [0.0] * (len(LATENCY_BUCKETS) + 1))
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if span.duration_s <= bound:
+                    buckets[index] += 1
+            buckets[-1] += 1
+            self._histogram_sums[labels] = self._histogram_sums.get(labels, 0.0) + span.duration_s
+
+    @staticmethod
+    def _render_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = [*labels, *extra]
+        if not pairs:
+            return ""
+        rendered = []
+        for key, value in pairs:
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            rendered.append(f'{key}="{escaped}"')
+        return "{" + ",".join(rendered) + "}"
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            histogram = f"{self.prefix}_span_duration_seconds"
+            lines.append(f"# TYPE {histogram} histogram")
+            for labels, buckets in sorted(self._histograms.items()):
+                for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), buckets):
+                    lines.append(f"{histogram}_bucket{self._render_labels(labels, (('le', str(bound)),))} {count:g}")
+                lines.append(f"{histogram}_sum{self._render_labels(labels)} {self._histogram_sums[labels]:.6f}")
+                lines.append(f"{histogram}_count{self._render_labels(labels)} {buckets[-1]:g}")
+            for name, series in sorted(self._counters.items()):
+                metric = f"{self.prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{metric}{self._render_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the JSONL exporter and metrics registry."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.exporter: Optional[JsonlSpanExporter] = None
+        self.metrics = MetricsRegistry()
+
+    def finish(self, span: Span) -> None:
+        self.metrics.observe_span(span)
+        attributes = span.attributes
+        if span.status != "ok":
+            self.metrics.inc("span_errors", kind=span.kind, name=span.name)
+        cache_hits = int(attributes.get("cache_hits", 0)) + (1 if attributes.get("cache_hit") else 0)
+        if cache_hits:
+            self.metrics.inc("cache_hits", cache_hits, kind=span.kind, name=span.name)
+        if attributes.get("retries"):
+            self.metrics.inc("retries", attributes["retries"], kind=span.kind, name=span.name)
+        for token_type in ("prompt_tokens", "completion_tokens"):
+            if attributes.get(token_type):
+                self.metrics.inc(
+                    "llm_tokens", attributes[token_type], model=span.name, type=token_type.split("_")[0]
+                )
+        if self.exporter is not None:
+            try:
+                self.exporter.export(span)
+            except OSError:  # pragma: no cover - tracing must never break a run
+                logger.exception("Failed to export span %s", span.name)
+
+
+_TRACER = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer."""
+    return _TRACER
+
+
+def tracing_enabled() -> bool:
+    return _TRACER.enabled
+
+
+def current_span() -> Optional[Span]:
+    return _CURRENT_SPAN.get()
+
+
+def increment(attribute: str, amount: int = 1) -> None:
+    """Add to a counter attribute of the active span, if any."""
+    span = _CURRENT_SPAN.get()
+    if span is not None:
+        span.increment(attribute, amount)
+
+
+def annotate(**attributes: Any) -> None:
+    """Set attributes on the active span, if any (a no-op while tracing is disabled)."""
+    span = _CURRENT_SPAN.get()
+    if span is not None:
+        span.set(**attributes)
+
+
+@contextmanager
+def span(kind: str, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time the enclosed block as a child of the active span; yields ``None`` when disabled."""
+    if not _TRACER.enabled:
+        yield None
+        return
+    parent = _CURRENT_SPAN.get()
+    current = Span(
+        kind=kind,
+        name=name,
+        trace_id=parent.trace_id if parent is not None else uuid.uuid4().hex,
+        parent_id=parent.span_id if parent is not None else None,
+        attributes=dict(attributes),
+    )
+    token = _CURRENT_SPAN.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as exc:
+        current.status = "error"
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        current.duration_s = time.perf_counter() - started
+        _CURRENT_SPAN.reset(token)
+        _TRACER.finish(current)
+
+
+def traced_tool(method: F) -> F:
+    """Decorate a tool's ``_run``/``_arun`` so each call is recorded as a ``tool`` span."""
+    if asyncio.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def _async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            with span("tool", getattr(self, "name", type(self).__name__)):
+                return await method(self, *args, **kwargs)
+
+        return _async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(method)
+    def _wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with span("tool", getattr(self, "name", type(self).__name__)):
+            return method(self, *args, **kwargs)
+
+    return _wrapper  # type: ignore[return-value]
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = _TRACER.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - silence per-request logs
+        return
+
+
+_METRICS_SERVER: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``/metrics`` in the Prometheus text format from a daemon thread (idempotent).
+
+    Binds to loopback by default; pass ``host="0.0.0.0"`` to let a remote scraper in.
+    """
+    global _METRICS_SERVER
+    if _METRICS_SERVER is None:
+        _METRICS_SERVER = ThreadingHTTPServer((host, port), _MetricsHandler)
+        threading.Thread(target=_METRICS_SERVER.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info("Serving Prometheus metrics on http://%s:%d/metrics", host, port)
+    return _METRICS_SERVER
+
+
+def configure_tracing(config: TracingConfig | None = None) -> Tracer:
+    """Enable span recording, the JSONL exporter and the metrics endpoint per ``config``."""
+    config = config or TracingConfig()
+    _TRACER.enabled = config.enabled
+    if _TRACER.exporter is not None:
+        _TRACER.exporter.close()
+    _TRACER.exporter = None
+    if config.enabled and config.jsonl_path:
+        _TRACER.exporter = JsonlSpanExporter(
+            config.jsonl_path, max_bytes=config.jsonl_max_bytes, backup_count=config.jsonl_backup_count
+        )
+    if config.enabled and config.metrics_port:
+        start_metrics_server(config.metrics_port, config.metrics_host)
+    return _TRACER
@@ -1,10 +1,18 @@
 #"""Crew assembly for the Career Advisor system."""
 from __future__ import annotations
 
+import contextvars
+import json
 import logging
-from typing import Any
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
 
-from crewai import Crew, Process
+from crewai import Agent, Crew, Process, Task
+from crewai.tasks.task_output import TaskOutput
 
 from agents import (
     create_career_guidance_agent,
@@ -12,39 +20,168 @@ from agents import (
     create_resume_builder_agent,
     create_course_recommendation_agent,
 )
-from config.settings import OpenRouterLLMConfig
+from config.http_clients import get_http_client
+from config.llm_cache import iter_llm_response_caches
+from config.llm_streaming import route_llm_tokens
+from config.provider_router import EndpointKey, endpoint_key, get_provider_router
+from config.settings import EXECUTION_MODES, OpenRouterLLMConfig, PipelineConfig, build_crewai_llm
+from config.tracing import annotate, span
+from schemas import TASK_OUTPUT_MODELS, ReportModel
+from task_summaries import ContextSummarizer
 from tasks import build_career_advisor_tasks
-from tools import get_default_toolkit
+from tools import get_default_toolkit, get_retrieval_cache
 
 logger = logging.getLogger(__name__)
 
 
+class CareerAdvisorPipeline:
+    """Agents, LLM clients and tools for one LLM override set, built once and reused.
+
+    The expensive parts are shared by every run: the LLM with its pooled HTTP client,
+    and the toolkits with their vector store and caches. CrewAI agents keep per-execution
+    state, so :meth:`build_crew` creates lightweight agents and fresh tasks for each
+    request, and concurrent runs never contend for an agent.
+    """
+
+    def __init__(self, llm_overrides: dict[str, Any] | None = None) -> None:
+        self.llm_overrides = dict(llm_overrides or {})
+        config = OpenRouterLLMConfig()
+        self.http_client = get_http_client(
+            self.llm_overrides.get("base_url", config.base_url),
+            self.llm_overrides.get("extra_headers", config.headers),
+        )
+        self.llm = build_crewai_llm(http_client=self.http_client, **self.llm_overrides)
+        self.guidance_tools = get_default_toolkit()
+        self.assessment_tools = get_default_toolkit()
+        self.resume_tools = get_default_toolkit()
+        self.course_tools = get_default_toolkit()
+        self.tools = [*self.guidance_tools, *self.assessment_tools, *self.resume_tools, *self.course_tools]
+        self._summary_llm: Any = None
+        self._summary_llm_lock = threading.Lock()
+
+    def summary_llm(self) -> Any:
+        """Non-streaming LLM used to condense task outputs for downstream context, built once."""
+        with self._summary_llm_lock:
+            if self._summary_llm is None:
+                overrides = {key: value for key, value in self.llm_overrides.items() if key != "stream"}
+                self._summary_llm = build_crewai_llm(
+                    http_client=self.http_client, **{**overrides, "temperature": 0.0}
+                )
+            return self._summary_llm
+
+    def build_agents(self) -> list[Agent]:
+        """Return new agents for one request, backed by the shared LLM and tools."""
+        return [
+            create_career_guidance_agent(tools=self.guidance_tools, llm=self.llm),
+            create_skills_assessment_agent(tools=self.assessment_tools, llm=self.llm),
+            create_resume_builder_agent(tools=self.resume_tools, llm=self.llm),
+            create_course_recommendation_agent(tools=self.course_tools, llm=self.llm),
+        ]
+
+    def build_crew(self) -> Crew:
+        """Return a crew with fresh agents and tasks for a single request."""
+        agents = self.build_agents()
+        tasks = build_career_advisor_tasks(*agents, assessment_tools=self.assessment_tools)
+        return Crew(
+            agents=agents,
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def warm_up(self) -> None:
+        """Load the shared vector store now instead of on the first RAG tool call."""
+        from tools.rag_tool import LocalRAGTool
+
+        for tool in self.tools:
+            if isinstance(tool, LocalRAGTool):
+                try:
+                    tool._load_vectorstore()
+                except FileNotFoundError as exc:
+                    logger.warning("Skipping vector store warm-up: %s", exc)
+                break
+
+
+_PIPELINES: dict[str, CareerAdvisorPipeline] = {}
+_PIPELINES_LOCK = threading.Lock()
+
+
+def get_career_advisor_pipeline(llm_overrides: dict[str, Any] | None = None) -> CareerAdvisorPipeline:
+    """Return the process-wide pipeline for an override set, building it on first use."""
+    key = json.dumps(llm_overrides or {}, sort_keys=True, default=str)
+    with _PIPELINES_LOCK:
+        pipeline = _PIPELINES.get(key)
+        if pipeline is None:
+            pipeline = CareerAdvisorPipeline(llm_overrides)
+            _PIPELINES[key] = pipeline
+            logger.info("Built career advisor pipeline for overrides %s", _sanitize_overrides(llm_overrides or {}))
+        return pipeline
+
+
 def create_career_advisor_crew(llm_overrides: dict[str, Any] | None = None) -> Crew:
     """Instantiate career advisor crew with specialized agents, tasks, and tools."""
-    guidance_tools = get_default_toolkit()
-    assessment_tools = get_default_toolkit()
-    resume_tools = get_default_toolkit()
-    course_tools = get_default_toolkit()
-
-    career_guidance_agent = create_career_guidance_agent(tools=guidance_tools, llm_overrides=llm_overrides)
-    skills_assessment_agent = create_skills_assessment_agent(tools=assessment_tools, llm_overrides=llm_overrides)
-    resume_builder_agent = create_resume_builder_agent(tools=resume_tools, llm_overrides=llm_overrides)
-    course_recommendation_agent = create_course_recommendation_agent(tools=course_tools, llm_overrides=llm_overrides)
-
-    tasks = build_career_advisor_tasks(
-        career_guidance_agent,
-        skills_assessment_agent,
-        resume_builder_agent,
-        course_recommendation_agent,
-        assessment_tools=assessment_tools,
-    )
+    return get_career_advisor_pipeline(llm_overrides).build_crew()
 
-    return Crew(
-        agents=[career_guidance_agent, skills_assessment_agent, resume_builder_agent, course_recommendation_agent],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True,
-    )
+
+@dataclass(frozen=True)
+class PipelineEvent:
+    """Progress notification emitted while the pipeline runs.
+
+    ``type`` is one of ``task_started``, ``token``, ``output_invalid``, ``task_finished``,
+    ``attempt_failed``, ``completed`` or ``error``; ``task`` names the task for task-scoped
+    events and ``data`` carries the token, validation error, task output, final report or
+    error message. ``task_finished`` events also carry the validated output model in
+    ``payload`` when there is one; ``output_invalid`` precedes a ``task_finished`` whose
+    output did not match its model and is shown as raw text.
+    """
+
+    type: str
+    task: Optional[str] = None
+    data: str = ""
+    payload: Optional[ReportModel] = None
+
+
+EventSink = Callable[[PipelineEvent], None]
+
+
+class PipelineStopped(RuntimeError):
+    """Raised between tasks once a run's stop flag is set, e.g. by a departed stream consumer."""
+
+
+def _stop_requested(stop: threading.Event | None) -> bool:
+    return stop is not None and stop.is_set()
+
+
+@dataclass
+class PipelineCheckpoint:
+    """Outputs of the tasks already completed in one pipeline run.
+
+    The checkpoint outlives a single crew attempt so that an LLM fallback resumes at the
+    task that failed instead of paying for the finished tasks again.
+    """
+
+    outputs: dict[str, TaskOutput] = field(default_factory=dict)
+    summaries: dict[str, str] = field(default_factory=dict)
+
+    def record(self, task_name: str, output: TaskOutput) -> None:
+        self.outputs[task_name] = output
+
+    def get(self, task_name: str) -> TaskOutput | None:
+        return self.outputs.get(task_name)
+
+    @property
+    def completed(self) -> list[str]:
+        return list(self.outputs)
+
+    def structured(self) -> dict[str, ReportModel]:
+        """Validated output model of each completed task that produced one."""
+        models = {name: _structured_output(name, output) for name, output in self.outputs.items()}
+        return {name: model for name, model in models.items() if model is not None}
+
+    def invalid_outputs(self) -> dict[str, str]:
+        """Validation error of each completed task whose output fell back to raw text."""
+        errors = {name: _validate_output(name, output)[1] for name, output in self.outputs.items()}
+        return {name: error for name, error in errors.items() if error is not None}
 
 
 def _build_llm_attempts(config: OpenRouterLLMConfig) -> list[dict[str, Any]]:
@@ -90,6 +227,16 @@ def _build_llm_attempts(config: OpenRouterLLMConfig) -> list[dict[str, Any]]:
     return attempts
 
 
+def _attempt_endpoint(overrides: dict[str, Any], config: OpenRouterLLMConfig) -> EndpointKey:
+    """Endpoint an attempt's LLM reports to, matching ``build_crewai_llm``."""
+
+    return endpoint_key(
+        overrides.get("provider"),
+        overrides.get("model", config.model),
+        overrides.get("base_url", config.base_url),
+    )
+
+
 def _sanitize_overrides(overrides: dict[str, Any]) -> dict[str, Any]:
     """Remove verbose or sensitive values before logging overrides."""
 
@@ -100,52 +247,369 @@ def _sanitize_overrides(overrides: dict[str, Any]) -> dict[str, Any]:
     return sanitized
 
 
+def _validate_output(task_name: str, output: TaskOutput | None) -> tuple[ReportModel | None, str | None]:
+    """Return the task's validated output model, parsing the raw JSON if CrewAI did not.
+
+    The second item is the validation error when the task has an output model but its
+    answer does not match it; the raw text is then used instead.
+    """
+
+    if output is None:
+        return None, None
+    if isinstance(output.pydantic, ReportModel):
+        return output.pydantic, None
+    model = TASK_OUTPUT_MODELS.get(task_name)
+    if model is None or not output.raw:
+        return None, None
+    try:
+        output.pydantic = model.model_validate_json(output.raw)
+    except ValueError as exc:
+        logger.warning("Output of task '%s' does not match %s; keeping raw text", task_name, model.__name__)
+        return None, f"does not match {model.__name__}: {str(exc).splitlines()[0]}"
+    return output.pydantic, None
+
+
+def _structured_output(task_name: str, output: TaskOutput | None) -> ReportModel | None:
+    return _validate_output(task_name, output)[0]
+
+
+def _compact_handoff(task: Task) -> None:
+    """Replace the task's raw text with compact JSON, which is what dependents receive."""
+
+    model = _structured_output(task.name, task.output)
+    if model is not None:
+        task.output.raw = model.to_compact_json()
+
+
+def _output_text(output: TaskOutput | None, task_name: str | None = None) -> str:
+    """Render a task output for people: Markdown from its model, else the raw text."""
+
+    if output is None:
+        return ""
+    model = _structured_output(task_name or output.name or "", output)
+    return model.to_markdown() if model is not None else output.raw
+
+
+def _has_explicit_context(task: Task) -> bool:
+    context = getattr(task, "context", None)
+    return isinstance(context, list) and bool(context)
+
+
+def _task_dependencies(task: Task) -> list[Task]:
+    context = getattr(task, "context", None)
+    return list(context) if isinstance(context, list) else []
+
+
+def _kickoff_task(
+    task: Task,
+    inputs: dict[str, Any],
+    verbose: bool,
+    emit: EventSink | None = None,
+    summarizer: ContextSummarizer | None = None,
+) -> TaskOutput | None:
+    """Execute one task through a single-task crew; context comes from ``task.context``.
+
+    With an ``emit`` sink, start/finish events are published and tokens streamed by the
+    task's LLM calls are forwarded as ``token`` events tagged with the task name. With a
+    ``summarizer``, the task sees summaries of its context tasks instead of full outputs.
+    """
+
+    with span("task", task.name, agent=getattr(task.agent, "role", None)):
+        with summarizer.summarized_context(task) if summarizer is not None else nullcontext():
+            return _kickoff_single_task(task, inputs, verbose, emit)
+
+
+def _kickoff_single_task(
+    task: Task, inputs: dict[str, Any], verbose: bool, emit: EventSink | None
+) -> TaskOutput | None:
+    single_task_crew = Crew(
+        agents=[task.agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=verbose,
+    )
+    if emit is None:
+        single_task_crew.kickoff(inputs=inputs)
+        _compact_handoff(task)
+        return task.output
+
+    emit(PipelineEvent("task_started", task.name))
+    with route_llm_tokens(lambda chunk: emit(PipelineEvent("token", task.name, chunk))):
+        single_task_crew.kickoff(inputs=inputs)
+    _compact_handoff(task)
+    _emit_finished(task, emit)
+    return task.output
+
+
+def _emit_finished(task: Task, emit: EventSink) -> None:
+    model, error = _validate_output(task.name, task.output)
+    if error is not None:
+        emit(PipelineEvent("output_invalid", task.name, error))
+    emit(PipelineEvent("task_finished", task.name, _output_text(task.output, task.name), model))
+
+
+def _replay_checkpointed(task: Task, output: TaskOutput, emit: EventSink | None) -> None:
+    task.output = output
+    logger.info("Reusing checkpointed output for task '%s'", task.name)
+    if emit is not None:
+        _emit_finished(task, emit)
+
+
+def _run_tasks(
+    crew: Crew,
+    inputs: dict[str, Any],
+    checkpoint: PipelineCheckpoint,
+    emit: EventSink | None = None,
+    summarizer: ContextSummarizer | None = None,
+    stop: threading.Event | None = None,
+) -> TaskOutput | None:
+    """Run the crew's tasks in order, skipping any task already stored in the checkpoint.
+
+    Tasks without declared dependencies receive the output of every earlier task as
+    context, matching ``Process.sequential`` while letting completed outputs come from a
+    previous attempt. :class:`PipelineStopped` is raised before the next task once
+    ``stop`` is set.
+    """
+
+    finished: list[Task] = []
+    for task in crew.tasks:
+        cached = checkpoint.get(task.name)
+        if cached is not None:
+            _replay_checkpointed(task, cached, emit)
+        else:
+            if _stop_requested(stop):
+                raise PipelineStopped(f"Pipeline stopped before task '{task.name}'")
+            if not _has_explicit_context(task):
+                task.context = list(finished)
+            checkpoint.record(
+                task.name, _kickoff_task(task, inputs, crew.verbose, emit, summarizer)
+            )
+            logger.info("Task '%s' output:\n%s", task.name, task.output)
+        finished.append(task)
+
+    return crew.tasks[-1].output if crew.tasks else None
+
+
+def _run_task_graph(
+    crew: Crew,
+    inputs: dict[str, Any],
+    checkpoint: PipelineCheckpoint,
+    *,
+    max_workers: int,
+    emit: EventSink | None = None,
+    summarizer: ContextSummarizer | None = None,
+    stop: threading.Event | None = None,
+) -> None:
+    """Run the crew's tasks as a dependency graph, starting each task once its context is ready.
+
+    Independent tasks execute concurrently, so wall time follows the critical path. When a
+    task fails, no new tasks are scheduled, running ones are allowed to finish (and are
+    checkpointed for the next attempt), and the first error is re-raised. Setting
+    ``stop`` is handled the same way, with :class:`PipelineStopped` as the error.
+    """
+
+    task_ids = {id(task) for task in crew.tasks}
+    for task in crew.tasks:
+        unknown = [dep.name for dep in _task_dependencies(task) if id(dep) not in task_ids]
+        if unknown:
+            raise ValueError(f"Task '{task.name}' depends on tasks outside the crew: {unknown}")
+
+    done: set[int] = set()
+    pending: list[Task] = []
+    for task in crew.tasks:
+        cached = checkpoint.get(task.name)
+        if cached is not None:
+            _replay_checkpointed(task, cached, emit)
+            done.add(id(task))
+        else:
+            pending.append(task)
+
+    first_error: BaseException | None = None
+    running: dict[Future, Task] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="crew-task") as pool:
+        while pending or running:
+            if first_error is None and pending and _stop_requested(stop):
+                first_error = PipelineStopped(
+                    "Pipeline stopped before tasks: " + ", ".join(task.name for task in pending)
+                )
+            if first_error is None:
+                ready = [
+                    task
+                    for task in pending
+                    if all(id(dep) in done for dep in _task_dependencies(task))
+                ]
+                for task in ready:
+                    pending.remove(task)
+                    logger.info("Starting task '%s'", task.name)
+                    # Each worker runs in a copy of the caller's context so task spans
+                    # nest under the pipeline span.
+                    future = pool.submit(
+                        contextvars.copy_context().run,
+                        _kickoff_task,
+                        task,
+                        inputs,
+                        crew.verbose,
+                        emit,
+                        summarizer,
+                    )
+                    running[future] = task
+
+            if not running:
+                if first_error is None:
+                    stuck = ", ".join(task.name for task in pending)
+                    raise ValueError(f"Task graph has a dependency cycle between: {stuck}")
+                break
+
+            completed, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in completed:
+                task = running.pop(future)
+                try:
+                    output = future.result()
+                except Exception as exc:  # pragma: no cover - runtime resilience path
+                    logger.error("Task '%s' failed: %s", task.name, exc)
+                    first_error = first_error or exc
+                    continue
+                checkpoint.record(task.name, output)
+                done.add(id(task))
+                logger.info("Task '%s' output:\n%s", task.name, output)
+
+    if first_error is not None:
+        raise first_error
+
+
+def _assemble_report(tasks: list[Task]) -> str:
+    """Combine every task output into a single report, in declaration order."""
+
+    sections = [
+        f"## {task.name}\n\n{_output_text(task.output, task.name).strip()}"
+        for task in tasks
+        if task.output is not None
+    ]
+    return "\n\n".join(sections)
+
+
 def _execute_crew(
-    user_profile: str, overrides: dict[str, Any], config: OpenRouterLLMConfig
+    user_profile: str,
+    overrides: dict[str, Any],
+    config: OpenRouterLLMConfig,
+    checkpoint: PipelineCheckpoint,
+    pipeline_config: PipelineConfig,
+    emit: EventSink | None = None,
+    stop: threading.Event | None = None,
 ) -> str:
-    crew = create_career_advisor_crew(llm_overrides=overrides)
+    # Token streaming needs the LLMs to request streamed completions from the provider.
+    llm_overrides = {**overrides, "stream": True} if emit is not None else overrides
+    pipeline = get_career_advisor_pipeline(llm_overrides)
+    crew = pipeline.build_crew()
     provider_label = overrides.get("provider", "openrouter-liteLLM")
     model_label = overrides.get("model", config.model)
     base_url_label = overrides.get("base_url", config.base_url)
     logger.info(
-        "Crew kickoff started for user profile: %s (provider=%s model=%s base_url=%s)",
+        "Crew kickoff started for user profile: %s (provider=%s model=%s base_url=%s mode=%s)",
         user_profile[:100] + "..." if len(user_profile) > 100 else user_profile,
         provider_label,
         model_label,
         base_url_label,
+        pipeline_config.execution_mode,
+    )
+    if checkpoint.completed:
+        logger.info(
+            "Resuming crew with %d completed task(s) from checkpoint: %s",
+            len(checkpoint.completed),
+            ", ".join(checkpoint.completed),
+        )
+
+    summarizer = (
+        ContextSummarizer(
+            pipeline.summary_llm,
+            checkpoint.summaries,
+            max_tokens=pipeline_config.summary_max_tokens,
+        )
+        if pipeline_config.summarize_context
+        else None
     )
-    result = crew.kickoff(inputs={"user_profile": user_profile})
-
-    for task in crew.tasks:
-        task_output = getattr(task, "output", None)
-        if task_output:
-            logger.info("Task '%s' output:\n%s", task.name, task_output)
-
-    if isinstance(result, str):
-        logger.info("Crew completed with final output length=%d characters", len(result))
-        return result
 
-    candidate = getattr(result, "raw_output", None) or getattr(result, "output", None)
-    if candidate:
-        output_text = str(candidate)
-        logger.info("Crew completed with final output length=%d characters", len(output_text))
-        return output_text
+    inputs = {"user_profile": user_profile}
+    if pipeline_config.execution_mode == "dag":
+        _run_task_graph(
+            crew,
+            inputs,
+            checkpoint,
+            max_workers=pipeline_config.max_parallel_tasks,
+            emit=emit,
+            summarizer=summarizer,
+            stop=stop,
+        )
+        output_text = _assemble_report(crew.tasks)
+    else:
+        output_text = _output_text(
+            _run_tasks(crew, inputs, checkpoint, emit, summarizer, stop),
+            crew.tasks[-1].name if crew.tasks else None,
+        )
 
-    output_text = str(result)
     logger.info("Crew completed with final output length=%d characters", len(output_text))
     return output_text
 
 
-def run_career_advisor_pipeline(user_profile: str) -> str:
-    """Run the career advisor crew for a given user profile with OpenRouter fallback attempts."""
+def run_career_advisor_pipeline(
+    user_profile: str,
+    checkpoint: PipelineCheckpoint | None = None,
+    *,
+    execution_mode: str | None = None,
+    on_event: EventSink | None = None,
+    stop: threading.Event | None = None,
+) -> str:
+    """Run the career advisor crew for a given user profile with OpenRouter fallback attempts.
+
+    Completed task outputs are kept in ``checkpoint`` so each fallback attempt resumes at the
+    task that failed rather than re-running the whole crew. ``execution_mode`` selects
+    ``"sequential"`` or ``"dag"`` (concurrent independent tasks) and defaults to
+    ``CAREER_ADVISOR_EXECUTION_MODE``. ``on_event`` receives :class:`PipelineEvent` progress
+    notifications, including streamed LLM tokens. Once ``stop`` is set, no further task is
+    started and :class:`PipelineStopped` is raised without trying the fallbacks.
+    """
 
     config = OpenRouterLLMConfig()
-    attempts = _build_llm_attempts(config)
+    pipeline_config = PipelineConfig()
+    if execution_mode is not None:
+        pipeline_config.execution_mode = execution_mode
+    if pipeline_config.execution_mode not in EXECUTION_MODES:
+        raise ValueError(
+            f"Unknown execution mode '{pipeline_config.execution_mode}'. Expected one of {EXECUTION_MODES}."
+        )
+    checkpoint = checkpoint if checkpoint is not None else PipelineCheckpoint()
+    with span("pipeline", "career_advisor", execution_mode=pipeline_config.execution_mode):
+        return _run_attempts(user_profile, config, pipeline_config, checkpoint, on_event, stop)
+
+
+def _run_attempts(
+    user_profile: str,
+    config: OpenRouterLLMConfig,
+    pipeline_config: PipelineConfig,
+    checkpoint: PipelineCheckpoint,
+    on_event: EventSink | None,
+    stop: threading.Event | None = None,
+) -> str:
+    """Try the primary LLM configuration, then each fallback, until one run succeeds.
+
+    Attempts whose endpoint the provider router currently considers unhealthy are skipped.
+    """
+
+    router = get_provider_router()
+
+    def endpoint_of(overrides: dict[str, Any]) -> EndpointKey:
+        return _attempt_endpoint(overrides, config)
 
+    attempts = router.order(_build_llm_attempts(config), key=endpoint_of)
+    # If every endpoint is down, order() returns them all and each is tried regardless.
+    last_resort = not any(router.is_available(endpoint_of(overrides)) for overrides in attempts)
     last_error: Exception | None = None
     total_attempts = len(attempts)
 
     for index, overrides in enumerate(attempts, start=1):
+        if not last_resort and not router.try_claim(endpoint_of(overrides)):
+            logger.info("Skipping attempt %d/%d: another run is probing its endpoint", index, total_attempts)
+            continue
         try:
             if overrides:
                 logger.info(
@@ -154,7 +618,10 @@ def run_career_advisor_pipeline(user_profile: str) -> str:
                     total_attempts,
                     _sanitize_overrides(overrides),
                 )
-            result = _execute_crew(user_profile, overrides, config)
+            annotate(attempts=index, retries=index - 1)
+            result = _execute_crew(
+                user_profile, overrides, config, checkpoint, pipeline_config, on_event, stop
+            )
             if index > 1:
                 logger.info(
                     "Fallback succeeded on attempt %d/%d with overrides: %s",
@@ -162,7 +629,13 @@ def run_career_advisor_pipeline(user_profile: str) -> str:
                     total_attempts,
                     _sanitize_overrides(overrides),
                 )
+            for cache in iter_llm_response_caches():
+                logger.info("LLM response cache stats: %s", cache.stats.as_dict())
+            logger.info("Retrieval cache stats: %s", get_retrieval_cache().stats.as_dict())
+            logger.info("LLM endpoint health: %s", router.snapshot())
             return result
+        except PipelineStopped:
+            raise
         except Exception as exc:  # pragma: no cover - runtime resilience path
             last_error = exc
             logger.exception(
@@ -171,6 +644,58 @@ def run_career_advisor_pipeline(user_profile: str) -> str:
                 total_attempts,
                 _sanitize_overrides(overrides),
             )
+            if on_event is not None:
+                on_event(PipelineEvent("attempt_failed", data=f"{type(exc).__name__}: {exc}"))
 
-    assert last_error is not None  # defensive: should be set if all attempts failed
+    if last_error is None:
+        raise RuntimeError("No LLM endpoint was available for this run")
     raise last_error
+
+
+_STREAM_DONE = object()
+
+
+def stream_career_advisor_pipeline(
+    user_profile: str,
+    *,
+    execution_mode: str | None = None,
+) -> Iterator[PipelineEvent]:
+    """Run the pipeline in a background thread and yield its events as they happen.
+
+    The stream ends with a ``completed`` event carrying the final report, or an ``error``
+    event after which the pipeline's exception is re-raised. If the consumer stops early
+    and closes the generator, the background run finishes its current task and then
+    stops instead of starting the next.
+    """
+
+    events: "queue.Queue[Any]" = queue.Queue()
+    outcome: dict[str, Any] = {}
+    stop = threading.Event()
+
+    def _worker() -> None:
+        try:
+            outcome["result"] = run_career_advisor_pipeline(
+                user_profile, execution_mode=execution_mode, on_event=events.put, stop=stop
+            )
+        except BaseException as exc:  # pragma: no cover - surfaced to the consumer below
+            outcome["error"] = exc
+        finally:
+            events.put(_STREAM_DONE)
+
+    threading.Thread(target=_worker, name="career-advisor-stream", daemon=True).start()
+
+    try:
+        while True:
+            event = events.get()
+            if event is _STREAM_DONE:
+                break
+            yield event
+    finally:
+        # Also runs when the consumer closes the generator or drops it mid-stream.
+        stop.set()
+
+    if "error" in outcome:
+        error = outcome["error"]
+        yield PipelineEvent("error", data=f"{type(error).__name__}: {error}")
+        raise error
+    yield PipelineEvent("completed", data=outcome["result"])
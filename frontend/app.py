@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import sys
+import time
+from contextlib import closing
 from pathlib import Path
 
 import streamlit as st
@@ -12,38 +14,126 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
-from main import run_pipeline  # noqa: E402  # pylint: disable=wrong-import-position
+from main import stream_pipeline, warm_up_pipeline  # noqa: E402  # pylint: disable=wrong-import-position
+from schemas import (  # noqa: E402  # pylint: disable=wrong-import-position
+    CareerGuidanceReport,
+    LearningRoadmap,
+    ReportModel,
+    SkillsAssessmentReport,
+)
 
 load_dotenv()
 
-st.set_page_config(page_title="Agentic AI Workshop", page_icon="🧠", layout="wide")
 
-st.title("Agentic AI Workshop: Multi-Agent Systems From Idea to Deployment")
+@st.cache_resource(show_spinner="Loading agents and knowledge base...")
+def _warm_pipeline() -> bool:
+    """Build agents, LLM clients, tools and the vector store once per server process."""
+    warm_up_pipeline(streaming=True)
+    return True
+
+
+# Re-render a streaming section at most this often; Streamlit re-sends the whole block.
+RENDER_INTERVAL_SECONDS = 0.1
+
+
+def _render_report(placeholder, payload: ReportModel | None, text: str) -> None:
+    """Show a finished section, using tables and scores for the typed task outputs."""
+    if payload is None:
+        placeholder.markdown(text)
+        return
+    body = placeholder.container()
+    if isinstance(payload, CareerGuidanceReport):
+        body.markdown(f"**Profile:** {payload.profile_summary}")
+        for path in sorted(payload.career_paths, key=lambda item: item.fit_score, reverse=True):
+            body.markdown(f"**{path.title}** — {path.justification}")
+            body.progress(path.fit_score / 100, text=f"Fit {path.fit_score}/100")
+        with body.expander("Pros, cons, next steps and market trends"):
+            st.markdown(payload.to_markdown())
+    elif isinstance(payload, SkillsAssessmentReport):
+        body.dataframe(
+            [gap.model_dump() for gap in payload.skill_gaps], use_container_width=True, hide_index=True
+        )
+        with body.expander("Current skills and learning strategy"):
+            st.markdown(payload.to_markdown())
+    elif isinstance(payload, LearningRoadmap):
+        body.dataframe(
+            [course.model_dump(exclude={"url"}) for course in payload.courses],
+            use_container_width=True,
+            hide_index=True,
+        )
+        with body.expander("Certifications, milestones and projects"):
+            st.markdown(payload.to_markdown())
+    else:
+        body.markdown(payload.to_markdown())
+
+
+st.set_page_config(page_title="AI Career Advisor", page_icon="🧠", layout="wide")
+
+st.title("AI Career Advisor: Multi-Agent Career Guidance")
 st.write(
-    "Use this interface to run the full CrewAI pipeline. Enter a workshop theme and the agents will plan, "
-    "research, write, and review a set of deliverables."
+    "Describe your background, experience, and goals. Four agents will analyse career paths, assess your "
+    "skills, build a resume, and recommend courses — each section appears as soon as its agent starts writing."
 )
 
-default_topic = "Designing a Multi-Agent Workshop for Cloud-Native Deployments"
+default_profile = (
+    "I am a software developer with 3 years of experience in Python and web development. "
+    "I'm interested in transitioning to AI/ML engineering."
+)
 
 with st.sidebar:
     st.header("Configuration")
-    topic = st.text_input("Workshop Topic", value=default_topic)
+    profile = st.text_area("Career Profile", value=default_profile, height=200)
     run_button = st.button("Run Pipeline", type="primary")
 
+_warm_pipeline()
+
 if run_button:
-    st.info("Starting the agentic pipeline. This may take a few minutes depending on model latency.")
-    with st.spinner("Agents working..."):
-        try:
-            output = run_pipeline(topic)
-        except Exception as exc:
-            st.error(f"Pipeline failed: {exc}")
-        else:
-            st.success("Pipeline completed successfully!")
-            st.markdown("### Final Output")
-            st.markdown(output)
+    status = st.info("Starting the agentic pipeline. Sections stream in as each agent works.")
+    sections: dict[str, object] = {}
+    buffers: dict[str, str] = {}
+    finished: set[str] = set()
+    last_render: dict[str, float] = {}
+
+    def _section(task_name: str):
+        if task_name not in sections:
+            container = st.container()
+            container.markdown(f"### {task_name}")
+            sections[task_name] = container.empty()
+            buffers[task_name] = ""
+        return sections[task_name]
+
+    try:
+        # closing() stops the background run when Streamlit interrupts this script.
+        with closing(stream_pipeline(profile)) as events:
+            for event in events:
+                if event.type == "task_started":
+                    _section(event.task).markdown("_Working..._")
+                    status.info(f"Running: {event.task}")
+                elif event.type == "token":
+                    buffers[event.task] = buffers.get(event.task, "") + event.data
+                    now = time.monotonic()
+                    if now - last_render.get(event.task, 0.0) >= RENDER_INTERVAL_SECONDS:
+                        _section(event.task).markdown(buffers[event.task] + " ▌")
+                        last_render[event.task] = now
+                elif event.type == "output_invalid":
+                    st.warning(f"{event.task}: the answer {event.data}. Showing it as plain text.")
+                elif event.type == "task_finished":
+                    finished.add(event.task)
+                    _render_report(_section(event.task), event.payload, event.data)
+                elif event.type == "attempt_failed":
+                    st.warning(
+                        f"Model attempt failed ({event.data}); retrying unfinished sections with a fallback model."
+                    )
+                    for task_name, placeholder in sections.items():
+                        if task_name not in finished:
+                            buffers[task_name] = ""
+                            placeholder.markdown("_Waiting for retry..._")
+                elif event.type == "completed":
+                    status.success("Pipeline completed successfully!")
+    except Exception as exc:
+        st.error(f"Pipeline failed: {exc}")
 
 st.markdown("---")
 st.caption(
-    "Tip: Update agent prompts, tasks, or the RAG knowledge base to explore different workshop outcomes."
+    "Tip: Update agent prompts, tasks, or the RAG knowledge base to explore different career guidance outcomes."
 )
@@ -1,21 +1,63 @@
-"""Entrypoint for running the Career Advisor AI pipeline end-to-end."""
+"""Entrypoint for running the Career Advisor AI pipeline end-to-end.
+
+The crew (and with it CrewAI, LangChain and the RAG stack) is imported only when a
+pipeline actually runs, so ``--check`` and ``--import-report`` start in well under a second.
+"""
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 
 from dotenv import load_dotenv
 
-from crew import run_career_advisor_pipeline
 from config.logging_config import configure_logging
+from config.rate_limit import configure_provider_rate_limit
+from config.settings import EXECUTION_MODES
+from config.tracing import configure_tracing
 
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    from crew import PipelineEvent
 
-def run_pipeline(user_profile: str) -> str:
-    """Run the configured career advisor crew against the provided user profile."""
+
+@functools.lru_cache(maxsize=None)
+def _bootstrap() -> None:
+    """Load environment variables, logging and tracing once per process, not once per request."""
     load_dotenv()
     configure_logging()
+    configure_tracing()
+
+
+def warm_up_pipeline(*, streaming: bool = False) -> None:
+    """Build the primary pipeline (agents, LLM clients, tools, vector store) ahead of requests.
+
+    Streaming runs use LLMs configured for streamed completions, so they are warmed separately.
+    """
+    from crew import get_career_advisor_pipeline
+
+    _bootstrap()
+    get_career_advisor_pipeline({"stream": True} if streaming else None).warm_up()
+
+
+def run_pipeline(user_profile: str, execution_mode: str | None = None) -> str:
+    """Run the configured career advisor crew against the provided user profile."""
+    from crew import run_career_advisor_pipeline
+
+    _bootstrap()
     logging.getLogger(__name__).info("Starting career advisor pipeline for user profile")
-    return run_career_advisor_pipeline(user_profile)
+    return run_career_advisor_pipeline(user_profile, execution_mode=execution_mode)
+
+
+def stream_pipeline(user_profile: str, execution_mode: str | None = None) -> Iterator["PipelineEvent"]:
+    """Run the pipeline and yield task start/finish events and LLM tokens as they arrive."""
+    from crew import stream_career_advisor_pipeline
+
+    _bootstrap()
+    logging.getLogger(__name__).info("Starting streamed career advisor pipeline for user profile")
+    return stream_career_advisor_pipeline(user_profile, execution_mode=execution_mode)
 
 
 def _parse_args() -> argparse.Namespace:
@@ -25,10 +67,107 @@ def _parse_args() -> argparse.Namespace:
         default="I am a software developer with 3 years of experience in Python and web development. I'm interested in transitioning to AI/ML engineering and want to understand what skills I need and how to build my resume for this career path.",
         help="User profile description including background, experience, interests, and career goals.",
     )
+    parser.add_argument(
+        "--execution-mode",
+        choices=EXECUTION_MODES,
+        default=None,
+        help="Run tasks one after another or as a dependency graph with independent tasks in parallel "
+        "(defaults to CAREER_ADVISOR_EXECUTION_MODE or 'sequential').",
+    )
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument(
+        "--batch",
+        type=Path,
+        default=None,
+        metavar="INPUT_JSONL",
+        help="Run every profile in a JSONL file (objects with 'id' and 'profile') instead of --profile.",
+    )
+    batch.add_argument(
+        "--output",
+        type=Path,
+        default=Path("batch_results.jsonl"),
+        help="JSONL file results are appended to; completed IDs in it are skipped on re-runs.",
+    )
+    batch.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of profiles processed at the same time.",
+    )
+    batch.add_argument(
+        "--rate-limit-rpm",
+        type=float,
+        default=None,
+        help="Maximum LLM requests per minute to each provider (defaults to LLM_RATE_LIMIT_RPM).",
+    )
+    diagnostics = parser.add_argument_group("diagnostics")
+    diagnostics.add_argument(
+        "--check",
+        "--dry-run",
+        action="store_true",
+        help="Validate configuration, data files and installed packages without loading the ML stack, then exit.",
+    )
+    diagnostics.add_argument(
+        "--import-report",
+        nargs="?",
+        const="crew",
+        default=None,
+        metavar="MODULE",
+        help="Measure import time per package for MODULE (default: crew) with -X importtime, then exit.",
+    )
     return parser.parse_args()
 
 
+def run_batch_pipeline(
+    input_path: Path,
+    output_path: Path,
+    *,
+    concurrency: int,
+    rate_limit_rpm: float | None = None,
+    execution_mode: str | None = None,
+):
+    """Run the pipeline over a JSONL file of profiles, writing results incrementally."""
+    from batch import run_batch
+
+    _bootstrap()
+    if rate_limit_rpm is not None:
+        configure_provider_rate_limit(rate_limit_rpm)
+    logging.getLogger(__name__).info("Starting batch run over %s", input_path)
+    return run_batch(
+        input_path,
+        output_path,
+        concurrency=concurrency,
+        execution_mode=execution_mode,
+    )
+
+
+def check_configuration(batch_input: Path | None = None) -> bool:
+    """Print the preflight report; returns ``False`` if any check failed."""
+    from config.preflight import format_check_report, run_preflight_checks
+
+    load_dotenv()
+    results = run_preflight_checks(batch_input=batch_input)
+    print(format_check_report(results))
+    return all(result.status != "error" for result in results)
+
+
 if __name__ == "__main__":
     args = _parse_args()
-    output = run_pipeline(args.profile)
-    print(output)
+    if args.check:
+        sys.exit(0 if check_configuration(args.batch) else 1)
+    elif args.import_report is not None:
+        from config.preflight import profile_imports
+
+        print(profile_imports(args.import_report).format())
+    elif args.batch is not None:
+        summary = run_batch_pipeline(
+            args.batch,
+            args.output,
+            concurrency=args.concurrency,
+            rate_limit_rpm=args.rate_limit_rpm,
+            execution_mode=args.execution_mode,
+        )
+        print(summary)
+    else:
+        output = run_pipeline(args.profile, execution_mode=args.execution_mode)
+        print(output)
@@ -1,45 +1,370 @@
-"""Utility script to build the FAISS vector store backing the local RAG tool."""
+"""Utility script to build the FAISS vector store backing the local RAG tool.
+
+The build is incremental: every chunk is content-hashed and only new or changed chunks
+are embedded, in batches across an optional pool of CPU worker processes. Embeddings of
+unchanged chunks are reused from the previous build, chunks of deleted or edited content
+are dropped, and a manifest describing the chunks is written next to the index. A BM25
+keyword index over the same chunks is rebuilt alongside it for hybrid search. The store
+layout is described in ``tools/vector_index.py``.
+"""
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import logging
+import shutil
 import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
+import faiss
+import numpy as np
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from rag.embedding import embed_to_file
+from rag.index_factory import INDEX_TYPES, IndexSpec, build_index
 from tools.rag_tool import DEFAULT_EMBEDDING_MODEL
+from tools.vector_index import (
+    EMBEDDINGS_FILE,
+    FAISS_INDEX_FILE,
+    PARAMS_FILE,
+    ChunkStore,
+    write_index_params,
+)
+from tools.sparse_index import SPARSE_META_FILE, SparseIndex
 
 BASE_DIR = Path(__file__).resolve().parent
 DOCUMENTS_DIR = BASE_DIR / "documents"
 VECTORSTORE_DIR = BASE_DIR / "vectorstore"
-DEFAULT_DOC = DOCUMENTS_DIR / "sample_docs.txt"
 
+MANIFEST_FILE = "manifest.json"
+PENDING_EMBEDDINGS_FILE = "pending_embeddings.npy"
+# Version 2: embeddings are L2-normalised; older stored vectors are re-embedded.
+MANIFEST_VERSION = 2
+DOCUMENT_SUFFIXES = (".txt", ".md")
+
+
+@dataclass
+class BuildReport:
+    """Summary of what an incremental build changed."""
+
+    total_chunks: int
+    embedded: int
+    reused: int
+    removed: int
+    seconds: float
+    rebuilt: bool = True
+
+
+def content_hash(text: str) -> str:
+    """Content address of a chunk; identical text always maps to the same embedding."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def discover_documents(source: Path) -> List[Path]:
+    """Return the document files to ingest from a single file or a directory tree."""
+    if source.is_file():
+        return [source]
+    if not source.exists():
+        raise FileNotFoundError(f"Document source not found at {source}")
+    return sorted(
+        path for path in source.rglob("*") if path.is_file() and path.suffix.lower() in DOCUMENT_SUFFIXES
+    )
+
+
+def _source_name(path: Path, root: Path) -> str:
+    return path.relative_to(root).as_posix() if path.is_relative_to(root) else path.name
 
-def build_vector_store(doc_path: Path = DEFAULT_DOC, *, chunk_size: int = 600, chunk_overlap: int = 50) -> None:
-    """Build a FAISS index from the supplied document."""
-    if not doc_path.exists():
-        raise FileNotFoundError(f"Document source not found at {doc_path}")
 
-    text = doc_path.read_text(encoding="utf-8")
+def chunk_documents(paths: List[Path], root: Path, *, chunk_size: int, chunk_overlap: int) -> List[Dict[str, Any]]:
+    """Split every document into chunk records carrying text, hash and position metadata."""
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         separators=["\n\n", "\n", " "],
+        add_start_index=True,
     )
-    chunks = splitter.split_text(text)
+    chunks: List[Dict[str, Any]] = []
+    for path in paths:
+        source = _source_name(path, root)
+        text = path.read_text(encoding="utf-8")
+        for index, doc in enumerate(splitter.create_documents([text])):
+            chunks.append(
+                {
+                    "id": f"{source}#{index}",
+                    "hash": content_hash(doc.page_content),
+                    "source": source,
+                    "chunk_index": index,
+                    "start_index": doc.metadata.get("start_index", -1),
+                    "text": doc.page_content,
+                }
+            )
+    return chunks
+
+
+def load_manifest(output_dir: Path) -> Optional[Dict[str, Any]]:
+    manifest_path = output_dir / MANIFEST_FILE
+    if not manifest_path.exists():
+        return None
+    return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+
+def _previous_embeddings(
+    output_dir: Path, manifest: Optional[Dict[str, Any]], *, embedding_model: str
+) -> Tuple[Dict[str, int], Optional[np.ndarray]]:
+    """Map content hashes from the previous build to rows of its stored embedding matrix."""
+    embeddings_path = output_dir / EMBEDDINGS_FILE
+    if (
+        manifest is None
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("embedding_model") != embedding_model
+        or not embeddings_path.exists()
+    ):
+        return {}, None
+    matrix = np.load(embeddings_path, mmap_mode="r")
+    return {entry["hash"]: row for row, entry in enumerate(manifest["chunks"])}, matrix
+
+
+def _prepare_staging(output_dir: Path) -> Path:
+    staging_dir = output_dir.with_name(f"{output_dir.name}.staging")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir(parents=True)
+    return staging_dir
+
+
+def _swap_in(staging_dir: Path, output_dir: Path) -> None:
+    """Replace the live store with the staged one, so readers never see a partial index."""
+    backup_dir = output_dir.with_name(f"{output_dir.name}.previous")
+    shutil.rmtree(backup_dir, ignore_errors=True)
+    if output_dir.exists():
+        output_dir.rename(backup_dir)
+    staging_dir.rename(output_dir)
+    shutil.rmtree(backup_dir, ignore_errors=True)
+
+
+def _assemble_matrix(
+    chunks: List[Dict[str, Any]],
+    target: Path,
+    previous_rows: Dict[str, int],
+    previous_matrix: Optional[np.ndarray],
+    fresh_rows: Dict[str, int],
+    fresh_matrix: Optional[np.ndarray],
+    dimension: int,
+) -> np.ndarray:
+    """Write the final embedding matrix in chunk order, copying reused and fresh rows in bulk.
 
-    embeddings = HuggingFaceEmbeddings(model_name=DEFAULT_EMBEDDING_MODEL)
-    vector_store = FAISS.from_texts(chunks, embedding=embeddings)
+    Reused and freshly embedded hashes are disjoint, so each output row has one source.
+    """
+    matrix = np.lib.format.open_memmap(target, mode="w+", dtype=np.float32, shape=(len(chunks), dimension))
+    for rows, source_matrix in ((previous_rows, previous_matrix), (fresh_rows, fresh_matrix)):
+        if source_matrix is None or not rows:
+            continue
+        positions = [pos for pos, chunk in enumerate(chunks) if chunk["hash"] in rows]
+        if positions:
+            source_index = np.fromiter((rows[chunks[pos]["hash"]] for pos in positions), dtype=np.int64)
+            matrix[np.asarray(positions)] = source_matrix[source_index]
+    matrix.flush()
+    return matrix
 
-    VECTORSTORE_DIR.mkdir(parents=True, exist_ok=True)
-    vector_store.save_local(str(VECTORSTORE_DIR))
-    print(f"Vector store saved to {VECTORSTORE_DIR}")
+
+def build_vector_store(
+    source: Path = DOCUMENTS_DIR,
+    *,
+    output_dir: Path = VECTORSTORE_DIR,
+    chunk_size: int = 600,
+    chunk_overlap: int = 50,
+    embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+    full_rebuild: bool = False,
+    batch_size: int = 64,
+    workers: int = 1,
+    index_spec: Optional[IndexSpec] = None,
+) -> BuildReport:
+    """Build or incrementally update the FAISS index from a document file or directory.
+
+    New chunks are embedded in batches of ``batch_size``, spread over ``workers`` CPU
+    processes, and streamed to disk as normalised float32 vectors. ``index_spec`` selects
+    the FAISS index type (flat, IVF-Flat, HNSW or IVF-PQ) and its tuning parameters.
+    """
+    index_spec = index_spec or IndexSpec()
+    started = time.perf_counter()
+    paths = discover_documents(source)
+    if not paths:
+        raise FileNotFoundError(f"No {', '.join(DOCUMENT_SUFFIXES)} documents found under {source}")
+    root = source if source.is_dir() else source.parent
+
+    chunks = chunk_documents(paths, root, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    manifest = None if full_rebuild else load_manifest(output_dir)
+    if manifest is not None and (
+        manifest.get("chunk_size") != chunk_size or manifest.get("chunk_overlap") != chunk_overlap
+    ):
+        manifest = None
+
+    previous_rows, previous_matrix = _previous_embeddings(output_dir, manifest, embedding_model=embedding_model)
+    previous_hashes = {entry["hash"] for entry in manifest["chunks"]} if manifest else set()
+    current_hashes = {chunk["hash"] for chunk in chunks}
+    removed = len(previous_hashes - current_hashes)
+
+    if (
+        previous_rows
+        and (output_dir / PARAMS_FILE).exists()
+        and (output_dir / SPARSE_META_FILE).exists()
+        and manifest.get("index_request") == index_spec.as_dict()
+        and [(entry["id"], entry["hash"]) for entry in manifest["chunks"]]
+        == [(chunk["id"], chunk["hash"]) for chunk in chunks]
+    ):
+        print(f"Vector store at {output_dir} is up to date ({len(chunks)} chunks)")
+        return BuildReport(len(chunks), 0, len(chunks), 0, time.perf_counter() - started, rebuilt=False)
+
+    staging_dir = _prepare_staging(output_dir)
+    try:
+        texts_by_hash = {chunk["hash"]: chunk["text"] for chunk in chunks}
+        pending = [digest for digest in texts_by_hash if digest not in previous_rows]
+        fresh_matrix, embedding_report = embed_to_file(
+            [texts_by_hash[digest] for digest in pending],
+            staging_dir / PENDING_EMBEDDINGS_FILE,
+            model_name=embedding_model,
+            batch_size=batch_size,
+            workers=workers,
+        )
+        fresh_rows = {digest: row for row, digest in enumerate(pending)}
+        dimension = embedding_report.dimension if pending else int(previous_matrix.shape[1])
+
+        matrix = _assemble_matrix(
+            chunks,
+            staging_dir / EMBEDDINGS_FILE,
+            previous_rows,
+            previous_matrix,
+            fresh_rows,
+            fresh_matrix if pending else None,
+            dimension,
+        )
+        del fresh_matrix, previous_matrix
+
+        if index_spec.type == "flat":
+            # Flat stores are searched straight from the memory-mapped embeddings.
+            resolved_spec = index_spec
+        else:
+            index, resolved_spec = build_index(matrix, index_spec)
+            faiss.write_index(index, str(staging_dir / FAISS_INDEX_FILE))
+            del index
+        del matrix
+
+        ChunkStore.write(staging_dir, chunks)
+        SparseIndex.write(staging_dir, [chunk["text"] for chunk in chunks])
+        write_index_params(
+            staging_dir,
+            {
+                **resolved_spec.as_dict(),
+                "dimension": dimension,
+                "count": len(chunks),
+                "embedding_model": embedding_model,
+            },
+        )
+        (staging_dir / PENDING_EMBEDDINGS_FILE).unlink(missing_ok=True)
+
+        new_manifest = {
+            "version": MANIFEST_VERSION,
+            "embedding_model": embedding_model,
+            "normalized": True,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "dimension": dimension,
+            "index_request": index_spec.as_dict(),
+            "index": resolved_spec.as_dict(),
+            "documents": {
+                _source_name(path, root): content_hash(path.read_text(encoding="utf-8")) for path in paths
+            },
+            "chunks": [
+                {key: chunk[key] for key in ("id", "hash", "source", "chunk_index", "start_index")}
+                for chunk in chunks
+            ],
+        }
+        (staging_dir / MANIFEST_FILE).write_text(json.dumps(new_manifest, indent=2), encoding="utf-8")
+        _swap_in(staging_dir, output_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    report = BuildReport(
+        total_chunks=len(chunks),
+        embedded=len(pending),
+        reused=sum(1 for chunk in chunks if chunk["hash"] in previous_rows),
+        removed=removed,
+        seconds=time.perf_counter() - started,
+    )
+    print(
+        f"Vector store saved to {output_dir}: {report.total_chunks} chunks from {len(paths)} document(s), "
+        f"{report.embedded} embedded ({embedding_report.chunks_per_second:.1f} chunks/s), "
+        f"{report.reused} reused, {report.removed} removed in {report.seconds:.1f}s"
+    )
+    return report
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build or update the local RAG vector store.")
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=DOCUMENTS_DIR,
+        help="Document file or directory to ingest (all .txt/.md files are included).",
+    )
+    parser.add_argument("--output-dir", type=Path, default=VECTORSTORE_DIR, help="Where the vector store is written.")
+    parser.add_argument("--chunk-size", type=int, default=600)
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the previous build and re-embed every chunk.",
+    )
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per embedding batch.")
+    index = parser.add_argument_group("index")
+    index.add_argument("--index-type", choices=INDEX_TYPES, default="flat", help="FAISS index structure.")
+    index.add_argument("--nlist", type=int, default=None, help="IVF cells (default: ~4*sqrt(chunks)).")
+    index.add_argument("--nprobe", type=int, default=8, help="Default IVF cells probed per query.")
+    index.add_argument("--pq-m", type=int, default=16, help="IVF-PQ sub-quantizers (must divide the dimension).")
+    index.add_argument("--pq-nbits", type=int, default=8, help="Bits per IVF-PQ sub-quantizer code.")
+    index.add_argument("--hnsw-m", type=int, default=32, help="HNSW neighbours per node.")
+    index.add_argument("--ef-construction", type=int, default=200, help="HNSW build-time search depth.")
+    index.add_argument("--ef-search", type=int, default=64, help="Default HNSW query-time search depth.")
+    index.add_argument(
+        "--train-sample-size", type=int, default=50_000, help="Vectors sampled to train IVF quantizers."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="CPU worker processes used for embedding (each loads its own model copy).",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    build_vector_store()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = _parse_args()
+    build_vector_store(
+        args.source,
+        output_dir=args.output_dir,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        full_rebuild=args.full,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        index_spec=IndexSpec(
+            type=args.index_type,
+            nlist=args.nlist,
+            nprobe=args.nprobe,
+            pq_m=args.pq_m,
+            pq_nbits=args.pq_nbits,
+            hnsw_m=args.hnsw_m,
+            ef_construction=args.ef_construction,
+            ef_search=args.ef_search,
+            train_sample_size=args.train_sample_size,
+        ),
+    )
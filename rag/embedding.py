@@ -0,0 +1,160 @@
+"""Batched, optionally multi-process embedding stage used by the vector store builder."""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_worker_model = None
+
+
+@dataclass
+class EmbeddingReport:
+    """Throughput of one embedding run."""
+
+    chunks: int
+    dimension: int
+    seconds: float
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+
+def _load_model(model_name: str):
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name, device="cpu")
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    """Load the model once per worker and pin its torch thread count to avoid oversubscription."""
+    global _worker_model
+    import torch
+
+    torch.set_num_threads(max(1, threads))
+    _worker_model = _load_model(model_name)
+
+
+def _encode(model, texts: Sequence[str], batch_size: int) -> np.ndarray:
+    vectors = model.encode(
+        list(texts),
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+    )
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def _encode_in_worker(start: int, texts: Sequence[str], batch_size: int) -> Tuple[int, np.ndarray]:
+    return start, _encode(_worker_model, texts, batch_size)
+
+
+class _ProgressReporter:
+    def __init__(self, total: int, every_seconds: float) -> None:
+        self.total = total
+        self.every_seconds = every_seconds
+        self.done = 0
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def advance(self, count: int) -> None:
+        self.done += count
+        now = time.perf_counter()
+        if now - self._last >= self.every_seconds or self.done == self.total:
+            elapsed = now - self.started
+            rate = self.done / elapsed if elapsed else 0.0
+            logger.info("Embedded %d/%d chunks (%.1f chunks/s)", self.done, self.total, rate)
+            self._last = now
+
+
+def embed_to_file(
+    texts: Sequence[str],
+    output_path: Path,
+    *,
+    model_name: str,
+    batch_size: int = 64,
+    workers: int = 1,
+    progress_every_seconds: float = 5.0,
+) -> Tuple[np.ndarray, EmbeddingReport]:
+    """Embed ``texts`` into a float32 ``.npy`` file, writing each batch as it completes.
+
+    Vectors are L2-normalised. With ``workers > 1`` batches are spread over a pool of CPU
+    processes, each holding its own copy of the model and an even share of the cores. The
+    result is returned as a read-only memory map over ``output_path`` so corpora larger
+    than RAM never have to be materialised at once.
+    """
+    started = time.perf_counter()
+    total = len(texts)
+    output_path = Path(output_path)
+    if total == 0:
+        return np.zeros((0, 0), dtype=np.float32), EmbeddingReport(0, 0, 0.0)
+
+    batches: List[Tuple[int, Sequence[str]]] = [
+        (start, texts[start : start + batch_size]) for start in range(0, total, batch_size)
+    ]
+    progress = _ProgressReporter(total, progress_every_seconds)
+    matrix: Optional[np.memmap] = None
+
+    def _store(start: int, vectors: np.ndarray) -> None:
+        nonlocal matrix
+        if matrix is None:
+            matrix = np.lib.format.open_memmap(
+                output_path, mode="w+", dtype=np.float32, shape=(total, vectors.shape[1])
+            )
+        matrix[start : start + len(vectors)] = vectors
+        progress.advance(len(vectors))
+
+    if workers <= 1:
+        model = _load_model(model_name)
+        for start, batch in batches:
+            _store(start, _encode(model, batch, batch_size))
+    else:
+        threads = max(1, (os.cpu_count() or workers) // workers)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(model_name, threads),
+        ) as pool:
+            in_flight: Dict[Future, int] = {}
+            queue = iter(batches)
+            # Keep a couple of batches queued per worker so texts are not all pickled up front.
+            for start, batch in queue:
+                in_flight[pool.submit(_encode_in_worker, start, batch, batch_size)] = start
+                if len(in_flight) >= workers * 2:
+                    break
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    in_flight.pop(future)
+                    _store(*future.result())
+                    next_batch = next(queue, None)
+                    if next_batch is not None:
+                        in_flight[pool.submit(_encode_in_worker, next_batch[0], next_batch[1], batch_size)] = next_batch[0]
+
+    assert matrix is not None
+    matrix.flush()
+    dimension = int(matrix.shape[1])
+    del matrix
+    report = EmbeddingReport(total, dimension, time.perf_counter() - started)
+    logger.info(
+        "Embedded %d chunks (dim=%d) in %.1fs at %.1f chunks/s using %d worker(s)",
+        report.chunks,
+        report.dimension,
+        report.seconds,
+        report.chunks_per_second,
+        max(1, workers),
+    )
+    return np.load(output_path, mmap_mode="r"), report
@@ -0,0 +1,94 @@
+"""FAISS index construction for the vector store builder (flat, IVF-Flat, HNSW, IVF-PQ)."""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+# FAISS k-means warns below ~39 training points per centroid.
+MIN_POINTS_PER_CENTROID = 39
+ADD_BATCH_SIZE = 65_536
+
+
+@dataclass
+class IndexSpec:
+    """Index type plus build-time and default query-time parameters, persisted in the manifest."""
+
+    type: str = "flat"
+    nlist: Optional[int] = None
+    nprobe: int = 8
+    pq_m: int = 16
+    pq_nbits: int = 8
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 64
+    train_sample_size: int = 50_000
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _resolve_nlist(spec: IndexSpec, count: int) -> int:
+    requested = spec.nlist or int(4 * math.sqrt(count))
+    return max(1, min(requested, count // MIN_POINTS_PER_CENTROID or 1))
+
+
+def _training_sample(matrix: np.ndarray, size: int, seed: int = 0) -> np.ndarray:
+    count = matrix.shape[0]
+    if count <= size:
+        return np.ascontiguousarray(matrix, dtype=np.float32)
+    rows = np.sort(np.random.default_rng(seed).choice(count, size=size, replace=False))
+    return np.ascontiguousarray(matrix[rows], dtype=np.float32)
+
+
+def build_index(matrix: np.ndarray, spec: IndexSpec) -> Tuple[faiss.Index, IndexSpec]:
+    """Create, train (on a sample) and fill an index of ``spec.type`` from ``matrix``.
+
+    Returns the index and a copy of ``spec`` with resolved parameters (for example the
+    ``nlist`` actually used) for the manifest. Default ``nprobe``/``efSearch`` are stored
+    in the index itself and can be overridden per query.
+    """
+    if spec.type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{spec.type}'. Expected one of {INDEX_TYPES}.")
+
+    count, dimension = matrix.shape
+    started = time.perf_counter()
+    spec = replace(spec)
+
+    if spec.type == "flat":
+        index: faiss.Index = faiss.IndexFlatL2(dimension)
+    elif spec.type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, spec.hnsw_m)
+        index.hnsw.efConstruction = spec.ef_construction
+        index.hnsw.efSearch = spec.ef_search
+    else:
+        spec.nlist = _resolve_nlist(spec, count)
+        quantizer = faiss.IndexFlatL2(dimension)
+        if spec.type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dimension, spec.nlist)
+        else:
+            if dimension % spec.pq_m:
+                raise ValueError(f"pq_m={spec.pq_m} must divide the embedding dimension {dimension}")
+            if count < 2**spec.pq_nbits:
+                raise ValueError(
+                    f"IVF-PQ with pq_nbits={spec.pq_nbits} needs at least {2 ** spec.pq_nbits} chunks; "
+                    f"the corpus has {count}. Use a smaller pq_nbits or another index type."
+                )
+            index = faiss.IndexIVFPQ(quantizer, dimension, spec.nlist, spec.pq_m, spec.pq_nbits)
+        index.train(_training_sample(matrix, spec.train_sample_size))
+        spec.nprobe = min(spec.nprobe, spec.nlist)
+        index.nprobe = spec.nprobe
+
+    for start in range(0, count, ADD_BATCH_SIZE):
+        index.add(np.ascontiguousarray(matrix[start : start + ADD_BATCH_SIZE], dtype=np.float32))
+
+    logger.info("Built %s index over %d vectors in %.1fs", spec.type, count, time.perf_counter() - started)
+    return index, spec
@@ -0,0 +1,184 @@
+"""Structured output models for the career advisor tasks.
+
+Each task declares one of these models as its ``output_pydantic``. CrewAI adds the
+JSON schema to the task prompt and validates the agent's answer against it. The
+pipeline then hands downstream tasks the compact JSON instead of prose. The frontend
+and batch output use the typed objects directly, and ``to_markdown`` renders the
+human-readable report.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Literal, Optional, Type
+
+from pydantic import BaseModel, Field
+
+Priority = Literal["high", "medium", "low"]
+Proficiency = Literal["beginner", "intermediate", "advanced", "expert"]
+
+
+def _bullets(items: List[str]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+class ReportModel(BaseModel):
+    """Base class for task outputs: compact serialization plus a Markdown rendering."""
+
+    def to_compact_json(self) -> str:
+        """Serialize without whitespace or unset optional fields, for handoff and storage."""
+        return self.model_dump_json(exclude_none=True)
+
+    def to_markdown(self) -> str:
+        return self.to_compact_json()
+
+
+class CareerPath(BaseModel):
+    title: str
+    fit_score: int = Field(ge=0, le=100, description="How well the path fits the profile, 0-100.")
+    justification: str
+    pros: List[str] = Field(default_factory=list)
+    cons: List[str] = Field(default_factory=list)
+    next_steps: List[str] = Field(default_factory=list)
+
+
+class CareerGuidanceReport(ReportModel):
+    profile_summary: str
+    career_paths: List[CareerPath] = Field(description="3-5 recommended paths, best fit first.")
+    market_trends: List[str] = Field(default_factory=list)
+
+    def to_markdown(self) -> str:
+        parts = [f"**Profile:** {self.profile_summary}"]
+        for path in sorted(self.career_paths, key=lambda item: item.fit_score, reverse=True):
+            parts.append(f"### {path.title} (fit {path.fit_score}/100)\n\n{path.justification}")
+            if path.pros:
+                parts.append(f"**Pros**\n{_bullets(path.pros)}")
+            if path.cons:
+                parts.append(f"**Cons**\n{_bullets(path.cons)}")
+            if path.next_steps:
+                parts.append(f"**Next steps**\n{_bullets(path.next_steps)}")
+        if self.market_trends:
+            parts.append(f"### Market trends\n{_bullets(self.market_trends)}")
+        return "\n\n".join(parts)
+
+
+class Skill(BaseModel):
+    name: str
+    proficiency: Proficiency
+
+
+class SkillGap(BaseModel):
+    skill: str
+    priority: Priority
+    reason: str
+    estimated_weeks: Optional[int] = Field(default=None, ge=0, description="Rough time to close the gap.")
+
+
+class SkillsAssessmentReport(ReportModel):
+    current_skills: List[Skill] = Field(default_factory=list)
+    in_demand_skills: List[str] = Field(default_factory=list)
+    skill_gaps: List[SkillGap] = Field(description="Gaps ordered by priority, highest first.")
+    quick_wins: List[str] = Field(default_factory=list)
+    long_term: List[str] = Field(default_factory=list)
+
+    def to_markdown(self) -> str:
+        parts = []
+        if self.current_skills:
+            parts.append(
+                "### Current skills\n"
+                + _bullets([f"{skill.name} ({skill.proficiency})" for skill in self.current_skills])
+            )
+        if self.in_demand_skills:
+            parts.append(f"### In-demand skills\n{_bullets(self.in_demand_skills)}")
+        rows = []
+        for gap in self.skill_gaps:
+            weeks = gap.estimated_weeks if gap.estimated_weeks is not None else "-"
+            rows.append(f"| {gap.skill} | {gap.priority} | {weeks} | {gap.reason} |")
+        parts.append("### Skill gaps\n| Skill | Priority | Weeks | Why |\n|---|---|---|---|\n" + "\n".join(rows))
+        if self.quick_wins:
+            parts.append(f"### Quick wins\n{_bullets(self.quick_wins)}")
+        if self.long_term:
+            parts.append(f"### Long-term\n{_bullets(self.long_term)}")
+        return "\n\n".join(parts)
+
+
+class ResumeExperience(BaseModel):
+    role: str
+    organization: str
+    period: Optional[str] = None
+    achievements: List[str] = Field(default_factory=list)
+
+
+class ResumeReport(ReportModel):
+    target_role: str
+    professional_summary: str
+    experience: List[ResumeExperience] = Field(default_factory=list)
+    skills: List[str] = Field(default_factory=list)
+    education: List[str] = Field(default_factory=list)
+    certifications: List[str] = Field(default_factory=list)
+    ats_keywords: List[str] = Field(default_factory=list)
+    linkedin_tips: List[str] = Field(default_factory=list)
+
+    def to_markdown(self) -> str:
+        parts = [f"### {self.target_role}\n\n{self.professional_summary}"]
+        for entry in self.experience:
+            heading = f"**{entry.role}**, {entry.organization}" + (f" ({entry.period})" if entry.period else "")
+            parts.append(f"{heading}\n{_bullets(entry.achievements)}")
+        for title, items in (
+            ("Skills", self.skills),
+            ("Education", self.education),
+            ("Certifications", self.certifications),
+            ("ATS keywords", self.ats_keywords),
+            ("LinkedIn tips", self.linkedin_tips),
+        ):
+            if items:
+                parts.append(f"**{title}**\n{_bullets(items)}")
+        return "\n\n".join(parts)
+
+
+class Course(BaseModel):
+    title: str
+    provider: str
+    duration_weeks: Optional[float] = Field(default=None, ge=0)
+    cost_usd: Optional[float] = Field(default=None, ge=0, description="0 for free resources.")
+    skills: List[str] = Field(default_factory=list, description="Skill gaps the course addresses.")
+    url: Optional[str] = None
+
+
+class LearningRoadmap(ReportModel):
+    courses: List[Course] = Field(description="Recommended courses, highest priority first.")
+    certifications: List[str] = Field(default_factory=list)
+    milestones: Dict[str, List[str]] = Field(
+        default_factory=dict, description="Goals keyed by horizon, e.g. '3 months', '6 months', '12 months'."
+    )
+    projects: List[str] = Field(default_factory=list)
+    communities: List[str] = Field(default_factory=list)
+
+    def to_markdown(self) -> str:
+        rows = []
+        for course in self.courses:
+            duration = f"{course.duration_weeks:g} wk" if course.duration_weeks is not None else "-"
+            if course.cost_usd is None:
+                cost = "-"
+            else:
+                cost = "free" if course.cost_usd == 0 else f"${course.cost_usd:,.0f}"
+            title = f"[{course.title}]({course.url})" if course.url else course.title
+            rows.append(f"| {title} | {course.provider} | {duration} | {cost} | {', '.join(course.skills)} |")
+        header = "### Courses\n| Course | Provider | Duration | Cost | Skills |\n|---|---|---|---|---|\n"
+        parts = [header + "\n".join(rows)]
+        if self.certifications:
+            parts.append(f"### Certifications\n{_bullets(self.certifications)}")
+        for horizon, goals in self.milestones.items():
+            parts.append(f"### {horizon}\n{_bullets(goals)}")
+        if self.projects:
+            parts.append(f"### Projects\n{_bullets(self.projects)}")
+        if self.communities:
+            parts.append(f"### Communities\n{_bullets(self.communities)}")
+        return "\n\n".join(parts)
+
+
+# Output model of each task, keyed by task name.
+TASK_OUTPUT_MODELS: Dict[str, Type[ReportModel]] = {
+    "Career Guidance Analysis": CareerGuidanceReport,
+    "Skills Assessment": SkillsAssessmentReport,
+    "Resume Building": ResumeReport,
+    "Course Recommendations": LearningRoadmap,
+}
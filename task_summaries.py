@@ -0,0 +1,183 @@
+"""Condense task outputs before they are handed to downstream tasks as context.
+
+The guidance and skills tasks produce long multi-section reports, and both later tasks
+used to receive them verbatim. With summarization enabled, each upstream output is
+condensed once into a structured summary under a token cap (see
+``tasks.CONTEXT_SUMMARY_FORMATS``). A downstream task runs with stand-in context tasks
+that carry the summaries. Its real ``context`` and every full output are left untouched,
+so the final report is unchanged.
+
+Outputs that validate against their task's model in ``schemas.TASK_OUTPUT_MODELS`` are
+condensed without an LLM call: the lowest-ranked list items are dropped until the
+compact JSON fits the cap.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, MutableMapping, Optional
+
+from crewai import Task
+from crewai.tasks.task_output import TaskOutput
+
+from config.tokens import count_tokens, truncate_to_tokens
+from schemas import TASK_OUTPUT_MODELS, ReportModel
+from tasks import CONTEXT_SUMMARY_FORMATS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUMMARY_FORMAT = (
+    "Key findings and recommendations as terse bullet points, most important first."
+)
+
+SUMMARY_PROMPT = (
+    "Condense the output of the '{task}' step below into a structured summary for the "
+    "specialists working on later steps. Use at most {max_tokens} tokens. Format: {format} "
+    "Keep concrete names, numbers, rankings and priorities; drop introductions, caveats "
+    "and repetition. Reply with the summary only.\n\n---\n{output}"
+)
+
+
+def _output_text(output: Any) -> str:
+    return str(getattr(output, "raw", None) or output)
+
+
+def _output_model(task: Task, text: str) -> Optional[ReportModel]:
+    model = getattr(task.output, "pydantic", None)
+    if isinstance(model, ReportModel):
+        return model
+    model_class = TASK_OUTPUT_MODELS.get(task.name)
+    if model_class is None:
+        return None
+    try:
+        return model_class.model_validate_json(text)
+    except ValueError:
+        return None
+
+
+def _lists(value: Any) -> Iterator[List[Any]]:
+    if isinstance(value, list):
+        yield value
+        items = value
+    elif isinstance(value, dict):
+        items = value.values()
+    else:
+        return
+    for item in items:
+        yield from _lists(item)
+
+
+def trim_report(report: ReportModel, max_tokens: int) -> Optional[str]:
+    """Compact JSON of ``report`` cut to ``max_tokens`` by dropping trailing list items.
+
+    Lists in the output models are ordered best first, so the longest list loses its
+    last item until the JSON fits. Returns ``None`` when every list is down to one item
+    and the JSON is still too long.
+    """
+    data = report.model_dump(mode="json", exclude_none=True)
+    while True:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        if count_tokens(text) <= max_tokens:
+            return text
+        longest = max(_lists(data), key=len, default=[])
+        if len(longest) <= 1:
+            return None
+        longest.pop()
+
+
+class ContextSummarizer:
+    """Summarize task outputs on demand, once per task, into ``summaries``.
+
+    ``summaries`` is normally the run's checkpoint store, so a fallback attempt reuses
+    summaries from earlier attempts. ``llm_factory`` returns an object with a CrewAI-style
+    ``call(messages)``. It is only invoked when an output exceeds the cap and cannot be
+    trimmed through its output model. If summarizing fails, the full output is used as
+    context instead.
+    """
+
+    def __init__(
+        self,
+        llm_factory: Callable[[], Any],
+        summaries: MutableMapping[str, str],
+        *,
+        max_tokens: int = 350,
+    ) -> None:
+        self._llm_factory = llm_factory
+        self.summaries = summaries
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self._task_locks: dict[str, threading.Lock] = {}
+
+    def summary_for(self, task: Task) -> str:
+        """Return the cached or freshly computed summary of ``task``'s output."""
+        with self._lock:
+            task_lock = self._task_locks.setdefault(task.name, threading.Lock())
+        # Concurrent dependents in the DAG wait for one summary instead of each paying for it.
+        with task_lock:
+            summary = self.summaries.get(task.name)
+            if summary is None:
+                summary = self._summarize(task)
+                self.summaries[task.name] = summary
+            return summary
+
+    def _summarize(self, task: Task) -> str:
+        text = _output_text(task.output)
+        try:
+            return self._condense(task, text)
+        except Exception:  # pragma: no cover - summarization must never fail a run
+            logger.warning("Summarizing '%s' failed; passing its full output", task.name, exc_info=True)
+            return text
+
+    def _condense(self, task: Task, text: str) -> str:
+        original_tokens = count_tokens(text)
+        if original_tokens <= self.max_tokens:
+            return text
+        report = _output_model(task, text)
+        summary = trim_report(report, self.max_tokens) if report is not None else None
+        method = "Trimmed"
+        if summary is None:
+            prompt = SUMMARY_PROMPT.format(
+                task=task.name,
+                max_tokens=self.max_tokens,
+                format=CONTEXT_SUMMARY_FORMATS.get(task.name, DEFAULT_SUMMARY_FORMAT),
+                output=text,
+            )
+            summary = str(self._llm_factory().call([{"role": "user", "content": prompt}])).strip()
+            summary = truncate_to_tokens(summary, self.max_tokens)
+            method = "Summarized"
+        logger.info(
+            "%s '%s' output for downstream tasks: %d -> %d tokens",
+            method,
+            task.name,
+            original_tokens,
+            count_tokens(summary),
+        )
+        return summary
+
+    def _stand_in(self, task: Task) -> Task:
+        summary = self.summary_for(task)
+        output = TaskOutput(
+            description=task.output.description,
+            name=task.name,
+            raw=summary,
+            agent=task.output.agent,
+        )
+        return task.model_copy(update={"output": output})
+
+    @contextmanager
+    def summarized_context(self, task: Task) -> Iterator[None]:
+        """Run the enclosed kickoff with ``task.context`` replaced by summary stand-ins."""
+        context = getattr(task, "context", None)
+        if not isinstance(context, list) or not context:
+            yield
+            return
+        task.context = [
+            self._stand_in(dependency) if dependency.output is not None else dependency
+            for dependency in context
+        ]
+        try:
+            yield
+        finally:
+            task.context = context
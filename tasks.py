@@ -1,12 +1,30 @@
 #"""Task definitions for the Career Advisor crew."""
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Sequence
 
 from crewai import Task
 
+from schemas import CareerGuidanceReport, LearningRoadmap, ResumeReport, SkillsAssessmentReport
 from tools import create_calculator_tool, create_rag_tool, create_web_search_tool
 
+# Structure of the condensed output that downstream tasks receive as context when
+# context summarization is enabled, keyed by task name.
+CONTEXT_SUMMARY_FORMATS = {
+    "Career Guidance Analysis": (
+        "Profile: one line on background and goals. "
+        "Recommended paths: one bullet per path with a one-line justification, best fit first. "
+        "Market trends: up to three bullets. "
+        "Next steps: up to three bullets."
+    ),
+    "Skills Assessment": (
+        "Current strengths: skills with proficiency levels. "
+        "Prioritized skill gaps: one bullet per gap as 'skill - priority (high/medium/low) - why', highest first. "
+        "Roadmap: milestones with timeline estimates. "
+        "Quick wins: up to three bullets."
+    ),
+}
+
 
 def create_career_guidance_task(agent) -> Task:
     """Task 1: Provide comprehensive career guidance and path recommendations."""
@@ -20,14 +38,16 @@ def create_career_guidance_task(agent) -> Task:
         expected_output=(
             "A comprehensive career guidance report with: 1) Summary of user's career profile and aspirations, "
             "2) 3-5 recommended career paths with detailed justifications, 3) Market trends and opportunities analysis, "
-            "4) Pros and cons for each path, 5) Actionable next steps for exploring each option."
+            "4) Pros and cons for each path, 5) Actionable next steps for exploring each option. "
+            "Return it as JSON matching the CareerGuidanceReport schema, scoring each path's fit from 0 to 100."
         ),
         agent=agent,
+        output_pydantic=CareerGuidanceReport,
         name="Career Guidance Analysis",
     )
 
 
-def create_skills_assessment_task(agent, tools=None) -> Task:
+def create_skills_assessment_task(agent, tools=None, context: Optional[Sequence[Task]] = None) -> Task:
     """Task 2: Assess current skills and identify gaps."""
     tools = list(tools) if tools is not None else [
         create_rag_tool(),
@@ -44,36 +64,42 @@ def create_skills_assessment_task(agent, tools=None) -> Task:
         expected_output=(
             "A detailed skills assessment report containing: 1) Current skills inventory with proficiency levels, "
             "2) In-demand skills for target career paths with market data, 3) Identified skill gaps prioritized by importance, "
-            "4) Skill development roadmap with timeline estimates, 5) Quick wins vs. long-term skill building strategies."
+            "4) Skill development roadmap with timeline estimates, 5) Quick wins vs. long-term skill building strategies. "
+            "Return it as JSON matching the SkillsAssessmentReport schema, with each gap's priority and estimated weeks."
         ),
         agent=agent,
         tools=tools,
+        context=list(context or []),
+        output_pydantic=SkillsAssessmentReport,
         name="Skills Assessment",
     )
 
 
-def create_resume_building_task(agent) -> Task:
-    """Task 3: Build or optimize resume for target roles."""
+def create_resume_building_task(agent, context: Optional[Sequence[Task]] = None) -> Task:
+    """Task 3: Build or optimize the resume for the best-fit target role."""
     return Task(
         description=(
             "Create a professional, ATS-optimized resume based on '{user_profile}' tailored for the recommended career paths. "
             "Structure the resume to highlight relevant achievements, quantifiable results, and key skills. "
             "Use powerful action verbs and industry-specific keywords. Ensure proper formatting for both ATS systems and human readers. "
             "Include sections for: professional summary, work experience, skills, education, and certifications. "
-            "Provide both a master resume and variations optimized for different target roles."
+            "Target the single best-fit role among the recommended career paths."
         ),
         expected_output=(
-            "A complete, professionally formatted resume (or multiple versions for different career paths) with: "
+            "A complete, professionally formatted resume for one target role with: "
             "1) Compelling professional summary, 2) Achievement-focused work experience with metrics, "
             "3) Skills section aligned with target roles, 4) Education and certifications, "
-            "5) ATS optimization tips and keywords, 6) Additional suggestions for LinkedIn profile optimization."
+            "5) ATS optimization tips and keywords, 6) Additional suggestions for LinkedIn profile optimization. "
+            "Return it as JSON matching the ResumeReport schema for the best-fit target role."
         ),
         agent=agent,
+        context=list(context or []),
+        output_pydantic=ResumeReport,
         name="Resume Building",
     )
 
 
-def create_course_recommendation_task(agent) -> Task:
+def create_course_recommendation_task(agent, context: Optional[Sequence[Task]] = None) -> Task:
     """Task 4: Recommend courses and learning resources."""
     return Task(
         description=(
@@ -87,18 +113,25 @@ def create_course_recommendation_task(agent) -> Task:
             "A personalized learning roadmap featuring: 1) Prioritized list of recommended courses with platform, duration, and cost, "
             "2) Relevant certifications that boost employability, 3) Free vs. paid resource alternatives, "
             "4) Structured learning timeline (3-month, 6-month, 12-month plans), "
-            "5) Project ideas for practical application, 6) Community resources and networking opportunities."
+            "5) Project ideas for practical application, 6) Community resources and networking opportunities. "
+            "Return it as JSON matching the LearningRoadmap schema, with each course's duration in weeks and cost in USD."
         ),
         agent=agent,
+        context=list(context or []),
+        output_pydantic=LearningRoadmap,
         name="Course Recommendations",
     )
 
 
 def build_career_advisor_tasks(career_guidance_agent, skills_agent, resume_agent, course_agent, assessment_tools=None) -> List[Task]:
-    """Convenience helper to create the full career advisor task list."""
-    return [
-        create_career_guidance_task(career_guidance_agent),
-        create_skills_assessment_task(skills_agent, tools=assessment_tools),
-        create_resume_building_task(resume_agent),
-        create_course_recommendation_task(course_agent),
-    ]
+    """Convenience helper to create the full career advisor task list.
+
+    Upstream dependencies are declared through each task's ``context``: skills assessment
+    builds on the guidance report, while resume building and course recommendations both
+    depend on guidance and skills but not on each other, so they can run concurrently.
+    """
+    guidance = create_career_guidance_task(career_guidance_agent)
+    skills = create_skills_assessment_task(skills_agent, tools=assessment_tools, context=[guidance])
+    resume = create_resume_building_task(resume_agent, context=[guidance, skills])
+    courses = create_course_recommendation_task(course_agent, context=[guidance, skills])
+    return [guidance, skills, resume, courses]
@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# config.settings reads the key at import time; the tests only talk to the local mock server.
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
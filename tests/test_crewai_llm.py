@@ -0,0 +1,77 @@
+"""``OpenRouterLLM`` calls against the local mock OpenAI server."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("litellm")
+
+from config import provider_router
+from config.http_clients import get_http_client
+from config.mock_openai_server import MockOpenAIServer
+from config.provider_router import ProviderRouter, ProviderRouterConfig, endpoint_key
+from config.settings import OpenRouterLLMConfig, build_crewai_llm
+
+
+def _spy(client) -> list[str]:
+    urls: list[str] = []
+    client.event_hooks["request"].append(lambda request: urls.append(request.url.path))
+    return urls
+
+
+def test_openrouter_route_uses_shared_http_client() -> None:
+    with MockOpenAIServer(reply="pooled") as server:
+        urls = _spy(get_http_client(server.base_url, OpenRouterLLMConfig().headers))
+        llm = build_crewai_llm(base_url=server.base_url, model="mock-model", cache=False)
+
+        assert llm.call("hi") == "pooled"
+        assert llm.call("hi again") == "pooled"
+        assert urls == ["/v1/chat/completions"] * 2
+        assert server.requests == 2
+
+
+@pytest.fixture
+def hedging_router(monkeypatch: pytest.MonkeyPatch) -> ProviderRouter:
+    router = ProviderRouter(ProviderRouterConfig(hedge_after_seconds=0.2, max_hedges_in_flight=1))
+    monkeypatch.setattr(provider_router, "_ROUTER", router)
+    return router
+
+
+def _samples(router: ProviderRouter, base_url: str) -> int:
+    return router.snapshot()[" | ".join(endpoint_key(None, "mock-model", base_url))]["samples"]
+
+
+def test_hedged_call_returns_duplicate_and_ignores_slow_original(hedging_router: ProviderRouter) -> None:
+    with MockOpenAIServer(reply="answer", latencies=[1.0, 0.0]) as server:
+        urls = _spy(get_http_client(server.base_url, OpenRouterLLMConfig().headers))
+        llm = build_crewai_llm(base_url=server.base_url, model="mock-model", cache=False)
+
+        started = time.perf_counter()
+        assert llm.call("hi") == "answer"
+        assert time.perf_counter() - started < 0.9
+        # The duplicate went over its own connection, not the shared pool.
+        assert urls == ["/v1/chat/completions"]
+        assert server.requests == 2
+
+        time.sleep(1.0)
+        # Only the winner reports to the router; the cancelled original does not.
+        assert _samples(hedging_router, server.base_url) == 1
+
+
+def test_losing_duplicate_is_aborted_and_frees_its_hedge_slot(hedging_router: ProviderRouter) -> None:
+    # Request 2 is a duplicate that would take 5s; request 4 is the next call's duplicate.
+    with MockOpenAIServer(reply="answer", latencies=[0.5, 5.0, 0.5, 0.0]) as server:
+        llm = build_crewai_llm(base_url=server.base_url, model="mock-model", cache=False)
+
+        started = time.perf_counter()
+        assert llm.call("first") == "answer"
+        assert time.perf_counter() - started < 1.5
+
+        # With one hedge slot, this call is only hedged if the first duplicate was aborted.
+        started = time.perf_counter()
+        assert llm.call("second") == "answer"
+        assert time.perf_counter() - started < 0.45
+        assert server.requests == 4
+        assert _samples(hedging_router, server.base_url) == 2
@@ -0,0 +1,119 @@
+"""Provider router behaviour against the local mock OpenAI server."""
+from __future__ import annotations
+
+import json
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from config.mock_openai_server import MockOpenAIServer
+from config.provider_router import CancelToken, ProviderRouter, ProviderRouterConfig, endpoint_key
+
+
+def _complete(router: ProviderRouter, base_url: str, cancel: CancelToken | None = None) -> str:
+    """Send one chat completion and report it to ``router`` like ``OpenRouterLLM`` does."""
+    key = endpoint_key(None, "mock-model", base_url)
+    request = urllib.request.Request(
+        f"{base_url}/chat/completions",
+        data=json.dumps({"model": "mock-model", "messages": [{"role": "user", "content": "hi"}]}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            body = json.load(response)
+    except urllib.error.HTTPError:
+        if cancel is None or not cancel.cancelled:
+            router.record(key, time.perf_counter() - started, ok=False)
+        raise
+    if cancel is None or not cancel.cancelled:
+        router.record(key, time.perf_counter() - started, ok=True)
+    return body["choices"][0]["message"]["content"]
+
+
+@pytest.fixture
+def router() -> ProviderRouter:
+    return ProviderRouter(
+        ProviderRouterConfig(
+            min_samples=2,
+            max_consecutive_failures=2,
+            cooldown_seconds=0.2,
+            hedge_after_seconds=None,
+            max_hedges_in_flight=1,
+        )
+    )
+
+
+def test_order_skips_failing_endpoint_and_probes_once(router: ProviderRouter) -> None:
+    with MockOpenAIServer(error_rate=1.0) as failing, MockOpenAIServer(reply="ok") as healthy:
+        bad = endpoint_key(None, "mock-model", failing.base_url)
+        good = endpoint_key(None, "mock-model", healthy.base_url)
+        for _ in range(2):
+            with pytest.raises(urllib.error.HTTPError):
+                _complete(router, failing.base_url)
+
+        assert router.order([bad, good], key=lambda key: key) == [good]
+        assert _complete(router, healthy.base_url) == "ok"
+
+        time.sleep(0.25)
+        # Listing candidates must not use up the half-open probe.
+        for _ in range(3):
+            assert router.order([bad, good], key=lambda key: key) == [bad, good]
+        assert router.try_claim(bad)
+        assert not router.try_claim(bad)
+        assert router.order([bad, good], key=lambda key: key) == [good]
+        assert router.try_claim(good)
+
+        with pytest.raises(urllib.error.HTTPError):
+            _complete(router, failing.base_url)
+        assert not router.is_available(bad)
+
+
+def test_order_returns_all_candidates_when_every_endpoint_is_down(router: ProviderRouter) -> None:
+    with MockOpenAIServer(error_rate=1.0) as failing:
+        key = endpoint_key(None, "mock-model", failing.base_url)
+        for _ in range(2):
+            with pytest.raises(urllib.error.HTTPError):
+                _complete(router, failing.base_url)
+        assert router.order([key], key=lambda candidate: candidate) == [key]
+        assert not router.try_claim(key)
+
+
+def test_run_hedged_returns_fast_duplicate_and_cancels_slow_request(router: ProviderRouter) -> None:
+    with MockOpenAIServer(latency_s=1.0, reply="slow") as slow, MockOpenAIServer(reply="fast") as fast:
+        tokens: list[CancelToken] = []
+
+        def primary(cancel: CancelToken) -> str:
+            tokens.append(cancel)
+            return _complete(router, slow.base_url, cancel)
+
+        started = time.perf_counter()
+        result = router.run_hedged(primary, 0.1, hedge_call=lambda cancel: _complete(router, fast.base_url, cancel))
+        assert result == "fast"
+        assert time.perf_counter() - started < 0.8
+        assert tokens[0].cancelled
+
+        # The only hedge slot is held until the slow loser ends, so this call is not hedged.
+        result = router.run_hedged(
+            lambda cancel: _complete(router, slow.base_url, cancel),
+            0.1,
+            hedge_call=lambda cancel: _complete(router, fast.base_url, cancel),
+        )
+        assert result == "slow"
+        assert fast.requests == 1
+        # The cancelled loser reported no sample; the uncancelled slow call did.
+        assert router.snapshot()[" | ".join(endpoint_key(None, "mock-model", slow.base_url))]["samples"] == 1
+
+
+def test_run_hedged_skips_duplicate_without_rate_limit_capacity(router: ProviderRouter) -> None:
+    with MockOpenAIServer(latency_s=0.3, reply="slow") as slow, MockOpenAIServer(reply="fast") as fast:
+        result = router.run_hedged(
+            lambda cancel: _complete(router, slow.base_url, cancel),
+            0.05,
+            hedge_call=lambda cancel: _complete(router, fast.base_url, cancel),
+            admit_hedge=lambda: False,
+        )
+        assert result == "slow"
+        assert fast.requests == 0
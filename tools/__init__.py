@@ -1,39 +1,93 @@
-"""Tool factories used across the workshop agents and tasks."""
+"""Tool factories used across the workshop agents and tasks.
+
+Tool modules pull in CrewAI, NumPy and LangChain, so importing this package loads none of
+them. The factories import their tool module when called, and the re-exported helpers
+are resolved on first attribute access (PEP 562).
+"""
 from __future__ import annotations
 
+import importlib
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Any, List
 
-from crewai.tools import BaseTool
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    from crewai.tools import BaseTool
 
-from .calculator import CalculatorTool
-from .rag_tool import LocalRAGTool
-from .web_search import create_web_search_tool
+    from .calculator import CalculatorTool
+    from .rag_tool import LocalRAGTool
+    from .retrieval_cache import get_retrieval_cache
+    from .vectorstore_registry import get_vectorstore_registry
+    from .web_search import create_web_search_tool
 
 __all__ = [
     "create_rag_tool",
     "create_web_search_tool",
     "create_calculator_tool",
     "get_default_toolkit",
+    "get_retrieval_cache",
+    "get_vectorstore_registry",
 ]
 
 
 DEFAULT_VECTORSTORE_DIR = Path(__file__).resolve().parents[1] / "rag" / "vectorstore"
 
+# Lazily re-exported names and the submodule that defines each.
+_LAZY_EXPORTS = {
+    "create_web_search_tool": "web_search",
+    "get_retrieval_cache": "retrieval_cache",
+    "get_vectorstore_registry": "vectorstore_registry",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_LAZY_EXPORTS])
+
+
+def create_rag_tool(
+    vectorstore_path: Path | None = None,
+    *,
+    top_k: int = 4,
+    nprobe: int | None = None,
+    ef_search: int | None = None,
+    search_mode: str = "dense",
+) -> LocalRAGTool:
+    """Instantiate the local RAG retrieval tool.
+
+    ``nprobe`` (IVF) and ``ef_search`` (HNSW) override the recall/latency defaults saved
+    with the index for this tool only. ``search_mode`` picks dense (the default), BM25 or hybrid retrieval.
+    """
+    from .rag_tool import LocalRAGTool
 
-def create_rag_tool(vectorstore_path: Path | None = None, *, top_k: int = 4) -> LocalRAGTool:
-    """Instantiate the local RAG retrieval tool."""
     target_path = vectorstore_path or DEFAULT_VECTORSTORE_DIR
-    return LocalRAGTool(vectorstore_path=target_path, top_k=top_k)
+    return LocalRAGTool(
+        vectorstore_path=target_path,
+        top_k=top_k,
+        nprobe=nprobe,
+        ef_search=ef_search,
+        search_mode=search_mode,
+    )
 
 
 def create_calculator_tool() -> CalculatorTool:
     """Instantiate the deterministic calculator tool."""
+    from .calculator import CalculatorTool
+
     return CalculatorTool()
 
 
 def get_default_toolkit() -> List[BaseTool]:
     """Provide the standard set of tools shared by research-heavy agents."""
+    from .web_search import create_web_search_tool
+
     return [
         create_rag_tool(),
         create_web_search_tool(),
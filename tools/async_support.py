@@ -0,0 +1,40 @@
+"""Bounded executor that async tool paths use to offload blocking work off the event loop."""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Embedding, FAISS and HTTP calls release the GIL, so a few threads go a long way; the
+# bound keeps a burst of concurrent pipelines from oversubscribing the CPU.
+DEFAULT_MAX_WORKERS = int(os.getenv("TOOL_EXECUTOR_WORKERS", str(min(8, (os.cpu_count() or 1) + 2))))
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor shared by every tool's async path."""
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="tool")
+        return _EXECUTOR
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``func(*args, **kwargs)`` on the tool executor and await its result.
+
+    The call runs in a copy of the caller's context, so tracing spans keep their parent.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_tool_executor(), functools.partial(context.run, func, *args, **kwargs)
+    )
@@ -1,52 +1,198 @@
-"""Deterministic calculator tool for quick quantitative reasoning."""
+"""Deterministic calculator tool for quick quantitative reasoning.
+
+Expressions are parsed once, validated against size, depth and literal limits, compiled
+into a tree of closures and cached. Every power is checked against an exponent bound and
+every intermediate value against a magnitude bound, so adversarial input such as
+``9**9**9`` fails fast instead of stalling a worker. Named variables may be bound to flat
+lists of numbers to evaluate one formula over a whole table; their broadcast size is capped
+before evaluation starts.
+"""
 from __future__ import annotations
 
 import ast
 import logging
+import math
 import operator
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Sequence, Union
 
+import numpy as np
 from crewai.tools import BaseTool
 
+from config.tracing import traced_tool
+
 _ALLOWED_OPERATORS: Dict[type[ast.AST], Any] = {
     ast.Add: operator.add,
     ast.Sub: operator.sub,
     ast.Mult: operator.mul,
     ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
     ast.Mod: operator.mod,
     ast.Pow: operator.pow,
     ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
 }
 
+MAX_EXPRESSION_LENGTH = 512
+MAX_AST_DEPTH = 32
+MAX_EXPONENT = 1_000
+MAX_MAGNITUDE = 1e100
+MAX_ARRAY_SIZE = 100_000
+MAX_BATCH_SIZE = 64
+
+Value = Union[float, np.ndarray]
+Evaluator = Callable[[Mapping[str, Value]], Value]
+
+
+class CompiledExpression(NamedTuple):
+    source: str
+    variables: FrozenSet[str]
+    evaluate: Evaluator
+
+
+def _checked(value: Any) -> Value:
+    if isinstance(value, np.ndarray):
+        if not np.all(np.isfinite(value)):
+            raise ValueError("Result is not a finite number for every element")
+        if value.size and float(np.max(np.abs(value))) > MAX_MAGNITUDE:
+            raise ValueError(f"Intermediate value exceeds {MAX_MAGNITUDE:g}")
+        return value
+    if isinstance(value, complex):
+        raise ValueError("Result is not a real number")
+    value = float(value)
+    if value != value or abs(value) > MAX_MAGNITUDE:
+        raise ValueError(f"Intermediate value exceeds {MAX_MAGNITUDE:g}")
+    return value
+
+
+def _power(base: Value, exponent: Value) -> Value:
+    largest = float(np.max(np.abs(exponent))) if isinstance(exponent, np.ndarray) else abs(exponent)
+    if largest > MAX_EXPONENT:
+        raise ValueError(f"Exponent exceeds the limit of {MAX_EXPONENT}")
+    return base**exponent
+
+
+def _compile(node: ast.AST, depth: int, names: set) -> Evaluator:
+    if depth > MAX_AST_DEPTH:
+        raise ValueError(f"Expression is nested deeper than {MAX_AST_DEPTH} levels")
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        constant = _checked(node.value)
+        return lambda env: constant
+    if isinstance(node, ast.Name):
+        name = node.id
+        names.add(name)
+
+        def _lookup(env: Mapping[str, Value]) -> Value:
+            if name not in env:
+                raise ValueError(f"Unknown variable '{name}'")
+            return env[name]
+
+        return _lookup
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _ALLOWED_OPERATORS:
+        unary = _ALLOWED_OPERATORS[type(node.op)]
+        operand = _compile(node.operand, depth + 1, names)
+        return lambda env: unary(operand(env))
+    if isinstance(node, ast.BinOp) and type(node.op) in _ALLOWED_OPERATORS:
+        binary = _power if isinstance(node.op, ast.Pow) else _ALLOWED_OPERATORS[type(node.op)]
+        left = _compile(node.left, depth + 1, names)
+        right = _compile(node.right, depth + 1, names)
+        return lambda env: _checked(binary(left(env), right(env)))
+    raise ValueError(f"Unsupported expression: {ast.dump(node, include_attributes=False)}")
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expression: str) -> CompiledExpression:
+    """Parse, validate and compile ``expression``; results are cached by source text."""
+    expression = expression.strip()
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters")
+    names: set = set()
+    evaluate = _compile(ast.parse(expression, mode="eval").body, 0, names)
+    return CompiledExpression(expression, frozenset(names), evaluate)
+
+
+def _prepare_variables(variables: Optional[Mapping[str, Any]]) -> Dict[str, Value]:
+    prepared: Dict[str, Value] = {}
+    for name, value in (variables or {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            prepared[name] = _checked(value)
+            continue
+        array = np.asarray(value, dtype=np.float64)
+        if array.ndim > 1:
+            raise ValueError(f"Variable '{name}' must be a number or a flat list of numbers")
+        if array.size > MAX_ARRAY_SIZE:
+            raise ValueError(f"Variable '{name}' has more than {MAX_ARRAY_SIZE} elements")
+        prepared[name] = _checked(array)
+    # Every operator is elementwise, so no intermediate value is larger than the broadcast shape.
+    shapes = [value.shape for value in prepared.values() if isinstance(value, np.ndarray)]
+    if shapes and math.prod(np.broadcast_shapes(*shapes)) > MAX_ARRAY_SIZE:
+        raise ValueError(f"Variables broadcast to more than {MAX_ARRAY_SIZE} elements")
+    return prepared
+
+
+def evaluate_expression(expression: str, variables: Optional[Mapping[str, Any]] = None) -> Value:
+    """Evaluate ``expression`` with optional scalar or array ``variables`` (broadcast like NumPy)."""
+    compiled = compile_expression(expression)
+    with np.errstate(all="ignore"):
+        return compiled.evaluate(_prepare_variables(variables))
+
+
+def _format_value(value: Value) -> str:
+    if isinstance(value, np.ndarray):
+        return str(value.tolist())
+    return str(value)
+
 
 class CalculatorTool(BaseTool):
     name: str = "deterministic_calculator"
     description: str = (
         "Perform precise arithmetic on simple expressions. "
-        "Supports addition, subtraction, multiplication, division, modulus, and powers."
+        "Supports addition, subtraction, multiplication, division, modulus, and powers. "
+        "Pass several expressions in 'expressions' to evaluate them in one call, and bind "
+        "names to numbers or lists of numbers in 'variables' to compute over whole tables."
     )
 
     _logger = logging.getLogger(__name__)
 
-    def _run(self, query: str) -> str:
+    @traced_tool
+    def _run(
+        self,
+        query: str = "",
+        expressions: Optional[List[str]] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        batch = [item for item in [query, *(expressions or [])] if item and item.strip()]
+        if len(batch) <= 1:
+            return self._evaluate_one(batch[0] if batch else query, variables)
+        return "\n".join(self.evaluate_batch(batch, variables))
+
+    async def _arun(
+        self,
+        query: str = "",
+        expressions: Optional[List[str]] = None,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        # Evaluation is bounded and cheap; a thread hop would cost more than it saves.
+        return self._run(query, expressions, variables)
+
+    def evaluate_batch(self, expressions: Sequence[str], variables: Optional[Mapping[str, Any]] = None) -> List[str]:
+        """Evaluate each expression, reporting failures per line instead of failing the batch."""
+        if len(expressions) > MAX_BATCH_SIZE:
+            raise ValueError(f"At most {MAX_BATCH_SIZE} expressions can be evaluated per call")
+        prepared = _prepare_variables(variables)
+        lines = []
+        for expression in expressions:
+            try:
+                lines.append(f"{expression.strip()} = {self._evaluate_one(expression, prepared)}")
+            except ValueError as exc:
+                lines.append(f"{expression.strip()} = error: {exc.__cause__ or exc}")
+        return lines
+
+    def _evaluate_one(self, query: str, variables: Optional[Mapping[str, Any]]) -> str:
         try:
-            expression = ast.parse(query, mode="eval").body
-            result = self._eval(expression)
-            self._logger.info("Calculator evaluated '%s' -> %s", query, result)
-            return str(result)
-        except Exception as exc:  # pragma: no cover - defensive layer
-            self._logger.exception("Calculator failed for expression '%s'", query)
+            result = evaluate_expression(query, variables)
+            self._logger.info("Calculator evaluated '%s' -> %s", query, _format_value(result)[:200])
+            return _format_value(result)
+        except Exception as exc:
+            self._logger.warning("Calculator failed for expression '%s': %s", query, exc)
             raise ValueError(f"Failed to evaluate expression '{query}': {exc}") from exc
-
-    def _eval(self, node: ast.AST) -> float:
-        if isinstance(node, ast.Num):  # type: ignore[attr-defined]
-            return float(node.n)
-        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-            return float(node.value)
-        if isinstance(node, ast.UnaryOp) and type(node.op) in _ALLOWED_OPERATORS:
-            return _ALLOWED_OPERATORS[type(node.op)](self._eval(node.operand))
-        if isinstance(node, ast.BinOp) and type(node.op) in _ALLOWED_OPERATORS:
-            left = self._eval(node.left)
-            right = self._eval(node.right)
-            return _ALLOWED_OPERATORS[type(node.op)](left, right)
-        raise ValueError(f"Unsupported expression: {ast.dump(node, include_attributes=False)}")
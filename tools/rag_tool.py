@@ -2,40 +2,90 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Sequence
 
+import numpy as np
 from langchain_core.documents import Document
 from crewai.tools import BaseTool
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from pydantic import Field, PrivateAttr
+from pydantic import Field
+
+from config.tracing import annotate, increment, traced_tool
+
+from .async_support import run_blocking
+from .retrieval_cache import RetrievalCache, SearchResult, get_retrieval_cache
+from .snippet_packing import pack_snippets
+from .sparse_index import reciprocal_rank_fusion
+from .vector_index import VectorIndex
+from .vectorstore_registry import get_vectorstore_registry
 
 DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 DEFAULT_VECTORSTORE_DIR = Path(__file__).resolve().parents[1] / "rag" / "vectorstore"
+SEARCH_MODES = ("dense", "sparse", "hybrid")
+# Each ranking feeds this many times ``k`` candidates into rank fusion.
+HYBRID_CANDIDATE_FACTOR = 4
+
+
+@dataclass
+class RetrievalHit:
+    """A retrieved chunk together with every query that matched it."""
+
+    document: Document
+    # Lower is better: squared L2 for dense search, the negated BM25 or fused score otherwise.
+    distance: float
+    queries: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RetrievalResult:
+    """Deduplicated hits for a batch of queries, best first, with per-query attribution."""
+
+    hits: List[RetrievalHit]
+    by_query: Dict[str, List[int]]
 
 
 class LocalRAGTool(BaseTool):
     name: str = "local_rag_search"
     description: str = (
         "Access the local FAISS vector store built from workshop materials. "
-        "Use this to retrieve background information, code snippets, and deployment tips."
+        "Use this to retrieve background information, code snippets, and deployment tips. "
+        "Pass several related lookups at once in 'queries' to get merged, deduplicated snippets."
     )
     vectorstore_path: Path = Field(default_factory=lambda: DEFAULT_VECTORSTORE_DIR)
     top_k: int = 4
     embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    nprobe: Optional[int] = Field(
+        default=None, description="IVF cells probed per query; None uses the value saved with the index."
+    )
+    ef_search: Optional[int] = Field(
+        default=None, description="HNSW search depth per query; None uses the value saved with the index."
+    )
+    search_mode: str = Field(
+        default="dense",
+        description="'dense' (vectors), 'sparse' (BM25 keywords) or 'hybrid' (both, fused by reciprocal rank).",
+    )
+    rrf_k: int = Field(default=60, description="Reciprocal rank fusion damping constant.")
+    token_budget: Optional[int] = Field(
+        default=600,
+        description="Maximum tokens of snippet text returned per call; None returns every merged snippet.",
+    )
+    tokenizer_model: Optional[str] = Field(
+        default=None, description="Model whose tokenizer measures the budget; None uses cl100k_base."
+    )
+    use_cache: bool = Field(
+        default=True, description="Serve repeated queries from the process-wide retrieval cache."
+    )
 
-    _vectorstore: Optional[FAISS] = PrivateAttr(default=None)
     _logger = logging.getLogger(__name__)
 
     def __init__(self, **data) -> None:
         super().__init__(**data)
         self.vectorstore_path = Path(self.vectorstore_path)
+        if self.search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search_mode '{self.search_mode}'. Expected one of {SEARCH_MODES}.")
 
-    def _load_vectorstore(self) -> FAISS:
-        if self._vectorstore is not None:
-            return self._vectorstore
-
+    def _load_vectorstore(self) -> VectorIndex:
         if not self.vectorstore_path.exists():
             self._logger.error(
                 "Vector store missing at %s. Did you run rag/build_vector_db.py?",
@@ -45,34 +95,173 @@ class LocalRAGTool(BaseTool):
                 f"Vector store not found at {self.vectorstore_path}. Run 'python rag/build_vector_db.py' first."
             )
 
-        embeddings = HuggingFaceEmbeddings(model_name=self.embedding_model)
-        self._vectorstore = FAISS.load_local(
-            folder_path=str(self.vectorstore_path),
-            embeddings=embeddings,
-            allow_dangerous_deserialization=True,
+        # Embeddings and the index are shared process-wide, so every tool instance and
+        # every crew (including fallback attempts) reuses a single loaded copy.
+        return get_vectorstore_registry().get_vectorstore(
+            self.vectorstore_path, self.embedding_model
         )
-        self._logger.info(
-            "Loaded FAISS vector store from %s using embedding model %s",
-            self.vectorstore_path,
+
+    def retrieve_many(self, queries: Sequence[str], *, k: Optional[int] = None) -> RetrievalResult:
+        """Retrieve snippets for several queries with one embedding pass and one index search.
+
+        Chunks matched by more than one query are returned once, ranked by their best
+        distance, and ``by_query`` maps each query to the positions of its hits.
+        """
+        queries = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+        if not queries:
+            return RetrievalResult(hits=[], by_query={})
+
+        k = k or self.top_k
+        index = self._load_vectorstore()
+        cache = get_retrieval_cache() if self.use_cache else None
+        # index.version changes when the store is rebuilt, which invalidates cached results.
+        mode = self._effective_mode(index)
+        store_key = (
+            str(index.directory),
+            index.version,
             self.embedding_model,
+            mode,
+            k,
+            self.nprobe,
+            self.ef_search,
+            self.rrf_k,
         )
-        return self._vectorstore
 
-    def _run(self, query: str) -> str:
-        store = self._load_vectorstore()
-        docs = store.similarity_search(query, k=self.top_k)
-        if not docs:
+        results: Dict[str, SearchResult] = {}
+        pending: List[str] = []
+        for query in queries:
+            cached = cache.get_result(store_key, query) if cache is not None else None
+            if cached is not None:
+                results[query] = cached
+            else:
+                pending.append(query)
+        annotate(queries=len(queries), search_mode=mode)
+        increment("cache_hits", len(queries) - len(pending))
+
+        if pending:
+            for query, result in zip(pending, self._rank(index, pending, k, mode, cache)):
+                results[query] = result
+                if cache is not None:
+                    cache.set_result(store_key, query, result)
+
+        best: Dict[int, float] = {}
+        matched_by: Dict[int, List[str]] = {}
+        for query in queries:
+            for row, distance in results[query]:
+                best[row] = min(best.get(row, float("inf")), distance)
+                matched_by.setdefault(row, []).append(query)
+
+        ordered = sorted(best, key=best.__getitem__)
+        documents = index.documents(ordered)
+        hits = [
+            RetrievalHit(document=doc, distance=best[row], queries=matched_by[row])
+            for row, doc in zip(ordered, documents)
+        ]
+        by_query: Dict[str, List[int]] = {query: [] for query in queries}
+        for position, hit in enumerate(hits):
+            for query in hit.queries:
+                by_query[query].append(position)
+        return RetrievalResult(hits=hits, by_query=by_query)
+
+    def _effective_mode(self, index: VectorIndex) -> str:
+        if self.search_mode != "dense" and index.sparse is None:
+            self._logger.warning(
+                "Vector store at %s has no BM25 index; falling back to dense search. "
+                "Rebuild it with 'python rag/build_vector_db.py' to enable %s search.",
+                index.directory,
+                self.search_mode,
+            )
+            return "dense"
+        return self.search_mode
+
+    def _rank(
+        self, index: VectorIndex, queries: List[str], k: int, mode: str, cache: Optional[RetrievalCache]
+    ) -> List[SearchResult]:
+        """Rank chunks for each query with one batched dense search and/or BM25 lookups."""
+        depth = k * HYBRID_CANDIDATE_FACTOR if mode == "hybrid" else k
+        dense: List[SearchResult] = []
+        if mode in ("dense", "hybrid"):
+            vectors = self._embed_queries(queries, cache)
+            distances, rows = index.search(vectors, depth, nprobe=self.nprobe, ef_search=self.ef_search)
+            # Rows of -1 pad queries with fewer than k hits, e.g. sparse IVF cells.
+            dense = [
+                tuple((int(row), float(distance)) for row, distance in zip(query_rows, query_distances) if row >= 0)
+                for query_rows, query_distances in zip(rows, distances)
+            ]
+        if mode == "dense":
+            return dense
+
+        assert index.sparse is not None
+        sparse: List[SearchResult] = []
+        for query in queries:
+            rows, scores = index.sparse.search(query, depth)
+            sparse.append(tuple((int(row), -float(score)) for row, score in zip(rows, scores)))
+        if mode == "sparse":
+            return sparse
+
+        return [
+            tuple(
+                (row, -score)
+                for row, score in reciprocal_rank_fusion(
+                    ([row for row, _ in dense_hits], [row for row, _ in sparse_hits]),
+                    k=self.rrf_k,
+                    limit=k,
+                )
+            )
+            for dense_hits, sparse_hits in zip(dense, sparse)
+        ]
+
+    def _embed_queries(self, queries: List[str], cache: Optional[RetrievalCache]) -> np.ndarray:
+        """Embed ``queries`` as one matrix, reusing cached vectors where available."""
+        vectors: List[Optional[np.ndarray]] = [
+            cache.get_embedding(self.embedding_model, query) if cache is not None else None
+            for query in queries
+        ]
+        missing = [position for position, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embeddings = get_vectorstore_registry().get_embeddings(self.embedding_model)
+            # HuggingFaceEmbeddings encodes queries and documents identically, so the whole
+            # batch goes through the model as one matrix.
+            fresh = np.asarray(
+                embeddings.embed_documents([queries[position] for position in missing]),
+                dtype=np.float32,
+            )
+            for position, vector in zip(missing, fresh):
+                vectors[position] = vector
+                if cache is not None:
+                    cache.set_embedding(self.embedding_model, queries[position], vector)
+        return np.stack(vectors).astype(np.float32, copy=False)
+
+    def _search(self, query: str) -> list[Document]:
+        return [hit.document for hit in self.retrieve_many([query]).hits]
+
+    async def _arun(self, query: str = "", queries: Optional[List[str]] = None) -> str:
+        # Embedding and index search block, so the whole call runs on the bounded tool
+        # executor and the event loop stays free for other pipelines.
+        return await run_blocking(self._run, query, queries)
+
+    async def aretrieve_many(self, queries: Sequence[str], *, k: Optional[int] = None) -> RetrievalResult:
+        """Async :meth:`retrieve_many`, run on the shared tool executor."""
+        return await run_blocking(self.retrieve_many, queries, k=k)
+
+    @traced_tool
+    def _run(self, query: str = "", queries: Optional[List[str]] = None) -> str:
+        all_queries = [query, *(queries or [])]
+        result = self.retrieve_many(all_queries)
+        if not result.hits:
             return "No relevant documents found in the local knowledge base."
 
-        formatted = self._format_docs(docs)
+        formatted = pack_snippets(
+            result.hits,
+            token_budget=self.token_budget,
+            attribute=len(result.by_query) > 1,
+            model=self.tokenizer_model,
+        )
         self._logger.info(
-            "Local RAG served %d snippets for query '%s'", len(docs), query
+            "Local RAG served %d snippets for %d quer%s: %s",
+            len(result.hits),
+            len(result.by_query),
+            "y" if len(result.by_query) == 1 else "ies",
+            list(result.by_query),
         )
         return formatted
-
-    @staticmethod
-    def _format_docs(docs: list[Document]) -> str:
-        formatted = []
-        for idx, doc in enumerate(docs, start=1):
-            formatted.append(f"Snippet {idx}:\n{doc.page_content.strip()}")
-        return "\n\n".join(formatted)
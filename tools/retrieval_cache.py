@@ -0,0 +1,130 @@
+"""In-memory LRU caches for RAG query embeddings and top-k search results."""
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+# Trailing punctuation that does not change what an agent is asking for.
+_TRAILING_PUNCTUATION = " ?!.,;:"
+
+SearchResult = Tuple[Tuple[int, float], ...]
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, collapse whitespace and strip trailing punctuation so near-identical queries share entries."""
+    return _WHITESPACE.sub(" ", query).strip().casefold().rstrip(_TRAILING_PUNCTUATION)
+
+
+@dataclass
+class RetrievalCacheStats:
+    """Hit/miss counters for a :class:`RetrievalCache`."""
+
+    embedding_hits: int = 0
+    embedding_misses: int = 0
+    result_hits: int = 0
+    result_misses: int = 0
+
+    @property
+    def embedding_hit_rate(self) -> float:
+        lookups = self.embedding_hits + self.embedding_misses
+        return self.embedding_hits / lookups if lookups else 0.0
+
+    @property
+    def result_hit_rate(self) -> float:
+        lookups = self.result_hits + self.result_misses
+        return self.result_hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        data: Dict[str, float] = dict(asdict(self))
+        data["embedding_hit_rate"] = round(self.embedding_hit_rate, 4)
+        data["result_hit_rate"] = round(self.result_hit_rate, 4)
+        return data
+
+
+class _LRU:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[object]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: object) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class RetrievalCache:
+    """Thread-safe LRU caches shared by every :class:`LocalRAGTool` in the process.
+
+    Query embeddings are keyed by ``(embedding_model, normalized query)`` and stay valid
+    across index rebuilds. Search results are keyed by ``(store path, index version,
+    normalized query, k, search overrides)``; the index version changes whenever the
+    registry reloads a rebuilt store, so stale results are never served and simply age
+    out of the LRU.
+    """
+
+    def __init__(self, *, max_embeddings: int = 4096, max_results: int = 4096) -> None:
+        self._lock = threading.Lock()
+        self._embeddings = _LRU(max_embeddings)
+        self._results = _LRU(max_results)
+        self.stats = RetrievalCacheStats()
+
+    def get_embedding(self, model: str, query: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._embeddings.get((model, normalize_query(query)))
+            if vector is None:
+                self.stats.embedding_misses += 1
+            else:
+                self.stats.embedding_hits += 1
+            return vector  # type: ignore[return-value]
+
+    def set_embedding(self, model: str, query: str, vector: np.ndarray) -> None:
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._embeddings.set((model, normalize_query(query)), vector)
+
+    def get_result(self, store_key: Hashable, query: str) -> Optional[SearchResult]:
+        with self._lock:
+            result = self._results.get((store_key, normalize_query(query)))
+            if result is None:
+                self.stats.result_misses += 1
+            else:
+                self.stats.result_hits += 1
+            return result  # type: ignore[return-value]
+
+    def set_result(self, store_key: Hashable, query: str, result: SearchResult) -> None:
+        with self._lock:
+            self._results.set((store_key, normalize_query(query)), result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._embeddings.clear()
+            self._results.clear()
+            self.stats = RetrievalCacheStats()
+
+
+_CACHE = RetrievalCache()
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Return the process-wide retrieval cache."""
+    return _CACHE
@@ -0,0 +1,133 @@
+"""Pluggable web search backends used by the web search tool.
+
+A backend turns ``(query, kind, max_results)`` into a list of result dictionaries with
+``title``, ``href`` and ``body`` keys. :class:`DuckDuckGoBackend` queries the live
+service through a pool of reusable sessions; :class:`StaticSearchBackend` answers from a
+local list of documents for tests and offline runs.
+"""
+from __future__ import annotations
+
+import json
+import queue
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple, Type
+
+from .sparse_index import tokenize
+
+SearchResults = List[Dict[str, Any]]
+
+
+class SearchBackend(Protocol):
+    """Interface every web search backend implements."""
+
+    #: Identifies the backend in cache keys.
+    name: str
+    #: Host requests are sent to, for per-host rate limiting; ``None`` for local backends.
+    host: Optional[str]
+    #: Exceptions worth retrying with backoff (rate limiting, timeouts).
+    retryable_errors: Tuple[Type[BaseException], ...]
+
+    def search(self, query: str, *, kind: str, max_results: int) -> SearchResults:
+        ...
+
+
+class DuckDuckGoBackend:
+    """DuckDuckGo search over a pool of long-lived ``DDGS`` sessions.
+
+    Each ``DDGS`` instance owns an HTTP client, so reusing them keeps connections and TLS
+    sessions warm between queries. A session serves one thread at a time and is closed
+    rather than reused after an error.
+    """
+
+    name = "duckduckgo"
+    host: Optional[str] = "duckduckgo.com"
+
+    def __init__(self, *, pool_size: int = 4, timeout: int = 10) -> None:
+        from duckduckgo_search.exceptions import RatelimitException, TimeoutException
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retryable_errors: Tuple[Type[BaseException], ...] = (RatelimitException, TimeoutException)
+        self._sessions: "queue.LifoQueue[Any]" = queue.LifoQueue()
+
+    def _checkout(self) -> Any:
+        try:
+            return self._sessions.get_nowait()
+        except queue.Empty:
+            from duckduckgo_search import DDGS
+
+            return DDGS(timeout=self.timeout)
+
+    def _release(self, session: Any) -> None:
+        if self._sessions.qsize() < self.pool_size:
+            self._sessions.put(session)
+        else:
+            self._close(session)
+
+    @staticmethod
+    def _close(session: Any) -> None:
+        # DDGS is a context manager; exiting it releases its HTTP client.
+        try:
+            session.__exit__(None, None, None)
+        except Exception:  # pragma: no cover - the session is being discarded anyway
+            pass
+
+    def search(self, query: str, *, kind: str, max_results: int) -> SearchResults:
+        session = self._checkout()
+        succeeded = False
+        try:
+            if kind == "news":
+                iterator = session.news(query, max_results=max_results)
+            elif kind == "images":
+                iterator = session.images(query, max_results=max_results)
+            else:
+                iterator = session.text(query, max_results=max_results)
+            results = list(iterator or [])
+            succeeded = True
+            return results
+        finally:
+            if succeeded:
+                self._release(session)
+            else:
+                self._close(session)
+
+
+class StaticSearchBackend:
+    """Keyword search over a fixed set of result records, with no network access.
+
+    Records are dictionaries shaped like live results (``title``, ``href``, ``body``) and
+    are ranked by how many query terms they contain. ``kind`` is ignored.
+    """
+
+    name = "static"
+    host: Optional[str] = None
+    retryable_errors: Tuple[Type[BaseException], ...] = ()
+
+    def __init__(self, records: Iterable[Dict[str, Any]]) -> None:
+        self.records = list(records)
+        self._terms = [
+            set(tokenize(f"{record.get('title', '')} {record.get('body', '')}")) for record in self.records
+        ]
+
+    @classmethod
+    def from_file(cls, path: Path) -> "StaticSearchBackend":
+        """Load records from a JSON array or a JSON Lines file."""
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Static search index not found at {path}")
+        text = path.read_text(encoding="utf-8")
+        if path.suffix.lower() == ".jsonl":
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            records = json.loads(text)
+        return cls(records)
+
+    def search(self, query: str, *, kind: str, max_results: int) -> SearchResults:
+        terms = set(tokenize(query))
+        scored = [
+            (len(terms & record_terms), position)
+            for position, record_terms in enumerate(self._terms)
+            if terms & record_terms
+        ]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [dict(self.records[position]) for _, position in scored[:max_results]]
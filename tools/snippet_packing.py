@@ -0,0 +1,130 @@
+"""Pack retrieved chunks into a compact, token-budgeted block of prompt context."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from config.tokens import count_tokens, truncate_to_tokens
+
+if TYPE_CHECKING:
+    from .rag_tool import RetrievalHit
+
+# A trimmed snippet shorter than this is noise rather than context; stop packing instead.
+MIN_TRIMMED_SNIPPET_TOKENS = 24
+TRUNCATION_MARKER = " …"
+
+
+@dataclass
+class PackedSnippet:
+    """One contiguous span of a source document assembled from one or more chunks."""
+
+    source: str
+    start: int
+    end: int
+    text: str
+    rank: int
+    queries: List[str] = field(default_factory=list)
+    truncated: bool = False
+
+
+def _absorb(snippet: PackedSnippet, start: int, text: str, rank: int, queries: List[str]) -> None:
+    end = start + len(text)
+    if end > snippet.end:
+        overlap = max(0, snippet.end - start)
+        # Chunks one chunk apart can be separated by whitespace the splitter dropped.
+        joiner = " " if start > snippet.end else ""
+        snippet.text += joiner + text[overlap:]
+        snippet.end = end
+    snippet.rank = min(snippet.rank, rank)
+    snippet.queries.extend(query for query in queries if query not in snippet.queries)
+
+
+def merge_hits(hits: Sequence["RetrievalHit"]) -> List[PackedSnippet]:
+    """Merge overlapping and adjacent chunks of the same source into single spans.
+
+    ``hits`` must be ordered best first; merged spans keep the best rank of their parts
+    and are returned in rank order. Chunks without a known position are only deduplicated
+    by exact text.
+    """
+    by_source: Dict[str, List[tuple]] = {}
+    loose: List[PackedSnippet] = []
+    seen_text: set = set()
+    for rank, hit in enumerate(hits):
+        text = hit.document.page_content.strip()
+        metadata = hit.document.metadata
+        source = str(metadata.get("source", ""))
+        start = int(metadata.get("start_index", -1))
+        if start < 0:
+            if text not in seen_text:
+                seen_text.add(text)
+                loose.append(PackedSnippet(source, -1, -1, text, rank, list(hit.queries)))
+            continue
+        # Offsets refer to the unstripped chunk; realign after stripping leading whitespace.
+        start += len(hit.document.page_content) - len(hit.document.page_content.lstrip())
+        chunk_index = int(metadata.get("chunk_index", -1))
+        by_source.setdefault(source, []).append((start, chunk_index, text, rank, list(hit.queries)))
+
+    merged: List[PackedSnippet] = list(loose)
+    for source, spans in by_source.items():
+        spans.sort(key=lambda span: (span[0], span[1]))
+        current: Optional[PackedSnippet] = None
+        last_chunk = -2
+        for start, chunk_index, text, rank, queries in spans:
+            contiguous = current is not None and (
+                start <= current.end + 1 or (chunk_index >= 0 and chunk_index == last_chunk + 1)
+            )
+            if contiguous:
+                _absorb(current, start, text, rank, queries)
+            else:
+                current = PackedSnippet(source, start, start + len(text), text, rank, queries)
+                merged.append(current)
+            last_chunk = max(last_chunk, chunk_index) if contiguous else chunk_index
+    merged.sort(key=lambda snippet: snippet.rank)
+    return merged
+
+
+def format_snippet(index: int, snippet: PackedSnippet, *, attribute: bool) -> str:
+    label = f"Snippet {index}"
+    if snippet.source:
+        label += f" [{snippet.source}]"
+    if attribute:
+        label += " (matched: " + "; ".join(f'"{query}"' for query in snippet.queries) + ")"
+    return f"{label}:\n{snippet.text}"
+
+
+def pack_snippets(
+    hits: Sequence["RetrievalHit"],
+    *,
+    token_budget: Optional[int],
+    attribute: bool = False,
+    model: Optional[str] = None,
+) -> str:
+    """Merge ``hits`` and render them best first until ``token_budget`` is reached.
+
+    The snippet that crosses the budget is trimmed to fit when enough room remains; the
+    rest are dropped. The top snippet is always kept, trimmed to at least
+    ``MIN_TRIMMED_SNIPPET_TOKENS`` even if that overshoots a tiny budget, so a non-empty
+    ``hits`` never packs to an empty string. ``token_budget=None`` renders every merged
+    snippet.
+    """
+    blocks: List[str] = []
+    used = 0
+    separator_tokens = count_tokens("\n\n", model)
+    for snippet in merge_hits(hits):
+        block = format_snippet(len(blocks) + 1, snippet, attribute=attribute)
+        cost = count_tokens(block, model) + (separator_tokens if blocks else 0)
+        if token_budget is None or used + cost <= token_budget:
+            blocks.append(block)
+            used += cost
+            continue
+
+        remaining = token_budget - used - (separator_tokens if blocks else 0)
+        header = format_snippet(len(blocks) + 1, replace(snippet, text=""), attribute=attribute)
+        room = remaining - count_tokens(header + TRUNCATION_MARKER, model)
+        if room >= MIN_TRIMMED_SNIPPET_TOKENS or not blocks:
+            room = max(room, MIN_TRIMMED_SNIPPET_TOKENS)
+            snippet.text = truncate_to_tokens(snippet.text, room, model) + TRUNCATION_MARKER
+            snippet.truncated = True
+            blocks.append(format_snippet(len(blocks) + 1, snippet, attribute=attribute))
+        break
+    return "\n\n".join(blocks)
@@ -0,0 +1,121 @@
+"""BM25 sparse index stored next to the vector store, plus reciprocal rank fusion.
+
+Postings are kept term-major in CSR form – ``bm25.indptr.npy`` (per term offsets),
+``bm25.rows.npy`` (chunk rows) and ``bm25.weights.npy`` (precomputed BM25 term weights) –
+with the vocabulary and parameters in ``bm25.json``. The arrays are memory-mapped, and a
+query is scored by summing the postings of its terms, so lookups need only NumPy.
+"""
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+SPARSE_META_FILE = "bm25.json"
+SPARSE_INDPTR_FILE = "bm25.indptr.npy"
+SPARSE_ROWS_FILE = "bm25.rows.npy"
+SPARSE_WEIGHTS_FILE = "bm25.weights.npy"
+
+_TOKEN = re.compile(r"[a-z0-9]+[+#]*")
+_DIGIT_GROUPING = re.compile(r"(?<=\d),(?=\d{3})")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was "
+    "were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; keeps ``c++``/``c#`` and joins digit groups (``120,000``)."""
+    text = _DIGIT_GROUPING.sub("", text.lower())
+    return [token for token in _TOKEN.findall(text) if token not in _STOPWORDS]
+
+
+class SparseIndex:
+    """Read-only BM25 index over the chunks of a vector store, addressed by the same rows."""
+
+    def __init__(self, directory: Path) -> None:
+        directory = Path(directory)
+        meta = json.loads((directory / SPARSE_META_FILE).read_text(encoding="utf-8"))
+        self.k1: float = meta["k1"]
+        self.b: float = meta["b"]
+        self.count: int = meta["count"]
+        self._term_ids: Dict[str, int] = {term: idx for idx, term in enumerate(meta["terms"])}
+        self._indptr = np.load(directory / SPARSE_INDPTR_FILE, mmap_mode="r")
+        self._rows = np.load(directory / SPARSE_ROWS_FILE, mmap_mode="r")
+        self._weights = np.load(directory / SPARSE_WEIGHTS_FILE, mmap_mode="r")
+
+    @staticmethod
+    def exists(directory: Path) -> bool:
+        return (Path(directory) / SPARSE_META_FILE).exists()
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(rows, scores)`` of up to ``k`` chunks sharing a term with ``query``, best first."""
+        term_ids = sorted({self._term_ids[token] for token in tokenize(query) if token in self._term_ids})
+        if not term_ids or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        spans = [(int(self._indptr[term]), int(self._indptr[term + 1])) for term in term_ids]
+        rows = np.concatenate([self._rows[start:end] for start, end in spans])
+        weights = np.concatenate([self._weights[start:end] for start, end in spans])
+        candidates, inverse = np.unique(rows, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights).astype(np.float32)
+
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            candidates, scores = candidates[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return candidates[order].astype(np.int64), scores[order]
+
+    @staticmethod
+    def write(directory: Path, texts: Sequence[str], *, k1: float = 1.2, b: float = 0.75) -> None:
+        """Tokenize ``texts`` (one per chunk row) and persist BM25 postings for them."""
+        directory = Path(directory)
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = np.zeros(len(texts), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths[row] = sum(counts.values())
+            for term, frequency in counts.items():
+                postings.setdefault(term, []).append((row, frequency))
+
+        count = len(texts)
+        average_length = float(lengths.mean()) if count and lengths.any() else 1.0
+        terms = sorted(postings)
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        row_parts: List[np.ndarray] = []
+        weight_parts: List[np.ndarray] = []
+        for idx, term in enumerate(terms):
+            entries = np.asarray(postings[term], dtype=np.int64)
+            rows, frequencies = entries[:, 0], entries[:, 1].astype(np.float32)
+            df = len(rows)
+            idf = math.log(1.0 + (count - df + 0.5) / (df + 0.5))
+            norm = k1 * (1.0 - b + b * lengths[rows] / average_length)
+            row_parts.append(rows.astype(np.int32))
+            weight_parts.append((idf * frequencies * (k1 + 1.0) / (frequencies + norm)).astype(np.float32))
+            indptr[idx + 1] = indptr[idx] + df
+
+        np.save(directory / SPARSE_INDPTR_FILE, indptr)
+        np.save(directory / SPARSE_ROWS_FILE, _concat(row_parts, np.int32))
+        np.save(directory / SPARSE_WEIGHTS_FILE, _concat(weight_parts, np.float32))
+        (directory / SPARSE_META_FILE).write_text(
+            json.dumps({"k1": k1, "b": b, "count": count, "average_length": average_length, "terms": terms}),
+            encoding="utf-8",
+        )
+
+
+def _concat(parts: List[np.ndarray], dtype: type) -> np.ndarray:
+    return np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype=dtype)
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], *, k: int = 60, limit: int) -> List[Tuple[int, float]]:
+    """Fuse ranked row lists: each row scores ``sum(1 / (k + rank))``; returns the best ``limit``."""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            scores[int(row)] = scores.get(int(row), 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
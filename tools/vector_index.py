@@ -0,0 +1,212 @@
+"""On-disk vector index format shared by ``rag/build_vector_db.py`` and the RAG tool.
+
+A store directory holds:
+
+* ``index_params.json`` – index type, dimension, embedding model and query defaults.
+* ``embeddings.npy`` – normalised float32 vectors; flat indexes search it directly.
+* ``index.faiss`` – the FAISS index for approximate types (IVF-Flat, HNSW, IVF-PQ).
+* ``chunks.bin`` / ``chunks.offsets.npy`` – chunk text as UTF-8, addressed by byte offsets.
+* ``chunks.meta.npy`` / ``sources.json`` – per-chunk position metadata and source names.
+* ``bm25.*`` – the optional sparse keyword index (see ``tools/sparse_index.py``).
+
+Everything large is memory-mapped rather than read or unpickled, so opening a store costs
+the same for ten chunks or a million, and worker processes share pages through the OS
+page cache. IVF inverted lists are mapped via ``faiss.IO_FLAG_MMAP``; HNSW graphs have no
+mmap support in FAISS and are read into memory.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .sparse_index import SparseIndex
+
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    import faiss
+
+FORMAT_VERSION = 1
+PARAMS_FILE = "index_params.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+FAISS_INDEX_FILE = "index.faiss"
+TEXT_FILE = "chunks.bin"
+OFFSETS_FILE = "chunks.offsets.npy"
+META_FILE = "chunks.meta.npy"
+SOURCES_FILE = "sources.json"
+
+META_DTYPE = np.dtype([("source", np.int32), ("chunk_index", np.int32), ("start_index", np.int64)])
+# Rows of the memory-mapped matrix scored per block during exact search.
+FLAT_SEARCH_BLOCK = 65_536
+
+
+def search_parameters(
+    index: faiss.Index, *, nprobe: Optional[int] = None, ef_search: Optional[int] = None
+) -> Optional[faiss.SearchParameters]:
+    """Build per-query FAISS search parameters without mutating the shared index.
+
+    ``nprobe`` applies to IVF indexes and ``ef_search`` to HNSW; overrides that do not
+    match the index type are ignored, and ``None`` keeps the defaults saved at build time.
+    """
+    import faiss
+
+    if nprobe is not None and faiss.try_extract_index_ivf(index) is not None:
+        return faiss.SearchParametersIVF(nprobe=nprobe)
+    if ef_search is not None and isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(efSearch=ef_search)
+    return None
+
+
+class ChunkStore:
+    """Read-only, memory-mapped chunk text and metadata addressed by index row."""
+
+    def __init__(self, directory: Path) -> None:
+        directory = Path(directory)
+        self._offsets = np.load(directory / OFFSETS_FILE, mmap_mode="r")
+        self._meta = np.load(directory / META_FILE, mmap_mode="r")
+        self._sources: List[str] = json.loads((directory / SOURCES_FILE).read_text(encoding="utf-8"))
+        text_path = directory / TEXT_FILE
+        self._text: Any = b""
+        if text_path.stat().st_size:
+            with text_path.open("rb") as handle:
+                self._text = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def text(self, row: int) -> str:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return bytes(self._text[start:end]).decode("utf-8")
+
+    def metadata(self, row: int) -> Dict[str, Any]:
+        meta = self._meta[row]
+        return {
+            "source": self._sources[int(meta["source"])],
+            "chunk_index": int(meta["chunk_index"]),
+            "start_index": int(meta["start_index"]),
+            "row": row,
+        }
+
+    def document(self, row: int) -> Document:
+        return Document(page_content=self.text(row), metadata=self.metadata(row))
+
+    @staticmethod
+    def write(directory: Path, chunks: Sequence[Dict[str, Any]]) -> None:
+        """Persist chunk records (``text``, ``source``, ``chunk_index``, ``start_index``) in row order."""
+        directory = Path(directory)
+        sources: Dict[str, int] = {}
+        offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        meta = np.zeros(len(chunks), dtype=META_DTYPE)
+        with (directory / TEXT_FILE).open("wb") as handle:
+            for row, chunk in enumerate(chunks):
+                encoded = chunk["text"].encode("utf-8")
+                handle.write(encoded)
+                offsets[row + 1] = offsets[row] + len(encoded)
+                meta[row] = (
+                    sources.setdefault(chunk["source"], len(sources)),
+                    chunk["chunk_index"],
+                    chunk["start_index"],
+                )
+        np.save(directory / OFFSETS_FILE, offsets)
+        np.save(directory / META_FILE, meta)
+        (directory / SOURCES_FILE).write_text(json.dumps(list(sources)), encoding="utf-8")
+
+
+class VectorIndex:
+    """A loaded vector store: memory-mapped vectors or FAISS index plus the chunk store."""
+
+    def __init__(self, directory: Path, *, version: str = "") -> None:
+        self.directory = Path(directory)
+        # Identifies this build of the store; result caches key on it so a rebuild
+        # invalidates them.
+        self.version = version
+        params_path = self.directory / PARAMS_FILE
+        if not params_path.exists():
+            raise FileNotFoundError(
+                f"{params_path} is missing; the store at {self.directory} predates the current format. "
+                "Run 'python rag/build_vector_db.py --full' to rebuild it."
+            )
+        self.params: Dict[str, Any] = json.loads(params_path.read_text(encoding="utf-8"))
+        self.index_type: str = self.params["type"]
+        self.chunks = ChunkStore(self.directory)
+        # Stores built before the sparse index existed simply have no keyword search.
+        self.sparse: Optional[SparseIndex] = (
+            SparseIndex(self.directory) if SparseIndex.exists(self.directory) else None
+        )
+
+        self._vectors: Optional[np.ndarray] = None
+        self._faiss: Optional[faiss.Index] = None
+        if self.index_type == "flat":
+            self._vectors = np.load(self.directory / EMBEDDINGS_FILE, mmap_mode="r")
+        else:
+            # FAISS is only needed for approximate indexes, so flat stores never load it.
+            import faiss
+
+            self._faiss = faiss.read_index(
+                str(self.directory / FAISS_INDEX_FILE), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+            )
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def dimension(self) -> int:
+        return int(self.params["dimension"])
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        *,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(distances, rows)`` of shape ``(len(queries), k)``; missing hits are ``-1``.
+
+        Distances are squared L2 between normalised vectors, matching FAISS ``IndexFlatL2``.
+        """
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        if self._faiss is not None:
+            params = search_parameters(self._faiss, nprobe=nprobe, ef_search=ef_search)
+            return self._faiss.search(queries, k, params=params)
+        return self._flat_search(queries, k)
+
+    def _flat_search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        assert self._vectors is not None
+        count = self._vectors.shape[0]
+        k_eff = min(k, count)
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, count, FLAT_SEARCH_BLOCK):
+            block = np.asarray(self._vectors[start : start + FLAT_SEARCH_BLOCK])
+            scores = queries @ block.T
+            rows = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, rows], axis=1)
+            if best_scores.shape[1] > k_eff:
+                keep = np.argpartition(-best_scores, k_eff - 1, axis=1)[:, :k_eff]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        distances = (2.0 - 2.0 * best_scores).astype(np.float32)
+        if k_eff < k:
+            pad = k - k_eff
+            distances = np.pad(distances, ((0, 0), (0, pad)), constant_values=np.inf)
+            best_rows = np.pad(best_rows, ((0, 0), (0, pad)), constant_values=-1)
+        return distances, best_rows
+
+    def documents(self, rows: Iterable[int]) -> List[Document]:
+        """Materialise the chunks for the given rows, skipping ``-1`` placeholders."""
+        return [self.chunks.document(int(row)) for row in rows if row >= 0]
+
+
+def write_index_params(directory: Path, params: Dict[str, Any]) -> None:
+    (Path(directory) / PARAMS_FILE).write_text(
+        json.dumps({"format_version": FORMAT_VERSION, **params}, indent=2), encoding="utf-8"
+    )
@@ -0,0 +1,156 @@
+"""Process-wide registry that shares embedding models and vector indexes between RAG tools."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Hashable, Tuple
+
+from .vector_index import VectorIndex
+
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+logger = logging.getLogger(__name__)
+
+IndexSignature = Tuple[Tuple[str, int, int], ...]
+
+
+def index_signature(path: Path) -> IndexSignature:
+    """Fingerprint the files of a saved vector store so on-disk rebuilds can be detected."""
+    entries = []
+    for child in sorted(Path(path).iterdir()):
+        if child.is_file():
+            stat = child.stat()
+            entries.append((child.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+def signature_version(signature: IndexSignature) -> str:
+    """Short stable digest of an index signature, used as the store's version."""
+    return hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class _LoadedStore:
+    store: VectorIndex
+    signature: IndexSignature
+    checked_at: float
+
+
+class VectorStoreRegistry:
+    """Load each embedding model and vector store once and share it across tool instances.
+
+    Stores are keyed by ``(vectorstore_path, embedding_model)`` and embedding models by
+    name. Loading happens under a per-key lock so concurrent crews never load the same
+    artefact twice, and a store is transparently reloaded when its files change on disk.
+    """
+
+    def __init__(self, *, reload_check_interval: float = 1.0) -> None:
+        self.reload_check_interval = reload_check_interval
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._embeddings: Dict[str, HuggingFaceEmbeddings] = {}
+        self._stores: Dict[Tuple[str, str], _LoadedStore] = {}
+
+    def _lock_for(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get_embeddings(self, model_name: str) -> HuggingFaceEmbeddings:
+        """Return the shared embedding model for ``model_name``, loading it on first use."""
+        embeddings = self._embeddings.get(model_name)
+        if embeddings is not None:
+            return embeddings
+
+        with self._lock_for(("embeddings", model_name)):
+            embeddings = self._embeddings.get(model_name)
+            if embeddings is None:
+                # Imported here: sentence-transformers pulls in torch, which takes seconds.
+                from langchain_community.embeddings import HuggingFaceEmbeddings
+
+                started = time.perf_counter()
+                # The builder stores L2-normalised vectors; queries must match.
+                embeddings = HuggingFaceEmbeddings(
+                    model_name=model_name, encode_kwargs={"normalize_embeddings": True}
+                )
+                self._embeddings[model_name] = embeddings
+                logger.info(
+                    "Loaded embedding model %s in %.2fs",
+                    model_name,
+                    time.perf_counter() - started,
+                )
+        return embeddings
+
+    def get_vectorstore(self, vectorstore_path: Path, embedding_model: str) -> VectorIndex:
+        """Return the shared vector index for a path/model pair, reloading it if rebuilt.
+
+        Opening an index only memory-maps its files; the embedding model is loaded lazily
+        by :meth:`get_embeddings` on the first query.
+        """
+        path = Path(vectorstore_path).resolve()
+        key = (str(path), embedding_model)
+
+        loaded = self._stores.get(key)
+        if loaded is not None and not self._is_stale(path, loaded):
+            return loaded.store
+
+        with self._lock_for(("store", *key)):
+            loaded = self._stores.get(key)
+            signature = index_signature(path)
+            if loaded is not None and loaded.signature == signature:
+                loaded.checked_at = time.monotonic()
+                return loaded.store
+
+            started = time.perf_counter()
+            store = VectorIndex(path, version=signature_version(signature))
+            if store.params.get("embedding_model", embedding_model) != embedding_model:
+                logger.warning(
+                    "Vector store at %s was built with %s but is queried with %s",
+                    path,
+                    store.params.get("embedding_model"),
+                    embedding_model,
+                )
+            self._stores[key] = _LoadedStore(
+                store=store, signature=signature, checked_at=time.monotonic()
+            )
+            logger.info(
+                "%s %s vector index (%d chunks) from %s in %.3fs",
+                "Reloaded" if loaded is not None else "Opened",
+                store.index_type,
+                len(store),
+                path,
+                time.perf_counter() - started,
+            )
+        return store
+
+    def _is_stale(self, path: Path, loaded: _LoadedStore) -> bool:
+        now = time.monotonic()
+        if now - loaded.checked_at < self.reload_check_interval:
+            return False
+        try:
+            stale = index_signature(path) != loaded.signature
+        except FileNotFoundError:
+            # Mid-rebuild or removed; keep serving the copy we already have.
+            return False
+        if not stale:
+            loaded.checked_at = now
+        return stale
+
+    def clear(self) -> None:
+        """Drop every cached model and store (mainly useful for tests and reload hooks)."""
+        with self._lock:
+            self._embeddings.clear()
+            self._stores.clear()
+            self._key_locks.clear()
+
+
+_REGISTRY = VectorStoreRegistry()
+
+
+def get_vectorstore_registry() -> VectorStoreRegistry:
+    """Return the process-wide vector store registry."""
+    return _REGISTRY
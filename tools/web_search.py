@@ -1,32 +1,172 @@
 """DuckDuckGo-powered open web search tool."""
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import logging
-from typing import Any
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 from crewai.tools import BaseTool
-from duckduckgo_search import DDGS
 from pydantic import Field
 
+from config.rate_limit import RateLimiter
+from config.tracing import increment, traced_tool
+
+from .async_support import run_blocking
+from .retrieval_cache import normalize_query
+from .search_backends import DuckDuckGoBackend, SearchBackend, SearchResults, StaticSearchBackend
+
+logger = logging.getLogger(__name__)
+
+# Requests per minute allowed to each search host, shared by every tool instance.
+DEFAULT_HOST_RATE_LIMIT_RPM = 30.0
+
+
+def _host_rate_limit_rpm() -> float:
+    """``WEB_SEARCH_RATE_LIMIT_RPM``, read when a host limiter is created; invalid values use the default."""
+    value = os.getenv("WEB_SEARCH_RATE_LIMIT_RPM")
+    if not value:
+        return DEFAULT_HOST_RATE_LIMIT_RPM
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(
+            "Ignoring invalid WEB_SEARCH_RATE_LIMIT_RPM=%r; using %g", value, DEFAULT_HOST_RATE_LIMIT_RPM
+        )
+        return DEFAULT_HOST_RATE_LIMIT_RPM
+
+
+class _TTLCache:
+    """Thread-safe LRU whose entries expire ``ttl_seconds`` after being stored."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, SearchResults]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[SearchResults]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return [dict(item) for item in entry[1]]
+
+    def set(self, key: Hashable, value: SearchResults, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, [dict(item) for item in value])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_RESULT_CACHE = _TTLCache()
+_HOST_LIMITERS: Dict[str, Optional[RateLimiter]] = {}
+_DEFAULT_BACKEND: Optional[SearchBackend] = None
+_LOCK = threading.Lock()
+
+
+def _host_limiter(host: Optional[str]) -> Optional[RateLimiter]:
+    if host is None:
+        return None
+    with _LOCK:
+        if host not in _HOST_LIMITERS:
+            rpm = _host_rate_limit_rpm()
+            _HOST_LIMITERS[host] = RateLimiter(rpm, burst=3) if rpm > 0 else None
+        return _HOST_LIMITERS[host]
+
+
+def get_default_search_backend() -> SearchBackend:
+    """Return the process-wide backend: the live DuckDuckGo pool, or a static index.
+
+    Setting ``WEB_SEARCH_STATIC_INDEX`` to a JSON/JSONL file of results switches every
+    web search tool to offline mode.
+    """
+    global _DEFAULT_BACKEND
+    with _LOCK:
+        if _DEFAULT_BACKEND is None:
+            static_index = os.getenv("WEB_SEARCH_STATIC_INDEX")
+            _DEFAULT_BACKEND = (
+                StaticSearchBackend.from_file(Path(static_index)) if static_index else DuckDuckGoBackend()
+            )
+        return _DEFAULT_BACKEND
+
 
 class DuckDuckGoSearchTool(BaseTool):
     """DuckDuckGo search tool that logs queries before returning results."""
 
     name: str = "duckduckgo_search"
     description: str = (
-        "Query DuckDuckGo for current information. Provide a short search phrase."
+        "Query DuckDuckGo for current information. Provide a short search phrase, "
+        "or several in 'queries' to search them concurrently."
     )
     max_results: int = Field(default=5, ge=1, description="Number of hits to return")
     backend: str = Field(
         default="text",
         description="DuckDuckGo backend to use (text, news, images).",
     )
+    search_backend: Any = Field(
+        default=None,
+        exclude=True,
+        description="SearchBackend serving queries; None uses the shared default backend.",
+    )
+    cache_ttl_seconds: float = Field(default=900.0, ge=0, description="How long results are reused.")
+    max_concurrency: int = Field(default=4, ge=1, description="Parallel queries in search_many.")
+    max_retries: int = Field(default=3, ge=0, description="Retries after rate limiting or timeouts.")
+    backoff_seconds: float = Field(default=1.0, ge=0, description="Initial retry delay; doubles per retry.")
 
     _logger = logging.getLogger(__name__)
 
-    def _run(self, query: str) -> str:
-        self._logger.info("DuckDuckGo search for query: %s", query)
-        results = self._search(query)
+    @staticmethod
+    def _collect_queries(query: str, queries: Optional[List[str]]) -> List[str]:
+        return list(dict.fromkeys(q.strip() for q in [query, *(queries or [])] if q and q.strip()))
+
+    @traced_tool
+    def _run(self, query: str = "", queries: Optional[List[str]] = None) -> str:
+        all_queries = self._collect_queries(query, queries)
+        if len(all_queries) <= 1:
+            self._logger.info("DuckDuckGo search for query: %s", query)
+            results = self._search(all_queries[0] if all_queries else query)
+            return self._format_results(results)
+
+        self._logger.info("DuckDuckGo search for %d queries: %s", len(all_queries), all_queries)
+        return self._format_many(self.search_many(all_queries))
+
+    @traced_tool
+    async def _arun(self, query: str = "", queries: Optional[List[str]] = None) -> str:
+        all_queries = self._collect_queries(query, queries)
+        if len(all_queries) <= 1:
+            self._logger.info("DuckDuckGo async search for query: %s", query)
+            results = await self._asearch(all_queries[0] if all_queries else query)
+            return self._format_results(results)
+
+        self._logger.info("DuckDuckGo async search for %d queries: %s", len(all_queries), all_queries)
+        return self._format_many(await self.asearch_many(all_queries))
+
+    def _format_many(self, results_by_query: Dict[str, SearchResults]) -> str:
+        sections = [
+            f'Results for "{item}":\n{self._format_results(results)}'
+            for item, results in results_by_query.items()
+        ]
+        return "\n\n".join(sections)
+
+    def _format_results(self, results: SearchResults) -> str:
         if not results:
             return "No DuckDuckGo results found for that query."
 
@@ -48,21 +188,124 @@ class DuckDuckGoSearchTool(BaseTool):
         self._logger.debug("DuckDuckGo raw results: %s", results)
         return serialized
 
-    def _search(self, query: str) -> list[dict[str, Any]]:
-        try:
-            with DDGS() as ddgs:
-                if self.backend == "news":
-                    iterator = ddgs.news(query, max_results=self.max_results)
-                elif self.backend == "images":
-                    iterator = ddgs.images(query, max_results=self.max_results)
-                else:
-                    iterator = ddgs.text(query, max_results=self.max_results)
-                return list(iterator)
-        except Exception as exc:  # pragma: no cover - network variability
-            self._logger.exception("DuckDuckGo search failed for '%s'", query)
+    def search_many(self, queries: List[str]) -> Dict[str, SearchResults]:
+        """Search several queries concurrently, sharing the cache and per-host rate limit.
+
+        A query that fails after its retries is logged and maps to an empty list, so one
+        bad query does not discard the others' results.
+        """
+        unique = list(dict.fromkeys(queries))
+
+        def _safe_search(item: str) -> SearchResults:
+            try:
+                return self._search(item)
+            except ValueError:
+                return []
+
+        # One context copy per query keeps the worker threads inside the caller's tool span.
+        contexts = [contextvars.copy_context() for _ in unique]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(unique) or 1)) as pool:
+            return dict(zip(unique, pool.map(lambda ctx, item: ctx.run(_safe_search, item), contexts, unique)))
+
+    async def asearch_many(self, queries: List[str]) -> Dict[str, SearchResults]:
+        """Async :meth:`search_many`: at most ``max_concurrency`` queries in flight at once."""
+        unique = list(dict.fromkeys(queries))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _safe_search(item: str) -> SearchResults:
+            async with semaphore:
+                try:
+                    return await self._asearch(item)
+                except ValueError:
+                    return []
+
+        return dict(zip(unique, await asyncio.gather(*(_safe_search(item) for item in unique))))
+
+    def _cache_key(self, backend: SearchBackend, query: str) -> Hashable:
+        return (backend.name, self.backend, normalize_query(query), self.max_results)
+
+    def _search(self, query: str) -> SearchResults:
+        backend = self.search_backend or get_default_search_backend()
+        cached = _RESULT_CACHE.get(self._cache_key(backend, query))
+        if cached is not None:
+            self._logger.debug("Web search cache hit for '%s'", query)
+            increment("cache_hits")
+            return cached
+        return self._fetch_and_store(backend, query)
+
+    async def _asearch(self, query: str) -> SearchResults:
+        # Cache hits are answered on the event loop; only the backend call uses a worker thread.
+        backend = self.search_backend or get_default_search_backend()
+        cached = _RESULT_CACHE.get(self._cache_key(backend, query))
+        if cached is not None:
+            self._logger.debug("Web search cache hit for '%s'", query)
+            increment("cache_hits")
+            return cached
+        results = await self._afetch(backend, query)
+        self._store(backend, query, results)
+        return results
+
+    def _fetch_and_store(self, backend: SearchBackend, query: str) -> SearchResults:
+        results = self._fetch(backend, query)
+        self._store(backend, query, results)
+        return results
+
+    def _store(self, backend: SearchBackend, query: str, results: SearchResults) -> None:
+        if self.cache_ttl_seconds > 0:
+            _RESULT_CACHE.set(self._cache_key(backend, query), results, self.cache_ttl_seconds)
+
+    def _fetch(self, backend: SearchBackend, query: str) -> SearchResults:
+        limiter = _host_limiter(backend.host)
+        attempt = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                return backend.search(query, kind=self.backend, max_results=self.max_results)
+            except backend.retryable_errors as exc:
+                time.sleep(self._retry_delay(query, attempt, exc))
+                attempt += 1
+                increment("retries")
+            except Exception as exc:  # pragma: no cover - network variability
+                self._logger.exception("DuckDuckGo search failed for '%s'", query)
+                raise ValueError(f"DuckDuckGo search failed: {exc}") from exc
+
+    async def _afetch(self, backend: SearchBackend, query: str) -> SearchResults:
+        """Async :meth:`_fetch`: rate-limit and backoff waits sleep on the event loop.
+
+        Only the backend call is offloaded, so throttled searches never hold a thread of
+        the shared tool executor that RAG and calculator calls also use.
+        """
+        limiter = _host_limiter(backend.host)
+        attempt = 0
+        while True:
+            if limiter is not None:
+                while not limiter.try_acquire():
+                    await asyncio.sleep(limiter.wait_time())
+            try:
+                return await run_blocking(backend.search, query, kind=self.backend, max_results=self.max_results)
+            except backend.retryable_errors as exc:
+                await asyncio.sleep(self._retry_delay(query, attempt, exc))
+                attempt += 1
+                increment("retries")
+            except Exception as exc:  # pragma: no cover - network variability
+                self._logger.exception("DuckDuckGo search failed for '%s'", query)
+                raise ValueError(f"DuckDuckGo search failed: {exc}") from exc
+
+    def _retry_delay(self, query: str, attempt: int, exc: Exception) -> float:
+        """Backoff before retry ``attempt + 1``; raises once the retries are used up."""
+        if attempt >= self.max_retries:
+            self._logger.exception("Web search gave up on '%s' after %d retries", query, attempt)
             raise ValueError(f"DuckDuckGo search failed: {exc}") from exc
+        delay = self.backoff_seconds * 2**attempt * (1 + random.random())
+        self._logger.warning("Web search for '%s' throttled (%s); retrying in %.1fs", query, exc, delay)
+        return delay
+
 
+def create_web_search_tool(backend: Optional[SearchBackend] = None) -> DuckDuckGoSearchTool:
+    """Create a tool that performs top-k DuckDuckGo searches.
 
-def create_web_search_tool() -> DuckDuckGoSearchTool:
-    """Create a tool that performs top-k DuckDuckGo searches."""
-    return DuckDuckGoSearchTool(max_results=5)
+    ``backend`` overrides the shared search backend, e.g. a :class:`StaticSearchBackend`
+    for tests and offline runs.
+    """
+    return DuckDuckGoSearchTool(max_results=5, search_backend=backend)